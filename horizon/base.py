@@ -22,6 +22,7 @@ the classes contained therein.
 
 import collections
 import copy
+import hashlib
 from importlib import import_module
 import inspect
 import logging
@@ -30,6 +31,7 @@ import os
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls import url
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
 from django.utils.encoding import python_2_unicode_compatible
@@ -83,6 +85,92 @@ def access_cached(func):
     return inner
 
 
+NAV_ACCESS_CACHE_PREFIX = 'horizon:nav_access'
+_NAV_ACCESS_ATTR = '_horizon_nav_access'
+
+
+def _component_key(component):
+    return "%s.%s" % (component.__class__.__module__,
+                      component.__class__.__name__)
+
+
+def _nav_access_scope(request):
+    """Return what the access to dashboards and panels may depend on.
+
+    These are the roles, the project, the domains and the services of the
+    user, the domain scoped token if any, and the policy files.
+    """
+    from openstack_auth import policy
+
+    user = request.user
+    domain_token = request.session.get('domain_token')
+    domain_scope = None
+    if domain_token:
+        domain_scope = (getattr(domain_token, 'domain_id', None),
+                        sorted(getattr(domain_token, 'role_names', None) or
+                               []))
+    services = sorted(set(service.get('type') for service
+                          in getattr(user, 'service_catalog', None) or []))
+    return (sorted(role['name'] for role in getattr(user, 'roles', [])),
+            getattr(user, 'project_id', None),
+            getattr(user, 'domain_id', None),
+            getattr(user, 'user_domain_id', None),
+            getattr(user, 'services_region', None),
+            services,
+            domain_scope,
+            policy.get_policy_mtime())
+
+
+class NavAccess(object):
+    """Results of can_access for the dashboards and panels of a user.
+
+    The results are shared by all the requests of users with the same
+    roles, project, domain and services through the Django cache, so that
+    rendering the navigation is a single cache lookup rather than a policy
+    check per dashboard and panel. Components are only checked when asked
+    for, the new results are stored by :meth:`save`.
+
+    ``NAV_ACCESS_CACHE_TIMEOUT`` is the lifetime of the cached results, in
+    seconds. A value of 0 disables the cache.
+    """
+
+    def __init__(self, request):
+        self.timeout = getattr(settings, 'NAV_ACCESS_CACHE_TIMEOUT', 300)
+        self.key = None
+        self.allowed = {}
+        self.modified = False
+        if self.timeout > 0 and request.user.is_authenticated:
+            scope = repr(_nav_access_scope(request)).encode('utf-8')
+            self.key = '%s:%s' % (NAV_ACCESS_CACHE_PREFIX,
+                                  hashlib.sha1(scope).hexdigest())
+            self.allowed = cache.get(self.key) or {}
+
+    @classmethod
+    def get(cls, request):
+        """Return the NavAccess of request, shared by all its templates."""
+        nav_access = request.__dict__.get(_NAV_ACCESS_ATTR)
+        if nav_access is None:
+            nav_access = cls(request)
+            setattr(request, _NAV_ACCESS_ATTR, nav_access)
+        return nav_access
+
+    def can_access(self, component, context):
+        if self.key is None:
+            return component.can_access(context)
+        key = _component_key(component)
+        allowed = self.allowed.get(key)
+        if allowed is None:
+            allowed = bool(component.can_access(context))
+            self.allowed[key] = allowed
+            self.modified = True
+        return allowed
+
+    def save(self):
+        if self.key is not None and self.modified:
+            cache.set(self.key, self.allowed, self.timeout)
+            self.modified = False
+
+
 def _wrapped_include(arg):
     """Convert the old 3-tuple arg for include() into the new format.
 
@@ -144,7 +232,8 @@ class HorizonComponent(object):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        When the navigation is rendered, the result of the method is
+        cached by :class:`NavAccess`.
         """
         return self.allowed(context)
 
@@ -377,6 +377,56 @@ horizon.membership = {
     });
   },
 
+  /*
+   * Triggers on the filtering of the available list, to look up the
+   * matching members missing from it at the search URL of the step.
+   **/
+  search_available: function(step_slug) {
+    var $membership = $("." + step_slug + "_membership");
+    var url = $membership.data('search-url');
+    var timer;
+    if (!url) {
+      return;
+    }
+    // The handler is delegated, as list_filtering unbinds the filter inputs.
+    $membership.on('input', "input[id='available_" + step_slug + "']", function () {
+      var query = $(this).val();
+      clearTimeout(timer);
+      if (!query) {
+        return;
+      }
+      timer = setTimeout(function () {
+        $.getJSON(url, {q: query}).done(function (data) {
+          horizon.membership.add_available_members(step_slug, data.items);
+        });
+      }, 400);
+    });
+  },
+
+  /*
+   * Adds the given members to the available list and the hidden role
+   * lists, unless they are already known.
+   **/
+  add_available_members: function(step_slug, items) {
+    var added = false;
+    angular.forEach(items, function (item) {
+      if (horizon.membership.data[step_slug].hasOwnProperty(item.id)) {
+        return;
+      }
+      horizon.membership.data[step_slug][item.id] = item.name;
+      horizon.membership.get_role_element(step_slug, "").append(
+        $("<option>").val(item.id).text(item.name));
+      $(".available_" + step_slug).append(horizon.membership.generate_member_element(step_slug, item.name, item.id, [], "+"));
+      added = true;
+    });
+    if (added) {
+      $(".available_" + step_slug + " .role_options").hide();
+      horizon.membership.list_filtering(step_slug);
+      horizon.membership.detect_no_results(step_slug);
+      $("input[id='available_" + step_slug + "']").trigger("keyup");
+    }
+  },
+
   /*
    * Style the inline object creation button, hide the associated field.
    **/
@@ -474,7 +524,7 @@ horizon.membership = {
       horizon.membership.update_membership(step_slug);
       horizon.membership.select_member_role(step_slug);
       horizon.membership.add_new_member(step_slug);
-
+      horizon.membership.search_available(step_slug);
 
       // initially hide role dropdowns for available member list
       $form.find(".available_" + step_slug + " .role_options").hide();
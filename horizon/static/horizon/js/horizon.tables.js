@@ -33,100 +33,34 @@ horizon.datatables = {
       return;
     }
 
+    // Rows which can be updated together are grouped by the URL updating
+    // them, the other ones are updated one at a time.
+    var bulk_updates = {};
     $rows_to_update.each(function() {
       var $row = $(this);
       var $table = $row.closest('table.datatable');
+      var bulk_url = $row.attr('data-bulk-update-url');
+
+      if (bulk_url) {
+        bulk_updates[bulk_url] = bulk_updates[bulk_url] || [];
+        bulk_updates[bulk_url].push($row);
+        return;
+      }
 
       requests.push(
         horizon.ajax.queue({
           url: $row.attr('data-update-url'),
           error: function (jqXHR) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('.table_column_header th').length;
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
-                break;
-              default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
+            if (jqXHR.status === 404) {
+              // A 404 indicates the object is gone, and should be removed
+              // from the table
+              horizon.datatables.remove_row($table, $row);
+            } else {
+              horizon.datatables.stop_row_update($row);
             }
           },
           success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('warning')) {
-              var $container = $(document.createElement('div'))
-                .addClass('progress-text horizon-loading-bar');
-
-              var $progress = $(document.createElement('div'))
-                .addClass('progress progress-striped active')
-                .appendTo($container);
-
-              $(document.createElement('div'))
-                .addClass('progress-bar')
-                .appendTo($progress);
-
-              // if action/confirm is required, show progress-bar with "?"
-              // icon to indicate user action is required
-              if ($new_row.find('.btn-action-required').length > 0) {
-                $(document.createElement('span'))
-                  .addClass('fa fa-question-circle progress-bar-text')
-                  .appendTo($container);
-              }
-              $new_row.find("td.warning:last").prepend($container);
-            }
-
-            // Only replace row if the html content has changed
-            if($new_row.html() !== $row.html()) {
-
-              // Directly accessing the checked property of the element
-              // is MUCH faster than using jQuery's helper method
-              var $checkbox = $row.find('.table-row-multi-select');
-              if($checkbox.length && $checkbox[0].checked) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-
-              // TODO(matt-borland, tsufiev): ideally we should solve the
-              // problem with not-working angular actions in a content added
-              // by jQuery via replacing jQuery insert with Angular insert.
-              // Should address this in Newton release
-              recompileAngularContent($table);
-
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
-              }
-            }
+            horizon.datatables.replace_row($table, $row, data);
           },
           complete: function () {
             // Revalidate the button check for the updated table
@@ -136,6 +70,13 @@ horizon.datatables = {
       );
     });
 
+    $.each(bulk_updates, function(bulk_url, $rows) {
+      var max_rows = parseInt($rows[0].attr('data-bulk-update-max-rows'), 10) || $rows.length;
+      for (var i = 0; i < $rows.length; i += max_rows) {
+        requests.push(horizon.datatables.update_rows(bulk_url, $rows.slice(i, i + max_rows)));
+      }
+    });
+
     $.when.apply($, requests).always(function() {
       decay_constant = decay_constant || 0;
       decay_constant++;
@@ -147,6 +88,127 @@ horizon.datatables = {
     });
   },
 
+  /* Updates several rows of a table with a single request. */
+  update_rows: function(bulk_url, $rows) {
+    var ids = $.map($rows, function($row) {
+      return $row.attr('data-object-id');
+    });
+    return horizon.ajax.queue({
+      url: bulk_url + '&' + $.param({obj_id: ids}, true),
+      error: function () {
+        $.each($rows, function(index, $row) {
+          horizon.datatables.stop_row_update($row);
+        });
+      },
+      success: function (data) {
+        $.each($rows, function(index, $row) {
+          var $table = $row.closest('table.datatable');
+          var id = $row.attr('data-object-id');
+          if (id in data.rows) {
+            horizon.datatables.replace_row($table, $row, data.rows[id]);
+          } else if (data.errors[id] === 404) {
+            horizon.datatables.remove_row($table, $row);
+          } else {
+            horizon.datatables.stop_row_update($row);
+          }
+        });
+      },
+      complete: function () {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+      }
+    });
+  },
+
+  /* Replaces a row with its updated version rendered by the server. */
+  replace_row: function($table, $row, data) {
+    var $new_row = $(data);
+
+    if ($new_row.hasClass('warning')) {
+      var $container = $(document.createElement('div'))
+        .addClass('progress-text horizon-loading-bar');
+
+      var $progress = $(document.createElement('div'))
+        .addClass('progress progress-striped active')
+        .appendTo($container);
+
+      $(document.createElement('div'))
+        .addClass('progress-bar')
+        .appendTo($progress);
+
+      // if action/confirm is required, show progress-bar with "?"
+      // icon to indicate user action is required
+      if ($new_row.find('.btn-action-required').length > 0) {
+        $(document.createElement('span'))
+          .addClass('fa fa-question-circle progress-bar-text')
+          .appendTo($container);
+      }
+      $new_row.find("td.warning:last").prepend($container);
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() !== $row.html()) {
+
+      // Directly accessing the checked property of the element
+      // is MUCH faster than using jQuery's helper method
+      var $checkbox = $row.find('.table-row-multi-select');
+      if($checkbox.length && $checkbox[0].checked) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+
+      // TODO(matt-borland, tsufiev): ideally we should solve the
+      // problem with not-working angular actions in a content added
+      // by jQuery via replacing jQuery insert with Angular insert.
+      // Should address this in Newton release
+      recompileAngularContent($table);
+
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+      // Check that quicksearch is enabled for this table
+      // Reset quicksearch's data cache.
+      if ($table.attr('id') in horizon.datatables.qs) {
+        horizon.datatables.qs[$table.attr('id')].cache();
+      }
+    }
+  },
+
+  /* Removes the row of an object which is gone. */
+  remove_row: function($table, $row) {
+    // Update the footer count and reset to default empty row if needed
+    var row_count, colspan, template, params;
+
+    // existing count minus one for the row we're removing
+    row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if(row_count === 0) {
+      colspan = $table.find('.table_column_header th').length;
+      template = horizon.templates.compiled_templates["#empty_row_template"];
+      params = {
+          "colspan": colspan,
+          no_items_label: gettext("No items to display.")
+      };
+      var empty_row = template.render(params);
+      $row.replaceWith(empty_row);
+    } else {
+      $row.remove();
+    }
+    // Reset tablesorter's data cache.
+    $table.trigger("update");
+    // Enable launch action if quota is not exceeded
+    horizon.datatables.update_actions();
+  },
+
+  /* Stops updating a row which could not be updated. */
+  stop_row_update: function($row) {
+    console.log(gettext("An error occurred while updating."));
+    $row.removeClass("ajax-update");
+    $row.find("i.ajax-updating").remove();
+  },
+
   update_actions: function() {
     var $actions_to_update = $('.btn-launch.ajax-update, .btn-create.ajax-update');
     $actions_to_update.each(function() {
@@ -405,7 +405,7 @@ class LinkAction(BaseAction):
         try:
             if datum:
                 obj_id = self.table.get_object_id(datum)
-                return urls.reverse(self.url, args=(obj_id,))
+                return functions.reverse_object_url(self.url, obj_id)
             else:
                 return urls.reverse(self.url)
         except urls.NoReverseMatch as ex:
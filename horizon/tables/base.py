@@ -24,14 +24,15 @@ from django.conf import settings
 from django.core import exceptions as core_exceptions
 from django import forms
 from django.http import HttpResponse
+from django.http import JsonResponse
 from django import template
 from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
-from django.template.loader import render_to_string
 from django import urls
 from django.utils import encoding
 from django.utils.html import escape
 from django.utils import http
+from django.utils import translation
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
@@ -45,12 +46,14 @@ from horizon import messages
 from horizon.tables.actions import BatchAction
 from horizon.tables.actions import FilterAction
 from horizon.tables.actions import LinkAction
+from horizon.utils import functions
 from horizon.utils import html
 
 
 LOG = logging.getLogger(__name__)
 PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
+_MISSING = object()
 
 
 @six.python_2_unicode_compatible
@@ -348,6 +351,9 @@ class Column(html.HTMLElement):
         if status_choices:
             self.status_choices = status_choices
         self.display_choices = display_choices
+        # Lookup tables of the choices, shared by the copies of the column
+        # bound to each table.
+        self._choice_maps = {}
 
         if summation is not None and summation not in self.summation_methods:
             raise ValueError(
@@ -386,6 +392,26 @@ class Column(html.HTMLElement):
             return policy_check(self.policy_rules, request)
         return True
 
+    def get_choice_map(self, attr):
+        """Returns a dict of the lowercased values of the given choices.
+
+        ``attr`` is the name of the choices attribute, ``status_choices`` or
+        ``display_choices``. The dict maps the lowercased text of each value
+        to the first choice of that value, and is only computed again when
+        the choices or the active language change.
+        """
+        choices = getattr(self, attr)
+        language = translation.get_language()
+        cached = self._choice_maps.get(attr)
+        if cached is None or cached[0] is not choices or \
+                cached[1] != language:
+            choice_map = {}
+            for value, choice in choices or ():
+                choice_map.setdefault(six.text_type(value).lower(), choice)
+            cached = (choices, language, choice_map)
+            self._choice_maps[attr] = cached
+        return cached[2]
+
     def get_raw_data(self, datum):
         """Returns the raw data for this column.
 
@@ -401,8 +427,9 @@ class Column(html.HTMLElement):
             data = datum.get(self.transform)
         else:
             # Basic object lookups
-            data = getattr(datum, self.transform, None)
-            if not hasattr(datum, self.transform):
+            data = getattr(datum, self.transform, _MISSING)
+            if data is _MISSING:
+                data = None
                 msg = "The attribute %(attr)s doesn't exist on %(obj)s."
                 LOG.debug(termcolors.colorize(msg, **PALETTE['ERROR']),
                           {'attr': self.transform, 'obj': datum})
@@ -416,20 +443,20 @@ class Column(html.HTMLElement):
         method for this column.
         """
         datum_id = self.table.get_object_id(datum)
+        data_cache = self.table._data_cache[self]
 
-        if datum_id in self.table._data_cache[self]:
-            return self.table._data_cache[self][datum_id]
+        if datum_id in data_cache:
+            return data_cache[datum_id]
 
         data = self.get_raw_data(datum)
         display_value = None
 
         if self.display_choices:
-            display_value = [display for (value, display) in
-                             self.display_choices
-                             if value.lower() == (data or '').lower()]
+            display_value = self.get_choice_map('display_choices').get(
+                (data or '').lower())
 
         if display_value:
-            data = display_value[0]
+            data = display_value
         else:
             for filter_func in self.filters:
                 try:
@@ -445,9 +472,9 @@ class Column(html.HTMLElement):
         if data and self.truncate:
             data = truncatechars(data, self.truncate)
 
-        self.table._data_cache[self][datum_id] = data
+        data_cache[datum_id] = data
 
-        return self.table._data_cache[self][datum_id]
+        return data
 
     def get_link_url(self, datum):
         """Returns the final value for the column's ``link`` property.
@@ -473,7 +500,7 @@ class Column(html.HTMLElement):
                 return self.link(datum, request=self.table.request)
             return self.link(datum)
         try:
-            return urls.reverse(self.link, args=(obj_id,))
+            return functions.reverse_object_url(self.link, obj_id)
         except urls.NoReverseMatch:
             return self.link
 
@@ -531,6 +558,11 @@ class Row(html.HTMLElement):
     ``ajax_poll_interval`` in the ``HORIZON_CONFIG`` dictionary.
     Default: ``2500`` (measured in milliseconds).
 
+    The rows of a table waiting for an update are polled together, in
+    batches of up to ``ajax_bulk_max_rows`` rows. Subclasses may define a
+    ``get_data_bulk`` method retrieving the data of several rows at once,
+    by default ``get_data`` is called for each row.
+
     .. attribute:: table
 
         The table which this row belongs to.
@@ -575,10 +607,23 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_bulk_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value. Default: ``"rows_update"``.
+
+    .. attribute:: ajax_bulk_max_rows
+
+        The maximum number of rows updated by a single request.
+        Default: ``50``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_bulk_action_name = "rows_update"
+    ajax_bulk_max_rows = 50
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -623,6 +668,9 @@ class Row(html.HTMLElement):
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
             self.attrs['data-update-interval'] = interval
             self.attrs['data-update-url'] = self.get_ajax_update_url()
+            self.attrs['data-bulk-update-url'] = \
+                self.get_ajax_bulk_update_url()
+            self.attrs['data-bulk-update-max-rows'] = self.ajax_bulk_max_rows
             self.classes.append("ajax-update")
 
         self.attrs['data-object-id'] = table.get_object_id(datum)
@@ -666,30 +714,47 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        return self.table.render_fragment(
+            "horizon/common/_data_table_row.html", {"row": self})
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
         return list(self.cells.values())
 
-    def get_ajax_update_url(self):
+    def _get_ajax_url(self, request_params):
         table_url = self.table.get_absolute_url()
         marker_name = self.table._meta.pagination_param
         marker = self.table.request.GET.get(marker_name, None)
         if not marker:
             marker_name = self.table._meta.prev_pagination_param
             marker = self.table.request.GET.get(marker_name, None)
-        request_params = [
-            ("action", self.ajax_action_name),
-            ("table", self.table.name),
-            ("obj_id", self.table.get_object_id(self.datum)),
-        ]
         if marker:
             request_params.append((marker_name, marker))
         params = urlencode(collections.OrderedDict(request_params))
         return "%s?%s" % (table_url, params)
 
+    def get_ajax_update_url(self):
+        return self._get_ajax_url([
+            ("action", self.ajax_action_name),
+            ("table", self.table.name),
+            ("obj_id", self.table.get_object_id(self.datum)),
+        ])
+
+    def get_ajax_bulk_update_url(self):
+        """Returns the URL updating several rows of the table at once.
+
+        The ids of the objects of the rows are added to the URL as ``obj_id``
+        parameters. The URL is the same for all the rows of the table.
+        """
+        url = self.table._bulk_update_urls.get(self.__class__)
+        if url is None:
+            url = self.table._bulk_update_urls[self.__class__] = \
+                self._get_ajax_url([
+                    ("action", self.ajax_bulk_action_name),
+                    ("table", self.table.name),
+                ])
+        return url
+
     def can_be_selected(self, datum):
         """Determines whether the row can be selected.
 
@@ -705,6 +770,46 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_bulk(self, request, obj_ids):
+        """Fetches the updated data of several rows at once.
+
+        Returns a dict mapping the object IDs to the data of the rows, or to
+        the exception class returned by :meth:`handle_data_error` for the
+        objects which could not be retrieved. Objects which are missing from
+        the dict are considered deleted.
+
+        By default it calls ``get_data`` for each object. Subclasses may
+        override it to retrieve all the objects with a single API call.
+        """
+        data = {}
+        for obj_id in obj_ids:
+            try:
+                data[obj_id] = self.get_data(request, obj_id)
+            except Exception:
+                data[obj_id] = self.handle_data_error(request)
+        return data
+
+    def handle_data_error(self, request):
+        """Handles the error raised while fetching the data of a row.
+
+        Must be called from an ``except`` block. Returns the exception class
+        returned by :func:`horizon.exceptions.handle`. Unexpected errors,
+        which it would re-raise, are logged and their class is returned
+        instead, so that they only fail the update of the row and not the
+        whole batch of rows.
+        """
+        exc_value = sys.exc_info()[1]
+        try:
+            return exceptions.handle(request, ignore=True)
+        except Exception as exc:
+            # Errors raised by the handlers, like the redirection to the
+            # login page, apply to the whole request.
+            if exc is not exc_value:
+                raise
+            LOG.exception('Unable to update a row of the "%s" table.',
+                          self.table.name)
+            return type(exc)
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -831,12 +936,12 @@ class Cell(html.HTMLElement):
 
     @property
     def url(self):
-        if self.column.link:
-            url = self.column.get_link_url(self.datum)
-            if url:
-                return url
-        else:
-            return None
+        # The URL is read by both value and get_default_classes.
+        if not hasattr(self, '_url'):
+            self._url = None
+            if self.column.link:
+                self._url = self.column.get_link_url(self.datum) or None
+        return self._url
 
     @property
     def status(self):
@@ -850,10 +955,9 @@ class Cell(html.HTMLElement):
             # returns the first matching status found
             data_status_lower = six.text_type(
                 self.column.get_raw_data(self.datum)).lower()
-            for status_name, status_value in self.column.status_choices:
-                if six.text_type(status_name).lower() == data_status_lower:
-                    self._status = status_value
-                    return self._status
+            self._status = self.column.get_choice_map('status_choices').get(
+                data_status_lower)
+            return self._status
         self._status = None
         return self._status
 
@@ -904,8 +1008,8 @@ class Cell(html.HTMLElement):
                                           self)
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_cell.html",
-                                {"cell": self})
+        return self.row.table.render_fragment(
+            "horizon/common/_data_table_cell.html", {"cell": self})
 
 
 class DataTableOptions(object):
@@ -1293,6 +1397,9 @@ class DataTable(object):
                 columns.append((key, column))
         self.columns = collections.OrderedDict(columns)
         self._populate_data_cache()
+        self._templates = {}
+        self._fragment_contexts = {}
+        self._bulk_update_urls = {}
 
         # Associate these actions with this table
         for action in self.base_actions.values():
@@ -1412,6 +1519,36 @@ class DataTable(object):
                          'hidden_title': self._meta.hidden_title}
         return table_template.render(extra_context, self.request)
 
+    def get_template(self, template_name):
+        """Returns the template of the given name, loaded once per table."""
+        table_template = self._templates.get(template_name)
+        if table_template is None:
+            table_template = template.loader.get_template(template_name)
+            self._templates[template_name] = table_template
+        return table_template
+
+    def render_fragment(self, template_name, extra_context, request=None):
+        """Renders a template repeated for each row, like a row or a cell.
+
+        All the fragments of the table are rendered with a common context,
+        so that the templates they include are loaded once for the whole
+        table rather than once per row. When ``request`` is given, the
+        context processors are run once and their values are available to
+        all the fragments.
+        """
+        fragment_template = self.get_template(template_name).template
+        context = self._fragment_contexts.get(request is not None)
+        if context is None:
+            engine = fragment_template.engine
+            context = template.Context(autoescape=engine.autoescape)
+            if request is not None:
+                request_context = template.RequestContext(request)
+                with request_context.bind_template(fragment_template):
+                    context.update(request_context.flatten())
+            self._fragment_contexts[request is not None] = context
+        with context.push(extra_context):
+            return fragment_template.render(context)
+
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
 
@@ -1584,11 +1721,11 @@ class DataTable(object):
         else:
             template_path = self._meta.row_actions_dropdown_template
 
-        row_actions_template = template.loader.get_template(template_path)
         bound_actions = self.get_row_actions(datum)
         extra_context = {"row_actions": bound_actions,
                          "row_id": self.get_object_id(datum)}
-        return row_actions_template.render(extra_context, self.request)
+        return self.render_fragment(template_path, extra_context,
+                                    self.request)
 
     @staticmethod
     def parse_action(action_string):
@@ -1687,6 +1824,10 @@ class DataTable(object):
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif (new_row.ajax and
+                  new_row.ajax_bulk_action_name == action_name and
+                  request.is_ajax()):
+                return self.bulk_row_update_handle(request, new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1703,6 +1844,36 @@ class DataTable(object):
                             return handled
         return None
 
+    def bulk_row_update_handle(self, request, new_row):
+        """Handles the AJAX update of several rows at once.
+
+        Returns a JSON object with the rendered rows by object ID in
+        ``rows``, and the HTTP status code of the errors by object ID in
+        ``errors``, 404 meaning that the object is gone.
+        """
+        obj_ids = request.GET.getlist('obj_id')[:new_row.ajax_bulk_max_rows]
+        data = new_row.get_data_bulk(request, obj_ids)
+        rows = {}
+        errors = {}
+        for obj_id in obj_ids:
+            datum = data.get(obj_id)
+            if datum is None:
+                errors[obj_id] = exceptions.NotFound.status_code
+                continue
+            if not (isinstance(datum, type) and issubclass(datum, Exception)):
+                try:
+                    row = self._meta.row_class(self)
+                    if self.get_object_id(datum) == self.current_item_id:
+                        self.selected = True
+                        row.classes.append('current_selected')
+                    row.load_cells(datum)
+                    rows[obj_id] = row.render()
+                except Exception:
+                    datum = new_row.handle_data_error(request)
+            if obj_id not in rows:
+                errors[obj_id] = getattr(datum, 'status_code', 500)
+        return JsonResponse({'rows': rows, 'errors': errors})
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
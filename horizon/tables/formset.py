@@ -17,7 +17,6 @@ import sys
 import six
 
 from django import template
-from django.template import loader
 
 from horizon.tables import base as horizon_tables
 
@@ -62,8 +61,8 @@ class FormsetRow(horizon_tables.Row):
             self.cells = collections.OrderedDict(cells)
 
     def render(self):
-        return loader.render_to_string(self.template_path,
-                                       {"row": self, "form": self.form})
+        return self.table.render_fragment(self.template_path,
+                                          {"row": self, "form": self.form})
 
 
 class FormsetDataTableMixin(object):
@@ -24,6 +24,7 @@ from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from horizon.base import Horizon
+from horizon.base import NavAccess
 from horizon import conf
 from horizon.contrib import bootstrap_datepicker
 
@@ -53,6 +54,13 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _is_in_nav(component, context, nav_access):
+    if callable(component.nav):
+        return bool(component.nav(context) and
+                    nav_access.can_access(component, context))
+    return bool(component.nav and nav_access.can_access(component, context))
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
@@ -60,6 +68,7 @@ def horizon_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
+    nav_access = NavAccess.get(context['request'])
     dashboards = []
     for dash in Horizon.get_dashboards():
         panel_groups = dash.get_panel_groups()
@@ -67,22 +76,15 @@ def horizon_nav(context):
         for group in panel_groups.values():
             allowed_panels = []
             for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
+                if _is_in_nav(panel, context, nav_access):
                     allowed_panels.append(panel)
                 if panel == current_panel:
                     current_panel_group = group.slug
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+        if _is_in_nav(dash, context, nav_access):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
+    nav_access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -97,13 +99,15 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
+    nav_access = NavAccess.get(context['request'])
     dashboards = []
     for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
+        if nav_access.can_access(dash, context):
             if callable(dash.nav) and dash.nav(context):
                 dashboards.append(dash)
             elif dash.nav:
                 dashboards.append(dash)
+    nav_access.save()
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -117,16 +121,13 @@ def horizon_dashboard_nav(context):
         return {}
     dashboard = context['request'].horizon['dashboard']
     panel_groups = dashboard.get_panel_groups()
+    nav_access = NavAccess.get(context['request'])
     non_empty_groups = []
 
     for group in panel_groups.values():
         allowed_panels = []
         for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
+            if _is_in_nav(panel, context, nav_access):
                 allowed_panels.append(panel)
         if allowed_panels:
             if group.name is None:
@@ -134,6 +135,7 @@ def horizon_dashboard_nav(context):
             else:
                 non_empty_groups.append((group.name, allowed_panels))
 
+    nav_access.save()
     return {'components': OrderedDict(non_empty_groups),
             'user': context['request'].user,
             'current': context['request'].horizon['panel'].slug,
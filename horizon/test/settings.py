@@ -109,6 +109,9 @@ SESSION_COOKIE_HTTPONLY = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_SECURE = False
 
+# Tests change the registered panels and their access rules.
+NAV_ACCESS_CACHE_TIMEOUT = 0
+
 HORIZON_CONFIG = {
     'dashboards': ('cats', 'dogs'),
     'default_dashboard': 'cats',
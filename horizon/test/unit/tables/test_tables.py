@@ -15,6 +15,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import unittest
 import uuid
 
@@ -22,6 +23,7 @@ from django import forms
 from django import http
 from django import shortcuts
 from django.template import defaultfilters
+from django.template import loader as template_loader
 from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.translation import ungettext_lazy
@@ -695,6 +697,30 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table_actions)
         self.assertContains(resp, "table_search", 0)
 
+    def test_table_rendering_loads_templates_once(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        with mock.patch('django.template.loader.get_template',
+                        wraps=template_loader.get_template) as get_template:
+            self.table.render()
+        loaded = [call[0][0] for call in get_template.call_args_list]
+        self.assertEqual(1, loaded.count(
+            "horizon/common/_data_table_row.html"))
+        self.assertEqual(1, loaded.count(
+            self.table._meta.row_actions_dropdown_template))
+
+    def test_display_choices(self):
+        class TempTable(MyTable):
+            status = tables.Column('status',
+                                   display_choices=(('UP', 'Running'),
+                                                    ('up', 'Ignored'),
+                                                    ('down', 'Stopped')))
+
+        self.table = TempTable(self.request, TEST_DATA)
+        rows = self.table.get_rows()
+        self.assertEqual('Running', rows[0].cells['status'].data)
+        self.assertEqual('Stopped', rows[1].cells['status'].data)
+        self.assertEqual(u'\u00fcp', rows[3].cells['status'].data)
+
     def test_wrap_list_rendering(self):
         self.table = MyTableWrapList(self.request, TEST_DATA_7)
         row = self.table.get_rows()[0]
@@ -998,6 +1024,70 @@ class DataTableTests(test.TestCase):
         self.assertEqual("Log In",
                          six.text_type(row_actions[1].verbose_name))
 
+    def test_table_bulk_row_update(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        resp = http.HttpResponse(self.table.render())
+        self.assertContains(
+            resp, '?action=rows_update&amp;table=my_table"', 4)
+        self.assertContains(resp, 'data-bulk-update-max-rows="50"', 4)
+
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1", "2"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        with mock.patch.object(MyRow, 'get_data',
+                               side_effect=[TEST_DATA_2[0], TEST_DATA[1]]) \
+                as mock_get_data:
+            resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        mock_get_data.assert_has_calls([mock.call(req, '1'),
+                                        mock.call(req, '2')])
+        content = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual({'1', '2'}, set(content['rows']))
+        self.assertIn('my_table__row__1', content['rows']['1'])
+        self.assertIn('status_down', content['rows']['1'])
+        self.assertIn('my_table__row__2', content['rows']['2'])
+        self.assertEqual({}, content['errors'])
+
+    def test_table_bulk_row_update_unexpected_error(self):
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1", "2", "3"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        side_effect = [TEST_DATA_2[0], ValueError('unexpected'),
+                       exceptions.NotFound('gone')]
+        with mock.patch.object(MyRow, 'get_data', side_effect=side_effect):
+            resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        content = json.loads(resp.content.decode('utf-8'))
+        # Only the update of the failing row fails.
+        self.assertEqual(['1'], list(content['rows']))
+        self.assertEqual({'2': 500, '3': 404}, content['errors'])
+
+    def test_table_bulk_row_update_get_data_bulk(self):
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1", "2", "3", "4"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        data = {'1': TEST_DATA_2[0], '3': exceptions.NotAuthorized}
+        with mock.patch.object(MyRow, 'ajax_bulk_max_rows', 3), \
+                mock.patch.object(MyRow, 'get_data_bulk',
+                                  return_value=data) as mock_get_data_bulk:
+            resp = self.table.maybe_preempt()
+        mock_get_data_bulk.assert_called_once_with(req, ['1', '2', '3'])
+        content = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(['1'], list(content['rows']))
+        # Objects missing from the data are gone.
+        self.assertEqual({'2': 404, '3': 401}, content['errors'])
+
+        # The bulk update is only done for AJAX requests.
+        req = self.factory.get('/my_url/', params)
+        self.table = MyTable(req)
+        self.assertIsNone(self.table.maybe_preempt())
+
     def test_server_filtering(self):
         filter_value_param = "my_table__filter__q"
         filter_field_param = '%s_field' % filter_value_param
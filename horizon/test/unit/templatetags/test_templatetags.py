@@ -19,10 +19,14 @@
 import re
 
 from django.conf import settings
+from django.core.cache import cache
 from django.template import Context
 from django.template import Template
+from django.test.utils import override_settings
 from django.utils.text import normalize_newlines
+import mock
 
+from horizon import middleware
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa: F401
@@ -150,3 +154,40 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def _render_main_nav(self):
+        request = self.factory.get('/')
+        middleware.HorizonMiddleware('dummy_get_response') \
+            ._process_request(request)
+        return self.render_template(tag_require='horizon',
+                                    template_text="{% horizon_main_nav %}",
+                                    context={'request': request})
+
+    @override_settings(NAV_ACCESS_CACHE_TIMEOUT=300)
+    def test_horizon_main_nav_access_cached(self):
+        cache.clear()
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=False) as mock_can_access:
+            first = self._render_main_nav()
+            second = self._render_main_nav()
+        self.assertNotIn('/cats/', first)
+        self.assertEqual(first, second)
+        mock_can_access.assert_called_once_with(mock.ANY)
+
+    @override_settings(NAV_ACCESS_CACHE_TIMEOUT=300)
+    def test_horizon_main_nav_access_policy_changed(self):
+        cache.clear()
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=True) as mock_can_access, \
+                mock.patch('openstack_auth.policy.get_policy_mtime',
+                           side_effect=[1, 2]):
+            self._render_main_nav()
+            self._render_main_nav()
+        self.assertEqual(2, mock_can_access.call_count)
+
+    def test_horizon_main_nav_access_not_cached(self):
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=True) as mock_can_access:
+            self._render_main_nav()
+            self._render_main_nav()
+        self.assertEqual(2, mock_can_access.call_count)
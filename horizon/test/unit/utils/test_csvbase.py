@@ -0,0 +1,41 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from horizon.test import helpers as test
+from horizon.utils import csvbase
+
+
+class StreamingResponse(csvbase.BaseCsvStreamingResponse):
+    columns = ['Name', 'Value']
+    chunk_size = 100
+
+    def get_row_data(self):
+        for i in range(50):
+            yield ('name-%d' % i, i)
+
+
+class BaseCsvStreamingResponseTests(test.TestCase):
+
+    def test_streaming_content(self):
+        response = StreamingResponse(self.request, None, {}, 'text/csv')
+        chunks = list(response.streaming_content)
+        content = b''.join(chunks).decode('utf-8')
+
+        expected = ['Name,Value'] + ['name-%d,%d' % (i, i) for i in range(50)]
+        self.assertEqual('\r\n'.join(expected) + '\r\n', content)
+        # The header is sent first, then the rows in chunks of about
+        # chunk_size characters.
+        self.assertEqual(b'Name,Value\r\n', chunks[0])
+        self.assertGreater(len(chunks), 5)
+        for chunk in chunks[1:-1]:
+            self.assertGreaterEqual(len(chunk), 100)
+            self.assertLess(len(chunk), 120)
@@ -10,6 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import re
+import uuid
+
+from django import urls
+import mock
+
 from horizon.test import helpers as test
 from horizon.utils import functions
 
@@ -95,3 +101,52 @@ class GetConfigValueTests(test.TestCase):
         res = functions.get_config_value(request, key, self.str_default,
                                          search_in_settings=False)
         self.assertEqual(res, self.str_default)
+
+
+class ReverseObjectUrlTests(test.TestCase):
+
+    def setUp(self):
+        super(ReverseObjectUrlTests, self).setUp()
+        # URLs are cached per view name, each test uses its own.
+        self.viewname = 'view-%s' % uuid.uuid4().hex
+        self.pattern = r'^[^/ ]+$'
+        patcher = mock.patch.object(urls, 'reverse',
+                                    side_effect=self._reverse)
+        self.mock_reverse = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _reverse(self, viewname, args):
+        if not re.match(self.pattern, args[0]):
+            raise urls.NoReverseMatch()
+        return '/objects/%s/detail/' % args[0]
+
+    def test_url_reused(self):
+        self.assertEqual('/objects/1/detail/',
+                         functions.reverse_object_url(self.viewname, 1))
+        self.assertEqual('/objects/abc-2/detail/',
+                         functions.reverse_object_url(self.viewname, 'abc-2'))
+        self.assertEqual(1, self.mock_reverse.call_count)
+
+    def test_unsafe_id(self):
+        self.assertEqual('/objects/a%20b/detail/',
+                         functions.reverse_object_url(self.viewname,
+                                                      'a%20b'))
+        self.mock_reverse.assert_called_once_with(self.viewname,
+                                                  args=('a%20b',))
+
+    def test_strict_pattern(self):
+        self.pattern = r'^[0-9]+$'
+        self.assertEqual('/objects/1/detail/',
+                         functions.reverse_object_url(self.viewname, 1))
+        self.assertEqual('/objects/2/detail/',
+                         functions.reverse_object_url(self.viewname, 2))
+        self.assertRaises(urls.NoReverseMatch,
+                          functions.reverse_object_url, self.viewname, 'a')
+        # The placeholder is only reversed once.
+        self.assertEqual(4, self.mock_reverse.call_count)
+
+    def test_reset_with_url_caches(self):
+        functions.reverse_object_url(self.viewname, 1)
+        urls.clear_url_caches()
+        functions.reverse_object_url(self.viewname, 2)
+        self.assertEqual(2, self.mock_reverse.call_count)
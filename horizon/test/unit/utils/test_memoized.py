@@ -10,6 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gc
+import threading
+import warnings
+
+from django import http
+import mock
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
@@ -80,3 +87,149 @@ class MemoizedTests(test.TestCase):
         cache_calls(4)
         self.assertEqual(9, len(values_list))
         # 4 is readded, 5 is dropped
+
+    def test_memoized_list_and_dict_arguments(self):
+        values_list = []
+
+        @memoized.memoized
+        def cache_calls(ids, filters):
+            values_list.append(ids)
+            return len(ids)
+
+        cache_calls(['a', 'b'], {'status': 'ACTIVE', 'name': 'x'})
+        cache_calls(['a', 'b'], {'name': 'x', 'status': 'ACTIVE'})
+        self.assertEqual(1, len(values_list))
+        cache_calls(['b', 'a'], {'name': 'x', 'status': 'ACTIVE'})
+        cache_calls(('a', 'b'), {'name': 'x', 'status': 'ACTIVE'})
+        self.assertEqual(3, len(values_list))
+
+    def test_memoized_unhashable_argument(self):
+        values_list = []
+
+        class Unhashable(object):
+            __slots__ = ()
+            __hash__ = None
+
+        @memoized.memoized
+        def cache_calls(param):
+            values_list.append(param)
+            return param
+
+        param = Unhashable()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            cache_calls(param)
+            cache_calls(param)
+        self.assertEqual(2, len(values_list))
+        self.assertTrue(issubclass(caught[0].category,
+                                   memoized.UnhashableKeyWarning))
+
+    def test_memoized_request_tier(self):
+        values_list = []
+
+        @memoized.memoized(max_size=1)
+        def cache_calls(request, param):
+            values_list.append(param)
+            return param
+
+        request1 = http.HttpRequest()
+        request2 = http.HttpRequest()
+        cache_calls(request1, 1)
+        cache_calls(request2, 2)
+        # Each request has its own entries, so request2 does not evict
+        # the entry of request1.
+        cache_calls(request1, 1)
+        cache_calls(request2, 2)
+        self.assertEqual([1, 2], values_list)
+        self.assertEqual(0, cache_calls.cache_info()['size'])
+
+    def test_memoized_process_scope(self):
+        values_list = []
+
+        @memoized.memoized(scope=memoized.PROCESS)
+        def cache_calls(request, param):
+            values_list.append(param)
+            return param
+
+        request = http.HttpRequest()
+        cache_calls(request, 1)
+        cache_calls(request, 1)
+        self.assertEqual([1], values_list)
+        self.assertEqual(1, cache_calls.cache_info()['size'])
+        del request
+        gc.collect()
+        cache_calls(http.HttpRequest(), 2)
+        # The entry of the collected request has been dropped.
+        self.assertEqual(1, cache_calls.cache_info()['size'])
+
+    @mock.patch.object(memoized.time, 'time')
+    def test_memoized_ttl(self, mock_time):
+        values_list = []
+
+        @memoized.memoized(ttl=10)
+        def cache_calls(param):
+            values_list.append(param)
+            return param
+
+        mock_time.return_value = 100
+        cache_calls(1)
+        mock_time.return_value = 109
+        cache_calls(1)
+        self.assertEqual(1, len(values_list))
+        mock_time.return_value = 110
+        cache_calls(1)
+        self.assertEqual(2, len(values_list))
+
+    def test_memoized_cache_info(self):
+        @memoized.memoized(max_size=2)
+        def cache_calls(param):
+            return param
+
+        for param in (1, 1, 2, 3, 3):
+            cache_calls(param)
+        info = cache_calls.cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(3, info['misses'])
+        self.assertEqual(1, info['evictions'])
+        self.assertEqual(2, info['size'])
+        self.assertIn(info, memoized.get_stats().values())
+
+        cache_calls.cache_clear()
+        self.assertEqual(0, cache_calls.cache_info()['size'])
+
+    def test_memoized_segments(self):
+        values_list = []
+
+        @memoized.memoized(max_size=memoized.SEGMENT_MIN_SIZE * 4)
+        def cache_calls(param):
+            values_list.append(param)
+            return param
+
+        params = range(memoized.SEGMENT_MIN_SIZE * 2)
+        for param in params:
+            cache_calls(param)
+        for param in params:
+            cache_calls(param)
+        self.assertEqual(len(params), len(values_list))
+
+    def test_memoized_concurrent_calls(self):
+        values_list = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoized.memoized
+        def cache_calls(param):
+            values_list.append(param)
+            started.set()
+            release.wait()
+            return param
+
+        threads = [threading.Thread(target=cache_calls, args=(1,))
+                   for i in range(3)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([1], values_list)
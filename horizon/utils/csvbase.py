@@ -104,7 +104,14 @@ class BaseCsvResponse(CsvDataMixin, HttpResponse):
 
 class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
-    """Base CSV Streaming class. Provides streaming response for CSV data."""
+    """Base CSV Streaming class. Provides streaming response for CSV data.
+
+    The rows returned by ``get_row_data`` are written as they are
+    generated, and sent in chunks of about ``chunk_size`` characters, so
+    the memory used does not depend on the number of rows.
+    """
+
+    chunk_size = 16384
 
     def __init__(self, request, template, context, content_type, **kwargs):
         super(BaseCsvStreamingResponse, self).__init__()
@@ -124,6 +131,7 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
     def buffer(self):
         buf = self.out.getvalue()
+        self.out.seek(0)
         self.out.truncate(0)
         return buf
 
@@ -136,7 +144,11 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
         for row in self.get_row_data():
             self.write_csv_row(row)
-            yield self.buffer()
+            if self.out.tell() >= self.chunk_size:
+                yield self.buffer()
+        buf = self.buffer()
+        if buf:
+            yield buf
 
     def get_row_data(self):
         return []
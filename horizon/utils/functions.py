@@ -14,6 +14,8 @@ import datetime
 import decimal
 import math
 import re
+import threading
+import weakref
 
 from oslo_utils import units
 import six
@@ -21,6 +23,7 @@ import six
 from django.conf import settings
 from django.contrib.auth import logout
 from django import http
+from django import urls
 from django.utils.encoding import force_text
 from django.utils.functional import lazy
 from django.utils import translation
@@ -192,3 +195,47 @@ def format_value(value):
 def one_year_from_now():
     now = datetime.datetime.utcnow()
     return now + datetime.timedelta(days=365)
+
+
+# Object ids made only of these characters are inserted in URLs unchanged.
+_SAFE_OBJECT_ID_RE = re.compile(r'^[A-Za-z0-9_.-]+$')
+# Reversed in place of object ids, it is accepted by the usual patterns like
+# [^/]+ but by none of the stricter ones, like UUID patterns.
+_OBJECT_ID_PLACEHOLDER = 'Horizon_Object-Id.0'
+_object_url_templates = weakref.WeakKeyDictionary()
+_object_url_templates_lock = threading.Lock()
+
+
+def reverse_object_url(viewname, obj_id):
+    """Returns ``reverse(viewname, args=(obj_id,))``.
+
+    Reversing a URL walks the URL patterns, which is slow when done for
+    every row of a large table. The URL of ``viewname`` is reversed once
+    with a placeholder id, and the ids of the objects are then inserted in
+    place of the placeholder. Ids which may need quoting, and views whose
+    pattern does not accept the placeholder, are reversed as usual.
+
+    The URLs are reset along with the URL resolver, for example by
+    ``django.urls.clear_url_caches``.
+    """
+    obj_id = six.text_type(obj_id)
+    if not _SAFE_OBJECT_ID_RE.match(obj_id):
+        return urls.reverse(viewname, args=(obj_id,))
+    resolver = urls.get_resolver(urls.get_urlconf())
+    key = (viewname, urls.get_script_prefix(), translation.get_language())
+    with _object_url_templates_lock:
+        url_templates = _object_url_templates.setdefault(resolver, {})
+        url_template = url_templates.get(key)
+    if url_template is None:
+        try:
+            url = urls.reverse(viewname, args=(_OBJECT_ID_PLACEHOLDER,))
+        except urls.NoReverseMatch:
+            url = ''
+        parts = url.split(_OBJECT_ID_PLACEHOLDER)
+        # False means the view must be reversed for each object.
+        url_template = len(parts) == 2 and tuple(parts)
+        with _object_url_templates_lock:
+            url_templates[key] = url_template
+    if not url_template:
+        return urls.reverse(viewname, args=(obj_id,))
+    return obj_id.join(url_template)
@@ -15,117 +15,331 @@
 import collections
 import functools
 import threading
+import time
 import warnings
 import weakref
 
 from django.conf import settings
+from django.http import HttpRequest
+import six
 
 
 class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
 
-def _try_weakref(arg, remove_callback):
-    """Return a weak reference to arg if possible, or arg itself if not."""
+# Cache tiers. Entries of the request tier are stored on the request passed
+# as the first argument, so they live as long as the request and requests
+# do not evict each other's entries. Entries of the process tier are shared
+# by all the threads of the process.
+AUTO = 'auto'
+REQUEST = 'request'
+PROCESS = 'process'
+
+# Caches do not own locks: each one uses one of these, picked from the
+# identity of the cache, so the number of locks does not grow with the
+# number of cached keys.
+LOCK_STRIPES = 32
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+# Process tier caches with room for at least twice this number of entries
+# are split in segments with their own lock, up to LOCK_STRIPES segments.
+SEGMENT_MIN_SIZE = 64
+
+_REQUEST_ATTR = '_memoized_segments'
+_MISSING = object()
+_SCALAR_TYPES = frozenset(six.string_types + six.integer_types +
+                          (six.binary_type, float, bool, type(None)))
+
+_caches = weakref.WeakSet()
+
+
+def _freeze(value):
+    """Return a hashable equivalent of a list, dict or set argument."""
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    if value_type is tuple:
+        return tuple([_freeze(item) for item in value])
+    if isinstance(value, list):
+        return (value_type, tuple([_freeze(item) for item in value]))
+    if isinstance(value, dict):
+        return (value_type, frozenset((key, _freeze(item))
+                                      for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (value_type, frozenset(_freeze(item) for item in value))
+    return value
+
+
+def _key_part(arg):
+    """Return a weak reference to arg if possible, or a hashable equivalent.
+
+    Creating a weak reference without a callback is cheap, as the reference
+    is shared by all the callers.
+    """
+    if type(arg) in _SCALAR_TYPES:
+        return arg
+    if isinstance(arg, (tuple, list, dict, set)):
+        return _freeze(arg)
     try:
-        arg = weakref.ref(arg, remove_callback)
+        return weakref.ref(arg)
     except TypeError:
-        # Not all types can have a weakref. That includes strings
-        # and floats and such, so just pass them through directly.
-        pass
-    return arg
+        # Not all types can have a weakref, so just pass them through
+        # directly.
+        return arg
 
 
-def _get_key(args, kwargs, remove_callback):
+def _get_key(args, kwargs):
     """Calculate the cache key, using weak references where possible."""
-    # Use tuples, because lists are not hashable.
-    weak_args = tuple(_try_weakref(arg, remove_callback) for arg in args)
-    # Use a tuple of (key, values) pairs, because dict is not hashable.
-    # Sort it, so that we don't depend on the order of keys.
-    weak_kwargs = tuple(sorted(
-        (key, _try_weakref(value, remove_callback))
-        for (key, value) in kwargs.items()))
-    return weak_args, weak_kwargs
+    key_args = tuple([_key_part(arg) for arg in args])
+    if not kwargs:
+        return key_args, ()
+    if len(kwargs) == 1:
+        return key_args, tuple((key, _key_part(value))
+                               for key, value in kwargs.items())
+    # Sort the keyword arguments, so that we don't depend on their order.
+    return key_args, tuple(sorted((key, _key_part(value))
+                                  for key, value in kwargs.items()))
+
+
+class _Counters(object):
+    __slots__ = ('hits', 'misses', 'evictions')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class _Pending(object):
+    """Marks a key whose value is being computed by a thread."""
+
+    __slots__ = ('event', 'owner')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.owner = threading.current_thread()
+
+
+class _Segment(object):
+    """A LRU mapping of keys to (value, expiration time, weakrefs)."""
+
+    __slots__ = ('entries', 'inflight', 'dead_keys', 'lock', 'counters',
+                 'max_size')
+
+    def __init__(self, lock, counters, max_size):
+        self.entries = collections.OrderedDict()
+        self.inflight = {}
+        # Keys of entries whose weakly referenced arguments are gone. They
+        # are appended by weakref callbacks, which may run while the lock
+        # is held, and removed by the next call.
+        self.dead_keys = collections.deque()
+        self.lock = lock
+        self.counters = counters
+        self.max_size = max_size
 
+    def purge(self):
+        while self.dead_keys:
+            self.entries.pop(self.dead_keys.popleft(), None)
 
-def memoized(func=None, max_size=None):
+
+class _FunctionCache(object):
+    """The cache of a memoized function."""
+
+    __slots__ = ('func', 'name', 'max_size', 'ttl', 'scope', 'segments',
+                 'request_counters', 'request_lock', '__weakref__')
+
+    def __init__(self, func, max_size, ttl, scope):
+        self.func = func
+        self.name = '%s.%s' % (func.__module__,
+                               getattr(func, '__qualname__', func.__name__))
+        self.max_size = max_size
+        self.ttl = ttl
+        self.scope = scope
+        self.segments = None
+        self.request_counters = _Counters()
+        self.request_lock = _locks[hash(self.name) % LOCK_STRIPES]
+
+    def _process_segments(self):
+        segments = self.segments
+        if segments is None:
+            count = max(1, min(LOCK_STRIPES,
+                               self.max_size // SEGMENT_MIN_SIZE))
+            size = -(-self.max_size // count)
+            first = hash(self.name)
+            segments = self.segments = [
+                _Segment(_locks[(first + i) % LOCK_STRIPES], _Counters(), size)
+                for i in range(count)]
+        return segments
+
+    def _request_segment(self, request):
+        segments = request.__dict__.get(_REQUEST_ATTR)
+        if segments is None:
+            segments = request.__dict__.setdefault(_REQUEST_ATTR, {})
+        segment = segments.get(self)
+        if segment is None:
+            segment = segments.setdefault(
+                self, _Segment(self.request_lock, self.request_counters,
+                               self.max_size))
+        return segment
+
+    def __call__(self, args, kwargs):
+        use_request = (self.scope != PROCESS and args and
+                       isinstance(args[0], HttpRequest))
+        try:
+            if use_request:
+                segment = self._request_segment(args[0])
+                key = _get_key(args[1:], kwargs)
+                hash(key)
+            else:
+                segments = self._process_segments()
+                key = _get_key(args, kwargs)
+                if len(segments) == 1:
+                    hash(key)
+                    segment = segments[0]
+                else:
+                    segment = segments[hash(key) % len(segments)]
+        except TypeError:
+            # The calculated key may be unhashable when an unhashable
+            # object is passed as one of the arguments. In that case, we
+            # can't cache anything and simply always call the function.
+            warnings.warn(
+                "The key of %s is not hashable and cannot be memoized\n"
+                % self.name, UnhashableKeyWarning, 3)
+            return self.func(*args, **kwargs)
+        return self._get_or_call(segment, key, args, kwargs,
+                                 weak=not use_request)
+
+    def _get_or_call(self, segment, key, args, kwargs, weak):
+        counters = segment.counters
+        while True:
+            with segment.lock:
+                if segment.dead_keys:
+                    segment.purge()
+                # Pop the entry and put it back to make it the most
+                # recently used one.
+                entry = segment.entries.pop(key, _MISSING)
+                if entry is not _MISSING:
+                    if entry[1] is None or entry[1] > time.time():
+                        segment.entries[key] = entry
+                        counters.hits += 1
+                        return entry[0]
+                    counters.evictions += 1
+                pending = segment.inflight.get(key)
+                if pending is None:
+                    pending = segment.inflight[key] = _Pending()
+                    counters.misses += 1
+                    break
+            if pending.owner is threading.current_thread():
+                # A recursive call with the same arguments.
+                return self.func(*args, **kwargs)
+            # Another thread is calling the function with the same
+            # arguments, its result is used once it is done.
+            pending.event.wait()
+
+        stored = False
+        try:
+            value = self.func(*args, **kwargs)
+            refs = self._watch_args(segment, key) if weak else ()
+            with segment.lock:
+                del segment.inflight[key]
+                stored = True
+                if refs is not None:
+                    expires = None
+                    if self.ttl:
+                        expires = time.time() + self.ttl
+                    segment.entries[key] = (value, expires, refs)
+                    while len(segment.entries) > segment.max_size:
+                        segment.entries.popitem(last=False)
+                        counters.evictions += 1
+        finally:
+            if not stored:
+                with segment.lock:
+                    segment.inflight.pop(key, None)
+            pending.event.set()
+        return value
+
+    @staticmethod
+    def _watch_args(segment, key):
+        """Return weakrefs dropping the entry of key when an argument dies.
+
+        None is returned if an argument is already gone.
+        """
+        def remove(ref):
+            segment.dead_keys.append(key)
+
+        refs = []
+        parts = key[0] + tuple(value for name, value in key[1])
+        for part in parts:
+            if isinstance(part, weakref.ref):
+                arg = part()
+                if arg is None:
+                    return None
+                refs.append(weakref.ref(arg, remove))
+        return refs
+
+    def info(self):
+        hits = misses = evictions = size = 0
+        segments = [(self.request_lock, self.request_counters, None)]
+        segments.extend((segment.lock, segment.counters, segment)
+                        for segment in self.segments or [])
+        for lock, counters, segment in segments:
+            with lock:
+                hits += counters.hits
+                misses += counters.misses
+                evictions += counters.evictions
+                if segment is not None:
+                    size += len(segment.entries)
+        return {'hits': hits, 'misses': misses, 'evictions': evictions,
+                'size': size, 'max_size': self.max_size, 'ttl': self.ttl}
+
+    def clear(self):
+        for segment in self.segments or []:
+            with segment.lock:
+                segment.entries.clear()
+
+
+def memoized(func=None, max_size=None, ttl=None, scope=AUTO):
     """Decorator that caches function calls.
 
     Caches the decorated function's return value the first time it is called
     with the given arguments.  If called later with the same arguments, the
     cached value is returned instead of calling the decorated function again.
+    Concurrent calls with the same arguments wait for the first one to
+    complete instead of calling the function again.
 
     It operates as a LRU cache and keeps up to the max_size value of cached
-    items, always clearing oldest items first.
+    items (``MEMOIZED_MAX_SIZE_DEFAULT`` by default), always clearing oldest
+    items first. When ttl is given, items are also dropped after ttl
+    seconds.
 
-    The cache uses weak references to the passed arguments, so it doesn't keep
-    them alive in memory forever.
+    When the first argument is a request, the items are stored on the
+    request, unless scope is ``PROCESS``: the max_size limit applies to each
+    request and the items are dropped with the request. Otherwise, the items
+    are shared by the whole process. The cache uses weak references to the
+    passed arguments where possible, so it doesn't keep them alive in memory
+    forever. Lists, dicts and sets are compared by their content.
+
+    The decorated function has ``cache_info()`` and ``cache_clear()``
+    attributes. The former returns the hit, miss and eviction counts, the
+    latter drops the items shared by the process.
     """
 
     def decorate(func):
-
-        # The dictionary in which all the data will be cached. This is a
-        # separate instance for every decorated function, and it's stored in a
-        # closure of the wrapped function.
-        cache = collections.OrderedDict()
-        locks = collections.defaultdict(threading.Lock)
-        if max_size:
-            max_cache_size = max_size
-        else:
-            max_cache_size = getattr(settings, 'MEMOIZED_MAX_SIZE_DEFAULT', 25)
+        cache_size = max_size
+        if not cache_size:
+            cache_size = getattr(settings, 'MEMOIZED_MAX_SIZE_DEFAULT', 25)
+        cache = _FunctionCache(func, cache_size, ttl, scope)
+        _caches.add(cache)
 
         @functools.wraps(func)
         def wrapped(*args, **kwargs):
-            # We need to have defined key early, to be able to use it in the
-            # remove() function, but we calculate the actual value of the key
-            # later on, because we need the remove() function for that.
-            key = None
-
-            def remove(ref):
-                """A callback to remove outdated items from cache."""
-                try:
-                    # The key here is from closure, and is calculated later.
-                    del cache[key]
-                    del locks[key]
-                except KeyError:
-                    # Some other weak reference might have already removed that
-                    # key -- in that case we don't need to do anything.
-                    pass
-
-            key = _get_key(args, kwargs, remove)
-            try:
-                with locks[key]:
-                    try:
-                        # We want cache hit to be as fast as possible, and
-                        # don't really care much about the speed of a cache
-                        # miss, because it will only happen once and likely
-                        # calls some external API, database, or some other slow
-                        # thing. That's why the hit is in straightforward code,
-                        # and the miss is in an exception.
-                        # We also want to pop the key and reset it to make sure
-                        # the position it has in the order updates.
-                        value = cache[key] = cache.pop(key)
-                    except KeyError:
-                        value = cache[key] = func(*args, **kwargs)
-            except TypeError:
-                # The calculated key may be unhashable when an unhashable
-                # object, such as a list, is passed as one of the arguments. In
-                # that case, we can't cache anything and simply always call the
-                # decorated function.
-                warnings.warn(
-                    "The key of %s %s is not hashable and cannot be memoized: "
-                    "%r\n" % (func.__module__, func.__name__, key),
-                    UnhashableKeyWarning, 2)
-                value = func(*args, **kwargs)
-
-            while len(cache) > max_cache_size:
-                try:
-                    popped_tuple = cache.popitem(last=False)
-                    locks.pop(popped_tuple[0], None)
-                except KeyError:
-                    pass
-
-            return value
+            return cache(args, kwargs)
+
+        wrapped.cache_info = cache.info
+        wrapped.cache_clear = cache.clear
+        # Keep the cache alive as long as the function for get_stats().
+        wrapped._memoized_cache = cache
         return wrapped
     if func and callable(func):
         return decorate(func)
@@ -136,3 +350,8 @@ def memoized(func=None, max_size=None):
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
 memoized_method = memoized
+
+
+def get_stats():
+    """Return a dict of cache_info() of every memoized function by name."""
+    return dict((cache.name, cache.info()) for cache in list(_caches))
@@ -511,6 +511,14 @@ class UpdateMembersStep(Step):
 
         The placeholder text used when the members list is empty.
 
+    .. attribute:: available_search_url
+
+        The URL the available members are searched at when the available
+        list is filtered, for those missing from the list. It is given the
+        filter as the ``q`` GET parameter and returns an object whose
+        ``items`` have an ``id`` and a ``name``. Defaults to ``None``, for
+        the list to be filtered as it is.
+
     """
     template_name = "horizon/common/_workflow_step_update_members.html"
     show_roles = True
@@ -518,6 +526,10 @@ class UpdateMembersStep(Step):
     members_list_title = _("Members")
     no_available_text = _("None available.")
     no_members_text = _("No members.")
+    available_search_url = None
+
+    def get_available_search_url(self):
+        return self.available_search_url
 
     def get_member_field_name(self, role_id):
         if issubclass(self.action_class, MembershipAction):
@@ -13,11 +13,16 @@
 
 """Policy engine for openstack_auth"""
 
+import collections
 import logging
 import os.path
+import re
+import threading
+import time
 
 from django.conf import settings
 from oslo_config import cfg
+from oslo_policy import _checks
 from oslo_policy import opts as policy_opts
 from oslo_policy import policy
 
@@ -29,6 +34,11 @@ LOG = logging.getLogger(__name__)
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
+# Matches the target fields a check reads, like %(project_id)s.
+_TARGET_FIELD_RE = re.compile(r'%\(([^)]+)\)')
+# Number of seconds between two checks of the policy files for changes.
+_POLICY_MTIME_CHECK_INTERVAL = 1
+
 
 def _get_policy_conf(policy_file, policy_dirs=None):
     conf = cfg.ConfigOpts()
@@ -73,6 +83,190 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    _decisions.clear()
+
+
+def get_policy_mtime():
+    """Return the latest modification time of the policy files.
+
+    The files of ``POLICY_FILES`` and those in the ``POLICY_DIRS``
+    directories are considered. Caches of policy decisions include it in
+    their keys, so that they are dropped when a policy file is edited.
+    """
+    paths = [os.path.join(_BASE_PATH, policy_file) for policy_file
+             in getattr(settings, 'POLICY_FILES', {}).values()]
+    for policy_dirs in getattr(settings, 'POLICY_DIRS', {}).values():
+        for policy_dir in policy_dirs:
+            policy_dir = os.path.join(_BASE_PATH, policy_dir)
+            # The directory itself changes when files are added or removed.
+            paths.append(policy_dir)
+            try:
+                paths.extend(os.path.join(policy_dir, name)
+                             for name in os.listdir(policy_dir))
+            except OSError:
+                pass
+    mtime = 0
+    for path in paths:
+        try:
+            mtime = max(mtime, os.path.getmtime(path))
+        except OSError:
+            pass
+    return mtime
+
+
+def _rule_target_fields(enforcer_scope, rule, seen=()):
+    """Return the names of the target fields a rule reads.
+
+    None is returned if the rule contains checks whose use of the target
+    is unknown, like HTTP checks.
+    """
+    if rule is None or isinstance(rule, (_checks.TrueCheck,
+                                         _checks.FalseCheck)):
+        return frozenset()
+    if isinstance(rule, _checks.NotCheck):
+        return _rule_target_fields(enforcer_scope, rule.rule, seen)
+    if isinstance(rule, (_checks.AndCheck, _checks.OrCheck)):
+        fields = set()
+        for sub_rule in rule.rules:
+            sub_fields = _rule_target_fields(enforcer_scope, sub_rule, seen)
+            if sub_fields is None:
+                return None
+            fields.update(sub_fields)
+        return frozenset(fields)
+    if type(rule) is _checks.RuleCheck:
+        if rule.match in seen:
+            return frozenset()
+        return _rule_target_fields(enforcer_scope,
+                                   enforcer_scope.rules.get(rule.match),
+                                   seen + (rule.match,))
+    if type(rule) in (_checks.RoleCheck, _checks.GenericCheck):
+        return frozenset(_TARGET_FIELD_RE.findall(rule.match))
+    return None
+
+
+def _credentials_key(credentials):
+    # The token is left out: it differs for each request of a user and
+    # policy rules do not read it.
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in credentials.items() if name != 'token'))
+
+
+class _DecisionCache(object):
+    """A LRU cache of policy decisions shared by all requests.
+
+    The rules of a policy usually read a few fields of the target, if any.
+    Decisions are thus keyed on the credentials and on the values of the
+    target fields read by the rule of the action only, so that the decision
+    of a rule which does not depend on the target is computed once per
+    set of credentials.
+
+    ``POLICY_DECISION_CACHE_SIZE`` bounds the number of decisions kept. A
+    value of 0 disables the cache. Decisions are dropped when the policy
+    files change.
+    """
+
+    def __init__(self):
+        self._decisions = collections.OrderedDict()
+        self._target_fields = {}
+        self._lock = threading.Lock()
+        self._policy_mtime = None
+        self._policy_checked = 0
+        self._counters = collections.Counter()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'POLICY_DECISION_CACHE_SIZE', 10000)
+
+    def clear(self):
+        with self._lock:
+            self._decisions.clear()
+            self._target_fields.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self._counters['hits'],
+                    'misses': self._counters['misses'],
+                    'uncacheable': self._counters['uncacheable'],
+                    'size': len(self._decisions),
+                    'max_size': self.max_size}
+
+    def _check_policy_files(self):
+        now = time.time()
+        if now - self._policy_checked < _POLICY_MTIME_CHECK_INTERVAL:
+            return
+        self._policy_checked = now
+        mtime = get_policy_mtime()
+        if mtime != self._policy_mtime:
+            self._policy_mtime = mtime
+            self.clear()
+
+    def _get_target_fields(self, enforcer_scope, scope, action):
+        key = (scope, action)
+        with self._lock:
+            if key in self._target_fields:
+                return self._target_fields[key]
+        enforcer_scope.load_rules()
+        rules = enforcer_scope.rules
+        # _check_credentials falls back to the default rule.
+        fields = _rule_target_fields(enforcer_scope,
+                                     rules.get(action, rules.get('default')))
+        default_fields = _rule_target_fields(enforcer_scope,
+                                             rules.get('default'))
+        if fields is not None and default_fields is not None:
+            fields = tuple(sorted(fields | default_fields))
+        else:
+            fields = None
+        with self._lock:
+            self._target_fields[key] = fields
+        return fields
+
+    def check(self, enforcer_scope, scope, action, target, credentials):
+        max_size = self.max_size
+        if max_size <= 0:
+            return _check_credentials(enforcer_scope, action, target,
+                                      credentials)
+        self._check_policy_files()
+        fields = self._get_target_fields(enforcer_scope, scope, action)
+        if fields is None:
+            with self._lock:
+                self._counters['uncacheable'] += 1
+            return _check_credentials(enforcer_scope, action, target,
+                                      credentials)
+
+        # Missing fields (None) are told apart from the repr of values.
+        key = (scope, action, _credentials_key(credentials),
+               tuple(repr(target[field]) if field in target else None
+                     for field in fields))
+        with self._lock:
+            decision = self._decisions.pop(key, None)
+            if decision is not None:
+                self._decisions[key] = decision
+                self._counters['hits'] += 1
+                return decision
+            self._counters['misses'] += 1
+
+        decision = _check_credentials(enforcer_scope, action, target,
+                                      credentials)
+        with self._lock:
+            self._decisions[key] = decision
+            while len(self._decisions) > max_size:
+                self._decisions.popitem(last=False)
+        return decision
+
+
+_decisions = _DecisionCache()
+
+
+def get_decision_cache_stats():
+    """Return the statistics of the cache of policy decisions.
+
+    The returned dict contains the number of ``hits`` and ``misses`` of the
+    cache, the number of ``uncacheable`` checks, whose rules may read any
+    part of the target, and the current ``size`` and ``max_size`` of the
+    cache.
+    """
+    return _decisions.stats()
 
 
 def check(actions, request, target=None):
@@ -161,15 +355,13 @@ def check(actions, request, target=None):
             # needed when a domain scoped token is present
             if scope == 'identity' and domain_credentials:
                 # use domain credentials
-                if not _check_credentials(enforcer[scope],
-                                          action,
-                                          target,
-                                          domain_credentials):
+                if not _decisions.check(enforcer[scope], scope, action,
+                                        target, domain_credentials):
                     return False
 
             # use project credentials
-            if not _check_credentials(enforcer[scope],
-                                      action, target, credentials):
+            if not _decisions.check(enforcer[scope], scope, action,
+                                    target, credentials):
                 return False
 
         # if no policy for scope, allow action, underlying API will
@@ -97,6 +97,10 @@ LOGGING = {
 
 AUTH_USER_MODEL = 'openstack_auth.User'
 
+# The cache is shared by all tests. Tests of the project list cache enable
+# it explicitly.
+PROJECT_LIST_CACHE_TIMEOUT = 0
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -34,6 +34,16 @@ class PolicyLoaderTestCase(test.TestCase):
         policy.reset()
         self.assertIsNone(policy._ENFORCER)
 
+    def test_policy_mtime(self):
+        mtime = policy.get_policy_mtime()
+        self.assertGreater(mtime, 0)
+        with mock.patch('os.path.getmtime', return_value=mtime + 10):
+            self.assertEqual(mtime + 10, policy.get_policy_mtime())
+
+    @test.override_settings(POLICY_FILES={'compute': 'missing.json'})
+    def test_policy_mtime_missing_file(self):
+        self.assertEqual(0, policy.get_policy_mtime())
+
 
 class PolicyTestCase(test.TestCase):
     _roles = []
@@ -213,3 +223,79 @@ class PolicyTestCaseV3Admin(PolicyTestCase):
         value = policy.check((("identity", "admin_or_cloud_admin"),),
                              request=self.request)
         self.assertTrue(value)
+
+
+class PolicyDecisionCacheTestCase(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def setUp(self):
+        super(PolicyDecisionCacheTestCase, self).setUp()
+        policy.reset()
+        self.stats = policy.get_decision_cache_stats()
+
+    def assertStats(self, hits, misses, uncacheable=0):
+        stats = policy.get_decision_cache_stats()
+        self.assertEqual(
+            (hits, misses, uncacheable),
+            (stats['hits'] - self.stats['hits'],
+             stats['misses'] - self.stats['misses'],
+             stats['uncacheable'] - self.stats['uncacheable']))
+
+    def test_target_independent_rule(self):
+        for project_id in ('project_1', 'project_2', 'project_1'):
+            self.assertFalse(policy.check(
+                (("identity", "admin_required"),), request=self.request,
+                target={'project_id': project_id}))
+        self.assertStats(hits=2, misses=1)
+
+    def test_target_dependent_rule(self):
+        for user_id, allowed in (('1', True), ('2', False), ('1', True)):
+            self.assertEqual(allowed, policy.check(
+                (("identity", "identity:change_password"),),
+                request=self.request, target={'user_id': user_id}))
+        self.assertStats(hits=1, misses=2)
+
+    def test_rule_not_found(self):
+        for i in range(2):
+            self.assertFalse(policy.check((("identity", "i_dont_exist"),),
+                                          request=self.request))
+        self.assertStats(hits=1, misses=1)
+
+    def test_credentials_change(self):
+        self.assertFalse(policy.check((("identity", "admin_required"),),
+                                      request=self.request))
+        self.MockClass.return_value = user.User(
+            id=1, roles=[{'id': '2', 'name': 'admin'}])
+        self.assertTrue(policy.check((("identity", "admin_required"),),
+                                     request=self.request))
+        self.assertStats(hits=0, misses=2)
+
+    def test_policy_files_change(self):
+        mtime = policy.get_policy_mtime()
+        policy.check((("identity", "admin_required"),), request=self.request)
+        policy._decisions._policy_checked = 0
+        with mock.patch.object(policy, 'get_policy_mtime',
+                               return_value=mtime + 10):
+            policy.check((("identity", "admin_required"),),
+                         request=self.request)
+        self.assertStats(hits=0, misses=2)
+
+    @test.override_settings(POLICY_DECISION_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        for i in range(2):
+            self.assertFalse(policy.check((("identity", "admin_required"),),
+                                          request=self.request))
+        self.assertStats(hits=0, misses=0)
+        self.assertEqual(0, policy.get_decision_cache_stats()['size'])
+
+    def test_rule_target_fields(self):
+        enforcer = policy._get_enforcer()['identity']
+        enforcer.load_rules()
+        self.assertEqual(frozenset(), policy._rule_target_fields(
+            enforcer, enforcer.rules['service_or_admin']))
+        self.assertEqual(frozenset(['user_id']), policy._rule_target_fields(
+            enforcer, enforcer.rules['admin_or_owner']))
+        self.assertEqual(frozenset(['user_id', 'target.credential.user_id']),
+                         policy._rule_target_fields(
+                             enforcer,
+                             enforcer.rules['identity:ec2_delete_credential']))
@@ -15,7 +15,10 @@ from django.conf import settings
 from django import http
 from django import test
 from django.test import client
+from django.core.cache import cache
 from django.test.utils import override_settings
+from keystoneclient.v3 import projects
+import mock
 
 from openstack_auth import utils
 
@@ -118,6 +121,72 @@ class UtilsTestCase(test.TestCase):
         self.assertEqual("RegionOne", default_region)
 
 
+@override_settings(PROJECT_LIST_CACHE_TIMEOUT=300)
+class ProjectListCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProjectListCacheTestCase, self).setUp()
+        cache.clear()
+        self.projects = [
+            projects.Project(None, {'id': 'p1', 'name': 'one',
+                                    'enabled': True}, loaded=True),
+            projects.Project(None, {'id': 'p2', 'name': 'two',
+                                    'enabled': False}, loaded=True),
+        ]
+        patcher = mock.patch.object(utils, 'get_project_list',
+                                    return_value=self.projects)
+        self.mock_get_project_list = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, user_id='user', token='token'):
+        return utils.get_cached_project_list(user_id, 'http://keystone',
+                                             token)
+
+    def test_cached(self):
+        self.assertEqual(self.projects, self._get())
+        cached = self._get()
+        self.assertEqual(1, self.mock_get_project_list.call_count)
+        self.assertEqual([('p1', 'one', True), ('p2', 'two', False)],
+                         [(p.id, p.name, p.enabled) for p in cached])
+        self.assertIsInstance(cached[0], projects.Project)
+
+    def test_keyed_on_user_and_token(self):
+        self._get()
+        self._get(token='other_token')
+        self._get(user_id='other_user')
+        self.assertEqual(3, self.mock_get_project_list.call_count)
+
+    def test_invalidate_token(self):
+        self._get()
+        self._get(token='other_token')
+        utils.invalidate_project_list('user', 'token')
+        self._get()
+        self._get(token='other_token')
+        self.assertEqual(3, self.mock_get_project_list.call_count)
+
+    def test_invalidate_user(self):
+        self._get()
+        self._get(user_id='other_user')
+        utils.invalidate_project_list('user')
+        self._get()
+        self._get(user_id='other_user')
+        self.assertEqual(3, self.mock_get_project_list.call_count)
+
+    def test_invalidate_all(self):
+        self._get()
+        self._get(user_id='other_user')
+        utils.invalidate_project_list()
+        self._get()
+        self._get(user_id='other_user')
+        self.assertEqual(4, self.mock_get_project_list.call_count)
+
+    @override_settings(PROJECT_LIST_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self._get()
+        self._get()
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+
 class BehindProxyTestCase(test.TestCase):
 
     def setUp(self):
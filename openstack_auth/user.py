@@ -47,8 +47,10 @@ def unset_session_user_variables(request):
 
 def create_user_from_token(request, token, endpoint, services_region=None):
     # if the region is provided, use that, otherwise use the preferred region
-    svc_region = services_region or \
-        utils.default_services_region(token.serviceCatalog, request, endpoint)
+    svc_region = services_region or utils.default_services_region(
+        token.serviceCatalog, request, endpoint,
+        catalog_index=utils.get_service_catalog_index(token.serviceCatalog,
+                                                      token.id))
     return User(id=token.user['id'],
                 token=token,
                 user=token.user['name'],
@@ -214,9 +216,11 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
         self.project_id = project_id or tenant_id
         self.project_name = project_name or tenant_name
         self.service_catalog = service_catalog
+        self._catalog_index = None
         self._services_region = (
             services_region or
-            utils.default_services_region(service_catalog)
+            utils.default_services_region(
+                service_catalog, catalog_index=self.service_catalog_index)
         )
         self.roles = roles or []
         self.endpoint = endpoint
@@ -293,11 +297,15 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
 
     @property
     def authorized_tenants(self):
-        """Returns a memoized list of tenants this user may access."""
+        """Returns a memoized list of tenants this user may access.
+
+        The list is shared by the requests of the user, see
+        :func:`openstack_auth.utils.get_cached_project_list`.
+        """
         if self.is_authenticated and self._authorized_tenants is None:
             endpoint = self.endpoint
             try:
-                self._authorized_tenants = utils.get_project_list(
+                self._authorized_tenants = utils.get_cached_project_list(
                     user_id=self.id,
                     auth_url=endpoint,
                     token=self.unscoped_token,
@@ -319,20 +327,26 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
     def services_region(self, region):
         self._services_region = region
 
+    @property
+    def service_catalog_index(self):
+        """The ServiceCatalogIndex of the service catalog of the user.
+
+        The index is shared by the requests using the same token.
+        """
+        catalog = self.service_catalog
+        cached = self._catalog_index
+        # The catalog may be replaced or, in tests, changed in place.
+        if (cached is None or cached[0] is not catalog or
+                cached[1] != len(catalog or ())):
+            index = utils.get_service_catalog_index(
+                catalog, getattr(self.token, 'id', None))
+            cached = self._catalog_index = (catalog, index.size, index)
+        return cached[2]
+
     @property
     def available_services_regions(self):
         """Returns list of unique region name values in service catalog."""
-        regions = []
-        if self.service_catalog:
-            for service in self.service_catalog:
-                service_type = service.get('type')
-                if service_type is None or service_type == 'identity':
-                    continue
-                for endpoint in service.get('endpoints', []):
-                    region = utils.get_endpoint_region(endpoint)
-                    if region not in regions:
-                        regions.append(region)
-        return regions
+        return list(self.service_catalog_index.service_regions)
 
     def save(*args, **kwargs):
         # Presume we can't write to Keystone.
@@ -11,13 +11,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import datetime
+import hashlib
 import logging
 import re
+import threading
+import uuid
 
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth import models
+from django.core.cache import cache
 from django.utils import timezone
 from keystoneauth1.identity import v2 as v2_auth
 from keystoneauth1.identity import v3 as v3_auth
@@ -32,6 +37,18 @@ LOG = logging.getLogger(__name__)
 
 _TOKEN_TIMEOUT_MARGIN = getattr(settings, 'TOKEN_TIMEOUT_MARGIN', 0)
 
+PROJECT_LIST_CACHE_PREFIX = 'openstack_auth:projects'
+
+# Mapping of V2 Catalog Endpoint_type to V3 Catalog Interfaces
+ENDPOINT_TYPE_TO_INTERFACE = {
+    'publicURL': 'public',
+    'internalURL': 'internal',
+    'adminURL': 'admin',
+}
+
+# Number of service catalog indexes shared by the requests of a process.
+CATALOG_INDEX_CACHE_SIZE = 1000
+
 """
 We need the request object to get the user, so we'll slightly modify the
 existing django.contrib.auth.get_user method. To do so we update the
@@ -367,8 +384,211 @@ def get_project_list(*args, **kwargs):
     return projects
 
 
+def _project_list_generation_keys(user_id):
+    return ('%s:generation' % PROJECT_LIST_CACHE_PREFIX,
+            '%s:%s:generation' % (PROJECT_LIST_CACHE_PREFIX, user_id))
+
+
+def _project_list_key(user_id, token):
+    """Return the cache key of the projects of a user and unscoped token.
+
+    The key contains the generation shared by all the users and the one of
+    the user, so that changing either drops the cached project lists.
+    """
+    keys = _project_list_generation_keys(user_id)
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Starting over with a new generation if it has been evicted
+            # makes sure no stale project list is used.
+            cache.add(key, uuid.uuid4().hex, None)
+            generations[key] = cache.get(key)
+    token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    return '%s:%s:%s:%s:%s' % (PROJECT_LIST_CACHE_PREFIX,
+                               generations[keys[0]], generations[keys[1]],
+                               user_id, token_hash)
+
+
+def get_project_list_cache_timeout():
+    """Return the lifetime of the cached project lists in seconds.
+
+    A value of 0 or less disables the cache.
+    """
+    return getattr(settings, 'PROJECT_LIST_CACHE_TIMEOUT', 300)
+
+
+def get_cached_project_list(user_id, auth_url, token, is_federated=False):
+    """Return the projects of a user, shared by the requests of the user.
+
+    The list is kept in the Django cache for ``PROJECT_LIST_CACHE_TIMEOUT``
+    seconds, keyed on the user id and a hash of the unscoped token.
+    """
+    timeout = get_project_list_cache_timeout()
+    if timeout <= 0 or not token:
+        return get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+
+    key = _project_list_key(user_id, token)
+    cached = cache.get(key)
+    if cached is not None:
+        return [project_class(None, info, loaded=True)
+                for project_class, info in cached]
+
+    projects = get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+    # The projects hold a reference to their client, only their class and
+    # attributes are stored.
+    cache.set(key, [(type(project), project.to_dict())
+                    for project in projects], timeout)
+    return projects
+
+
+def invalidate_project_list(user_id=None, token=None):
+    """Drop cached project lists.
+
+    If a token is given, only the project list of that unscoped token of
+    the user is dropped. If only a user id is given, all the project lists
+    of the user are dropped. Otherwise, the project lists of all the users
+    are dropped, for instance when a group is granted a role.
+    """
+    if user_id is not None and token:
+        cache.delete(_project_list_key(user_id, token))
+        return
+    key = _project_list_generation_keys(user_id)[0 if user_id is None else 1]
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+class ServiceCatalogIndex(object):
+    """An index of the endpoints of a service catalog.
+
+    Maps the service types to the URLs of their endpoints by region and
+    interface, so that looking an endpoint up does not scan the catalog.
+    The lookups return the endpoints a scan of the catalog in order would.
+    """
+
+    def __init__(self, service_catalog):
+        self.catalog = service_catalog
+        self.size = len(service_catalog or ())
+        self._services = {}
+        # Regions of the endpoints of all the services but identity, and
+        # of all the services, in catalog order.
+        self.service_regions = []
+        self.all_regions = []
+        for service in service_catalog or ():
+            service_type = service.get('type')
+            endpoints = service.get('endpoints', [])
+            for endpoint in endpoints:
+                region = get_endpoint_region(endpoint)
+                if region not in self.all_regions:
+                    self.all_regions.append(region)
+                if (service_type not in (None, 'identity') and
+                        region not in self.service_regions):
+                    self.service_regions.append(region)
+            if 'type' in service and service_type not in self._services:
+                self._services[service_type] = self._index_service(
+                    service_type, endpoints)
+
+    @staticmethod
+    def _index_service(service_type, endpoints):
+        # The endpoints of a v2 catalog are dicts of URLs by endpoint type,
+        # the first endpoint of a region is used. The endpoints of a v3
+        # catalog have a single interface, the first one of a region
+        # having the interface is used.
+        is_v3 = bool(endpoints) and 'interface' in endpoints[0]
+        by_region = collections.OrderedDict()
+        any_region = {}
+        for endpoint in endpoints:
+            region = get_endpoint_region(endpoint)
+            if is_v3:
+                by_region.setdefault(region, {}).setdefault(
+                    endpoint.get('interface'), endpoint.get('url'))
+                any_region.setdefault(endpoint.get('interface'),
+                                      endpoint.get('url'))
+            else:
+                by_region.setdefault(region, endpoint)
+                if not any_region:
+                    any_region = endpoint
+        # Identity endpoints are assumed to be global: the first ones are
+        # used if there is none in a region.
+        return {'is_v3': is_v3,
+                'regions': by_region,
+                'fallback': any_region if service_type == 'identity' else None}
+
+    def has_service(self, service_type):
+        return service_type in self._services
+
+    def url_for(self, service_type, region, endpoint_types):
+        """Return the URL of the first endpoint type found, or None.
+
+        :param endpoint_types: endpoint types to look up in order, like
+            ``('publicURL', 'internalURL')``. None values are skipped.
+        """
+        service = self._services.get(service_type)
+        if service is None:
+            return None
+        urls = service['regions'].get(region, service['fallback'])
+        if not urls:
+            return None
+        for endpoint_type in endpoint_types:
+            if not endpoint_type:
+                continue
+            if service['is_v3']:
+                url = urls.get(ENDPOINT_TYPE_TO_INTERFACE.get(endpoint_type,
+                                                              ''))
+            else:
+                url = urls.get(endpoint_type)
+            if url:
+                return url
+        return None
+
+    def is_service_enabled(self, service_type, region):
+        """Whether the service has endpoints in the region.
+
+        The region is ignored for the identity service.
+        """
+        service = self._services.get(service_type)
+        if service is None or not service['regions']:
+            return False
+        return service_type == 'identity' or region in service['regions']
+
+    def regions(self):
+        """Return the regions of the services in catalog order.
+
+        The regions of the identity endpoints are only returned if no other
+        service has endpoints.
+        """
+        return self.service_regions or self.all_regions
+
+
+_catalog_indexes = collections.OrderedDict()
+_catalog_indexes_lock = threading.Lock()
+
+
+def get_service_catalog_index(service_catalog, token_id=None):
+    """Return the ServiceCatalogIndex of a service catalog.
+
+    The catalog of a token does not change, so the indexes of the catalogs
+    of the last ``CATALOG_INDEX_CACHE_SIZE`` tokens are shared by the
+    requests of the process, keyed on the token id.
+    """
+    if token_id is None:
+        return ServiceCatalogIndex(service_catalog)
+    size = len(service_catalog or ())
+    with _catalog_indexes_lock:
+        index = _catalog_indexes.pop(token_id, None)
+        if index is not None and index.size == size:
+            _catalog_indexes[token_id] = index
+            return index
+    index = ServiceCatalogIndex(service_catalog)
+    with _catalog_indexes_lock:
+        _catalog_indexes[token_id] = index
+        while len(_catalog_indexes) > CATALOG_INDEX_CACHE_SIZE:
+            _catalog_indexes.popitem(last=False)
+    return index
+
+
 def default_services_region(service_catalog, request=None,
-                            ks_endpoint=None):
+                            ks_endpoint=None, catalog_index=None):
     """Return the default service region.
 
     Order of precedence:
@@ -379,19 +599,18 @@ def default_services_region(service_catalog, request=None,
 
     In each case the value must also be present in available_regions or
     we move to the next level of precedence.
+
+    The regions are read from ``catalog_index``, the ServiceCatalogIndex of
+    the catalog, if it is given.
     """
     if service_catalog:
-        available_regions = [get_endpoint_region(endpoint) for service
-                             in service_catalog for endpoint
-                             in service.get('endpoints', [])
-                             if (service.get('type') is not None and
-                                 service.get('type') != 'identity')]
+        if catalog_index is None:
+            catalog_index = ServiceCatalogIndex(service_catalog)
+        available_regions = catalog_index.service_regions
         if not available_regions:
             # this is very likely an incomplete keystone setup
             LOG.warning('No regions could be found excluding identity.')
-            available_regions = [get_endpoint_region(endpoint) for service
-                                 in service_catalog for endpoint
-                                 in service.get('endpoints', [])]
+            available_regions = catalog_index.all_regions
 
             if not available_regions:
                 # if there are no region setup for any service endpoint,
@@ -194,6 +194,9 @@ def logout(request, login_url=None, **kwargs):
     LOG.info(msg)
 
     """ Securely logs a user out. """
+    unscoped_token = getattr(request.user, 'unscoped_token', None)
+    if unscoped_token:
+        utils.invalidate_project_list(request.user.id, unscoped_token)
     if (utils.is_websso_enabled and utils.is_websso_default_redirect() and
             utils.get_websso_default_redirect_logout()):
         auth_user.unset_session_user_variables(request)
@@ -220,6 +223,9 @@ def switch(request, tenant_id, redirect_field_name=auth.REDIRECT_FIELD_NAME):
     auth = utils.get_token_auth_plugin(auth_url=endpoint,
                                        token=unscoped_token,
                                        project_id=tenant_id)
+    # Switching is the way to refresh the list of projects of the user.
+    if unscoped_token:
+        utils.invalidate_project_list(request.user.id, unscoped_token)
 
     try:
         auth_ref = auth.get_access(session)
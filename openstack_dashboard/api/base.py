@@ -18,17 +18,25 @@
 
 from collections import Sequence
 import functools
+import keyword
+import re
+import threading
 
 from django.conf import settings
 import semantic_version
 import six
 
+from openstack_auth import user as auth_user
+from openstack_auth import utils as auth_utils
+
 from horizon import exceptions
 
 
-__all__ = ('APIResourceWrapper', 'APIDictWrapper',
+__all__ = ('APIResourceWrapper', 'APIDictWrapper', 'compact_wrapper',
            'get_service_from_catalog', 'url_for',)
 
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 
 @functools.total_ordering
 class Version(object):
@@ -115,14 +123,12 @@ class APIResourceWrapper(object):
     def __init__(self, apiresource):
         self._apiresource = apiresource
 
-    def __getattribute__(self, attr):
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._attrs:
-                raise
-            # __getattr__ won't find properties
-            return getattr(self._apiresource, attr)
+    def __getattr__(self, attr):
+        # Only called when the regular lookup fails, so that attributes of
+        # the wrapper itself are read without any overhead.
+        if attr not in self._attrs:
+            raise AttributeError(attr)
+        return getattr(self._apiresource, attr)
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__,
@@ -157,13 +163,11 @@ class APIDictWrapper(object):
     def __init__(self, apidict):
         self._apidict = apidict
 
-    def __getattribute__(self, attr):
+    def __getattr__(self, attr):
         try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._apidict:
-                raise
             return self._apidict[attr]
+        except (KeyError, TypeError):
+            raise AttributeError(attr)
 
     def __getitem__(self, item):
         try:
@@ -191,6 +195,105 @@ class APIDictWrapper(object):
         return self._apidict
 
 
+class ResourceRecord(object):
+    """A copy of the attributes of an API resource."""
+
+    def __init__(self, attrs):
+        self.__dict__.update(attrs)
+
+
+_compact_classes = {}
+_compact_classes_lock = threading.Lock()
+
+
+def compact_wrapper(wrapper_class, fallback=False, slots=()):
+    """Return a compact variant of an APIResourceWrapper subclass.
+
+    Instances of the returned class copy the ``_attrs`` of the resource
+    into ``__slots__`` when they are created, so reading them is a plain
+    attribute access. Attributes whose names are not identifiers, like
+    ``OS-EXT-STS:power_state``, or which are shadowed by a property of the
+    wrapper are read from the resource as usual.
+
+    The wrapped resource is not kept unless ``fallback`` is True: it is
+    replaced by a :class:`ResourceRecord` of the attributes read from the
+    resource, which drops the client objects it references. Use
+    ``fallback`` when the wrapper reads attributes of the resource which
+    are not declared in ``_attrs``.
+
+    Unlike regular wrappers, compact ones do not reflect changes made to
+    the resource after they are created.
+
+    :param wrapper_class: A subclass of APIResourceWrapper.
+    :param fallback: Whether attributes are read lazily from the resource
+        when they are not copied into slots.
+    :param slots: Names of other attributes set by the constructor of the
+        wrapper, like ``request`` for api.nova.Server.
+    """
+    if not issubclass(wrapper_class, APIResourceWrapper):
+        raise TypeError('%s is not an APIResourceWrapper'
+                        % wrapper_class.__name__)
+    key = (wrapper_class, bool(fallback), tuple(slots))
+    compact_class = _compact_classes.get(key)
+    if compact_class is not None:
+        return compact_class
+
+    slot_attrs = tuple(attr for attr in wrapper_class._attrs
+                       if _IDENTIFIER_RE.match(attr) and
+                       not keyword.iskeyword(attr) and
+                       not hasattr(wrapper_class, attr))
+    other_attrs = tuple(attr for attr in wrapper_class._attrs
+                        if attr not in slot_attrs)
+
+    # Attributes of each resource class, like properties, which are not
+    # found in the instance dict of its resources.
+    class_attrs = {}
+
+    def read_attrs(apiresource, attrs):
+        # Attributes are read from the instance dict when possible, as
+        # missing attributes would otherwise raise an exception each, or
+        # even trigger a lazy load of the resource.
+        values = getattr(apiresource, '__dict__', None) or {}
+        resource_class = type(apiresource)
+        found = class_attrs.get((resource_class, attrs))
+        if found is None:
+            found = class_attrs[(resource_class, attrs)] = frozenset(
+                attr for attr in attrs if hasattr(resource_class, attr))
+        result = []
+        for attr in attrs:
+            if attr in values:
+                result.append((attr, values[attr]))
+            elif attr in found:
+                try:
+                    result.append((attr, getattr(apiresource, attr)))
+                except AttributeError:
+                    pass
+        return result
+
+    def __init__(self, apiresource, *args, **kwargs):
+        for attr, value in read_attrs(apiresource, slot_attrs):
+            setattr(self, attr, value)
+        wrapper_class.__init__(self, apiresource, *args, **kwargs)
+        if not fallback:
+            self._apiresource = ResourceRecord(
+                read_attrs(apiresource, other_attrs))
+
+    namespace = {
+        '__slots__': ('_apiresource',) + slot_attrs + tuple(
+            attr for attr in slots if attr not in slot_attrs),
+        '__init__': __init__,
+        '__module__': wrapper_class.__module__,
+        '__doc__': wrapper_class.__doc__,
+    }
+    with _compact_classes_lock:
+        compact_class = _compact_classes.get(key)
+        if compact_class is None:
+            compact_class = type('Compact%s' % wrapper_class.__name__,
+                                 (wrapper_class,), namespace)
+            _compact_classes[key] = compact_class
+    return compact_class
+
+
 class Quota(object):
     """Wrapper for individual limits in a quota."""
     def __init__(self, name, limit):
@@ -285,11 +388,7 @@ def get_version_from_service(service):
 
 
 # Mapping of V2 Catalog Endpoint_type to V3 Catalog Interfaces
-ENDPOINT_TYPE_TO_INTERFACE = {
-    'publicURL': 'public',
-    'internalURL': 'internal',
-    'adminURL': 'admin',
-}
+ENDPOINT_TYPE_TO_INTERFACE = auth_utils.ENDPOINT_TYPE_TO_INTERFACE
 
 
 def get_url_for_service(service, region, endpoint_type):
@@ -324,42 +423,32 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+def _get_catalog_index(user):
+    if isinstance(user, auth_user.User):
+        return user.service_catalog_index
+    return auth_utils.ServiceCatalogIndex(user.service_catalog)
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
+    index = _get_catalog_index(request.user)
+    if index.has_service(service_type):
         if not region:
             region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
+        url = index.url_for(service_type, region,
+                            (endpoint_type, fallback_endpoint_type))
         if url:
             return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                return True
-    return False
+    return _get_catalog_index(request.user).is_service_enabled(
+        service_type, request.user.services_region)
 
 
 def _get_endpoint_region(endpoint):
@@ -0,0 +1,175 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared cache of rarely changing resource catalogs.
+
+Tables such as the instance list fetch every flavor and image only to map
+their ids to names. This module keeps such catalogs in the Django cache so
+that they are shared by all requests (and all processes when a shared
+cache backend like memcached is configured).
+
+Entries are grouped in namespaces (e.g. ``flavors`` or ``images``) and
+identified within a namespace by a scope, such as the endpoint and the
+project the catalog was listed for. Invalidating a namespace drops all its
+entries at once by changing the generation which is part of their keys.
+Callers filling a missing entry read the generation before fetching the
+resources, and store the entry under that generation, so that an entry
+fetched before an invalidation is never used after it.
+
+The generations live in the Django cache as well: with a cache local to
+each process, such as the default LocMemCache, an invalidation only
+reaches the process which made the change, and the other ones keep their
+entries until they expire. A shared backend such as memcached is needed
+for changes made through one process to be seen by all of them.
+Each process counts the hits, misses and invalidations of every namespace,
+see get_stats().
+"""
+
+import collections
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'horizon:catalog'
+
+# Namespace of the server addresses retrieved from neutron, which are
+# cached by the neutron API and invalidated by the nova one as well.
+SERVER_ADDRESSES_NAMESPACE = 'server_addresses'
+
+_stats = collections.defaultdict(
+    lambda: {'hits': 0, 'misses': 0, 'invalidations': 0})
+_stats_lock = threading.Lock()
+
+
+def get_timeout():
+    """Return the lifetime of catalog entries in seconds.
+
+    A value of 0 or less disables the catalog cache.
+    """
+    return getattr(settings, 'RESOURCE_CATALOG_CACHE_TIMEOUT', 300)
+
+
+def get_revalidate_interval():
+    """Return the number of seconds a catalog entry is used as is.
+
+    Older entries are revalidated against the service, if it allows listing
+    only the resources changed since a given time.
+    """
+    return getattr(settings, 'RESOURCE_CATALOG_CACHE_REVALIDATE_INTERVAL', 30)
+
+
+def is_enabled():
+    return get_timeout() > 0
+
+
+def _generation_key(namespace):
+    return '%s:%s:generation' % (KEY_PREFIX, namespace)
+
+
+def get_generation(namespace):
+    """Return the current generation of ``namespace``.
+
+    It is read before an entry is looked up and fetched, and given to
+    set() or set_many() when the entry is stored.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # If the generation has been evicted from the cache, starting over
+        # with a new one makes sure no stale entries are used.
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def _count(namespace, hits=0, misses=0, invalidations=0):
+    with _stats_lock:
+        stats = _stats[namespace]
+        stats['hits'] += hits
+        stats['misses'] += misses
+        stats['invalidations'] += invalidations
+
+
+def get_stats():
+    """Return a dict of namespace -> hit, miss and invalidation counts.
+
+    The counts are those of the current process.
+    """
+    with _stats_lock:
+        return dict((namespace, dict(stats))
+                    for namespace, stats in _stats.items())
+
+
+def _make_key(namespace, scope, generation):
+    scope_hash = hashlib.sha1(repr(scope).encode('utf-8')).hexdigest()
+    return '%s:%s:%s:%s' % (KEY_PREFIX, namespace, generation, scope_hash)
+
+
+def get(namespace, scope, generation=None):
+    """Return the catalog entry of ``scope`` in ``namespace``, or None.
+
+    ``generation`` defaults to the current generation of ``namespace``.
+    """
+    if generation is None:
+        generation = get_generation(namespace)
+    value = cache.get(_make_key(namespace, scope, generation))
+    if value is None:
+        _count(namespace, misses=1)
+    else:
+        _count(namespace, hits=1)
+    return value
+
+
+def get_many(namespace, scopes, generation=None):
+    """Return a dict of scope -> entry for the scopes found in the cache."""
+    if generation is None:
+        generation = get_generation(namespace)
+    keys = dict((_make_key(namespace, scope, generation), scope)
+                for scope in scopes)
+    found = dict((keys[key], value)
+                 for key, value in cache.get_many(keys).items())
+    _count(namespace, hits=len(found), misses=len(keys) - len(found))
+    return found
+
+
+def set(namespace, scope, value, timeout=None, generation=None):
+    """Store a catalog entry. ``value`` must be picklable.
+
+    ``timeout`` defaults to ``RESOURCE_CATALOG_CACHE_TIMEOUT``.
+    ``generation`` is the one read before ``value`` was fetched, for the
+    entry to be dropped if the namespace was invalidated meanwhile. It
+    defaults to the current generation.
+    """
+    if timeout is None:
+        timeout = get_timeout()
+    if generation is None:
+        generation = get_generation(namespace)
+    cache.set(_make_key(namespace, scope, generation), value, timeout)
+
+
+def set_many(namespace, values, timeout=None, generation=None):
+    """Store a dict of scope -> entry at once, see set()."""
+    if timeout is None:
+        timeout = get_timeout()
+    if generation is None:
+        generation = get_generation(namespace)
+    cache.set_many(dict((_make_key(namespace, scope, generation), value)
+                        for scope, value in values.items()), timeout)
+
+
+def invalidate(namespace):
+    """Drop all catalog entries of ``namespace``."""
+    cache.set(_generation_key(namespace), uuid.uuid4().hex, None)
+    _count(namespace, invalidations=1)
@@ -36,9 +36,12 @@ from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
+from openstack_dashboard.api import client_pool
 from openstack_dashboard.api import microversions
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import futurist_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -47,6 +50,13 @@ LOG = logging.getLogger(__name__)
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
 
+# Namespace of the volume names in the catalog cache
+VOLUME_NAMES_NAMESPACE = 'volume_names'
+
+# Largest number of missing volume names retrieved with parallel volume gets
+# rather than with a summary listing of the project volumes
+VOLUME_NAMES_MAX_GETS = 3
+
 # Available consumer choices associated with QOS Specs
 CONSUMER_CHOICES = (
     ('back-end', _('back-end')),
@@ -208,7 +218,7 @@ def get_auth_params_from_request(request):
     )
 
 
-@memoized
+@client_pool.pooled(get_auth_params_from_request)
 def cinderclient(request, version=None):
     if version is None:
         api_version = VERSIONS.get_active_version()
@@ -345,6 +355,59 @@ def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
     return volumes, has_more_data, has_prev_data
 
 
+@profiler.trace
+def volume_names_get(request, volume_ids):
+    """Return a dict of volume id -> name of the given volumes.
+
+    A few missing names are retrieved with parallel volume gets, more of
+    them with a single summary listing of the volumes of the project.
+    Volumes which are not listed, like the volumes of other projects an
+    admin can see, are then retrieved one by one in parallel. Names are kept
+    in the shared catalog cache (see
+    :mod:`openstack_dashboard.api.catalog_cache`) for
+    ``RESOURCE_CATALOG_CACHE_TIMEOUT`` seconds, or until a volume is updated
+    through Horizon.
+    """
+    volume_ids = set(volume_ids)
+    names = {}
+    if catalog_cache.is_enabled():
+        generation = catalog_cache.get_generation(VOLUME_NAMES_NAMESPACE)
+        cached = catalog_cache.get_many(
+            VOLUME_NAMES_NAMESPACE,
+            [(request.user.tenant_id, volume_id) for volume_id in volume_ids],
+            generation)
+        names.update((scope[1], name) for scope, name in cached.items())
+
+    fetched = {}
+    missing = volume_ids - set(names)
+    # The listing returns every volume of the project, so it only pays off
+    # over a handful of gets.
+    if len(missing) > VOLUME_NAMES_MAX_GETS:
+        for volume in cinderclient(request).volumes.list(detailed=False):
+            if volume.id in missing:
+                fetched[volume.id] = Volume(volume).name
+        missing -= set(fetched)
+
+    if missing:
+        def _volume_name(volume_id):
+            volume = cinderclient(request).volumes.get(volume_id)
+            return Volume(volume).name
+
+        missing = list(missing)
+        volume_names = futurist_utils.call_functions_parallel(
+            *[(_volume_name, [volume_id]) for volume_id in missing])
+        fetched.update(zip(missing, volume_names))
+
+    if fetched and catalog_cache.is_enabled():
+        catalog_cache.set_many(
+            VOLUME_NAMES_NAMESPACE,
+            dict(((request.user.tenant_id, volume_id), name)
+                 for volume_id, name in fetched.items()),
+            generation=generation)
+    names.update(fetched)
+    return names
+
+
 @profiler.trace
 def volume_get(request, volume_id):
     client = _cinderclient_with_generic_groups(request)
@@ -417,8 +480,10 @@ def volume_set_bootable(request, volume_id, bootable):
 def volume_update(request, volume_id, name, description):
     vol_data = {'name': name,
                 'description': description}
-    return cinderclient(request).volumes.update(volume_id,
-                                                **vol_data)
+    volume = cinderclient(request).volumes.update(volume_id,
+                                                  **vol_data)
+    catalog_cache.invalidate(VOLUME_NAMES_NAMESPACE)
+    return volume
 
 
 @profiler.trace
@@ -786,7 +851,10 @@ def tenant_quota_get(request, tenant_id):
 
 @profiler.trace
 def tenant_quota_update(request, tenant_id, **kwargs):
-    return cinderclient(request).quotas.update(tenant_id, **kwargs)
+    quotas = cinderclient(request).quotas.update(tenant_id, **kwargs)
+    # Usages are cached by openstack_dashboard.usage.quotas.
+    catalog_cache.invalidate('quota_usages')
+    return quotas
 
 
 @profiler.trace
@@ -0,0 +1,170 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Process-wide pool of service API clients.
+
+Service clients such as novaclient or neutronclient own a keystoneauth
+session and, through it, a ``requests`` connection pool. Building them for
+every Django request means paying a TLS handshake per service per page.
+The pool defined here shares clients between requests made with the same
+token, project and endpoint so keep-alive connections stay warm.
+"""
+
+import collections
+import datetime
+import functools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import signals as auth_signals
+from django.utils import timezone
+
+from horizon.utils import memoized
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _token_lifetime(token):
+    """Return the number of seconds until ``token`` expires, or None."""
+    expiration = getattr(token, 'expires', None)
+    if expiration is None:
+        return None
+    margin = getattr(settings, 'TOKEN_TIMEOUT_MARGIN', 0)
+    expiration = expiration - datetime.timedelta(seconds=margin)
+    if timezone.is_naive(expiration):
+        # Presumes that the Keystone is using UTC.
+        expiration = timezone.make_aware(expiration, timezone.utc)
+    return (expiration - timezone.now()).total_seconds()
+
+
+class ClientPool(object):
+    """A thread-safe LRU pool of API clients with per-entry expiry.
+
+    Each entry is stored with the token id it was created for, so that
+    all clients of a token can be dropped when the user logs out.
+    """
+
+    def __init__(self):
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'API_CLIENT_POOL_MAX_SIZE', 100)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'API_CLIENT_POOL_TTL', 300)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, key, token, factory):
+        """Return the pooled client for ``key``, creating it if needed.
+
+        :param key: A hashable key identifying the client.
+        :param token: The openstack_auth.user.Token the client authenticates
+            with. Its expiration bounds the lifetime of the entry.
+        :param factory: A callable without arguments creating the client.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._clients[key] = entry
+                return entry[2]
+
+        client = factory()
+
+        lifetime = self.ttl
+        token_lifetime = _token_lifetime(token)
+        if token_lifetime is not None:
+            lifetime = min(lifetime, token_lifetime)
+        if lifetime <= 0:
+            return client
+
+        with self._lock:
+            self._clients[key] = (now + lifetime, token.id, client)
+            self._evict(now)
+        return client
+
+    def _evict(self, now):
+        # Expired entries are dropped first, then the least recently
+        # used ones until the pool fits in its configured size.
+        expired = [key for key, entry in self._clients.items()
+                   if entry[0] <= now]
+        for key in expired:
+            del self._clients[key]
+        max_size = self.max_size
+        while len(self._clients) > max_size:
+            self._clients.popitem(last=False)
+
+    def evict_token(self, token_id):
+        """Drop all clients created for the given token id."""
+        with self._lock:
+            keys = [key for key, entry in self._clients.items()
+                    if entry[1] == token_id]
+            for key in keys:
+                del self._clients[key]
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+pool = ClientPool()
+
+
+def pooled(key_func):
+    """Decorator sharing the client built by a function across requests.
+
+    The decorated function must take ``request`` as its first argument.
+    ``key_func`` is called with the request and must return a hashable
+    value identifying the credentials and endpoint the client is bound to
+    (typically the ``get_auth_params_from_request`` of an API module).
+    The remaining arguments of the decorated function, such as the API
+    version, are appended to the key.
+
+    When ``API_CLIENT_POOL_ENABLED`` is False, clients are only memoized
+    for the lifetime of the request.
+    """
+    def decorate(func):
+        memoized_func = memoized.memoized(func)
+
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            if not getattr(settings, 'API_CLIENT_POOL_ENABLED', True):
+                return memoized_func(request, *args, **kwargs)
+            key = (func.__module__, func.__name__, key_func(request),
+                   args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                LOG.debug('Key for %s.%s is not hashable, client is not '
+                          'pooled.', func.__module__, func.__name__)
+                return func(request, *args, **kwargs)
+            return pool.get(key, request.user.token,
+                            functools.partial(func, request, *args, **kwargs))
+        return wrapped
+    return decorate
+
+
+def _evict_logged_out_user(sender, request, user, **kwargs):
+    token = getattr(user, 'token', None)
+    if token is not None:
+        pool.evict_token(token.id)
+
+
+auth_signals.user_logged_out.connect(_evict_logged_out_user)
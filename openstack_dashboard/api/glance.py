@@ -24,6 +24,7 @@ import itertools
 import json
 import logging
 import os
+import time
 
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
@@ -37,6 +38,8 @@ from six.moves import _thread as thread
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
+from openstack_dashboard.api import client_pool
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 
@@ -143,7 +146,15 @@ class Image(base.APIResourceWrapper):
         return not self.__eq__(other_image)
 
 
-@memoized
+def get_auth_params_from_request(request):
+    return (
+        request.user.token.id,
+        request.user.tenant_id,
+        base.url_for(request, 'image'),
+    )
+
+
+@client_pool.pooled(get_auth_params_from_request)
 def glanceclient(request, version=None):
     api_version = VERSIONS.get_active_version()
 
@@ -258,7 +269,9 @@ def _normalize_list_input(filters, **kwargs):
 
 @profiler.trace
 def image_delete(request, image_id):
-    return glanceclient(request).images.delete(image_id)
+    result = glanceclient(request).images.delete(image_id)
+    catalog_cache.invalidate('images')
+    return result
 
 
 @profiler.trace
@@ -388,6 +401,89 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
     return wrapped_images, has_more_data, has_prev_data
 
 
+class CachedImageResource(dict):
+    """Image properties restored from the catalog cache.
+
+    Provides the attribute access of glanceclient image models to a plain
+    dictionary, so it can be wrapped by :class:`Image`.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _image_catalog(request, filters, project_id=None):
+    # Returns a dict of image id -> image properties of the images matching
+    # filters. Entries older than the revalidate interval are updated with
+    # the images changed since the most recent 'updated_at' seen, and are
+    # listed from scratch once the catalog cache timeout is reached.
+    scope = (base.url_for(request, 'image'), project_id,
+             sorted(filters.items()))
+    generation = catalog_cache.get_generation('images')
+    entry = catalog_cache.get('images', scope, generation)
+    now = time.time()
+    if entry is not None:
+        if now - entry['checked_at'] < \
+                catalog_cache.get_revalidate_interval():
+            return entry['images']
+        if (now - entry['loaded_at'] >= catalog_cache.get_timeout() or
+                entry['updated_at'] is None):
+            entry = None
+
+    if entry is None:
+        entry = {'images': {}, 'loaded_at': now, 'updated_at': None}
+        images = image_list_detailed(request, filters=dict(filters))[0]
+    else:
+        changed_filters = dict(filters,
+                               updated_at='gte:%s' % entry['updated_at'])
+        images = image_list_detailed(request, filters=changed_filters)[0]
+
+    for image in images:
+        entry['images'][image.id] = dict(image._apiresource)
+        if image.updated_at and (entry['updated_at'] is None or
+                                 image.updated_at > entry['updated_at']):
+            entry['updated_at'] = image.updated_at
+    entry['checked_at'] = now
+    catalog_cache.set('images', scope, entry, generation=generation)
+    return entry['images']
+
+
+def image_list_cached(request):
+    """Get the list of images available to the project.
+
+    The public and community images are kept in the shared catalog cache
+    (see :mod:`openstack_dashboard.api.catalog_cache`) once per image
+    endpoint and the images owned by or shared with the project are cached
+    per project. This is meant for views which only need to look up images by
+    id, like instance tables, and returns at most ``API_RESULT_LIMIT``
+    images of each kind.
+
+    The catalog is refreshed when an image is created, updated or deleted
+    through Horizon; changes made by other clients are picked up after
+    ``RESOURCE_CATALOG_CACHE_REVALIDATE_INTERVAL`` seconds, and deleted
+    images after ``RESOURCE_CATALOG_CACHE_TIMEOUT`` seconds.
+    """
+    # Glance v1 has no way to list only the images changed since a given
+    # time, so only v2 is cached.
+    if not catalog_cache.is_enabled() or VERSIONS.active < 2:
+        return image_list_detailed(request)[0]
+    project_id = request.user.tenant_id
+    images = dict(_image_catalog(request, {'visibility': 'public'}))
+    try:
+        images.update(_image_catalog(request, {'visibility': 'community'}))
+    except glance_client.exc.HTTPBadRequest:
+        # Community images require the image API v2.5 or later.
+        LOG.debug('Community images are not supported by the image service')
+    images.update(_image_catalog(request, {'visibility': 'shared'},
+                                 project_id))
+    images.update(_image_catalog(request, {'owner': project_id},
+                                 project_id))
+    return [Image(CachedImageResource(image)) for image in images.values()]
+
+
 @profiler.trace
 def image_update(request, image_id, **kwargs):
     image_data = kwargs.get('data', None)
@@ -398,8 +494,10 @@ def image_update(request, image_id, **kwargs):
         # to remove, and the default is nothing gets removed.
         if VERSIONS.active < 2:
             kwargs['purge_props'] = False
-        return Image(glanceclient(request).images.update(
+        image = Image(glanceclient(request).images.update(
             image_id, **kwargs))
+        catalog_cache.invalidate('images')
+        return image
     finally:
         if image_data:
             try:
@@ -541,6 +639,7 @@ def image_create(request, **kwargs):
         location = kwargs.pop('location', None)
 
     image = glanceclient(request).images.create(**kwargs)
+    catalog_cache.invalidate('images')
     if location is not None:
         glanceclient(request).images.add_location(image.id, location, {})
 
@@ -585,9 +684,11 @@ def image_create(request, **kwargs):
 @profiler.trace
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
-    return glanceclient(request, '2').images.update(image_id,
-                                                    remove_props,
-                                                    **kwargs)
+    image = glanceclient(request, '2').images.update(image_id,
+                                                     remove_props,
+                                                     **kwargs)
+    catalog_cache.invalidate('images')
+    return image
 
 
 @profiler.trace
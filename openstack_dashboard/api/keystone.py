@@ -17,6 +17,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
 import collections
 import logging
 
@@ -39,11 +40,18 @@ from horizon import messages
 from horizon.utils import functions as utils
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 
 
 LOG = logging.getLogger(__name__)
+
+# Number of entries of each chunk of the cached identity list indexes. An
+# entry is the sort key and the ID of a resource, so a chunk stays well below
+# the 1 MB item size of memcached.
+LIST_INDEX_CHUNK_SIZE = 2000
 DEFAULT_ROLE = None
 DEFAULT_DOMAIN = getattr(settings, 'OPENSTACK_KEYSTONE_DEFAULT_DOMAIN',
                          'Default')
@@ -211,30 +219,171 @@ def get_identity_api_version(request):
     return endpoint_data.api_version
 
 
+def _invalidate_project_lists(user=None):
+    """Drop the cached project lists a change of role assignments affects.
+
+    The project lists of all the users are dropped if no user is given.
+    """
+    auth_utils.invalidate_project_list(
+        user_id=getattr(user, 'id', user) if user is not None else None)
+    catalog_cache.invalidate('projects')
+
+
+def _sort_key(resource):
+    return (getattr(resource, 'name', None) or '').lower(), resource.id
+
+
+def _list_page_from_listing(request, namespace, manager, marker, scope,
+                            generation, **kwargs):
+    # Lists all the resources, and caches their index for the next pages.
+    page_size = utils.get_page_size(request)
+    resources = sorted(manager.list(**kwargs), key=_sort_key)
+    if scope is not None:
+        keys = [_sort_key(resource) for resource in resources]
+        chunks = [keys[start:start + LIST_INDEX_CHUNK_SIZE]
+                  for start in range(0, len(keys), LIST_INDEX_CHUNK_SIZE)]
+        catalog_cache.set_many(
+            namespace,
+            dict((scope + (index,), chunk)
+                 for index, chunk in enumerate(chunks)),
+            generation=generation)
+        header = {'firsts': [chunk[0] for chunk in chunks],
+                  'count': len(keys)}
+        catalog_cache.set(namespace, scope, header, generation=generation)
+    start = 0
+    if marker is not None:
+        start = next((index + 1 for index, resource in enumerate(resources)
+                      if resource.id == marker), 0)
+    return (resources[start:start + page_size],
+            len(resources) > start + page_size)
+
+
+def _list_page_from_index(request, namespace, manager, marker, scope,
+                          generation, header):
+    # Returns None when chunks of the index were evicted from the cache.
+    page_size = utils.get_page_size(request)
+    start_key = None
+    if marker is not None:
+        try:
+            start_key = _sort_key(manager.get(marker))
+        except keystone_exceptions.NotFound:
+            pass
+    first_chunk = 0
+    if start_key is not None:
+        first_chunk = max(bisect.bisect_right(header['firsts'],
+                                              start_key) - 1, 0)
+    chunk_indexes = range(
+        first_chunk,
+        min(first_chunk + 2 + page_size // LIST_INDEX_CHUNK_SIZE,
+            len(header['firsts'])))
+    chunks = catalog_cache.get_many(
+        namespace, [scope + (index,) for index in chunk_indexes], generation)
+    if len(chunks) < len(chunk_indexes):
+        return None
+    keys = []
+    for index in chunk_indexes:
+        keys.extend(chunks[scope + (index,)])
+    start = 0
+    if start_key is not None:
+        start = bisect.bisect_right(keys, start_key)
+    page_keys = keys[start:start + page_size]
+
+    def _get(resource_id):
+        try:
+            return manager.get(resource_id)
+        except keystone_exceptions.NotFound:
+            return None
+
+    resources = futurist_utils.call_functions_parallel(
+        *[(_get, [key[1]]) for key in page_keys])
+    resources = [resource for resource in resources if resource is not None]
+    has_more = (first_chunk * LIST_INDEX_CHUNK_SIZE + start + page_size <
+                header['count'])
+    return resources, has_more
+
+
+def _list_page(request, namespace, manager, marker=None, **kwargs):
+    """Return the page of resources following marker, and if more follow.
+
+    Keystone can neither sort nor paginate its listings, so the resources
+    are listed, no more than the ``list_limit`` of Keystone when it is set,
+    and sorted by name and ID. marker is the ID of the last resource of the
+    previous page. The first page is returned if the marker is not found.
+
+    When the catalog cache is enabled, an index of the sorted resources
+    holding only their sort keys and IDs is kept in chunks in ``namespace``.
+    The following pages then look the marker up in the chunk it falls in,
+    and only get the resources of the page from Keystone.
+    """
+    if not catalog_cache.is_enabled():
+        return _list_page_from_listing(request, namespace, manager, marker,
+                                       None, None, **kwargs)
+    scope = (request.user.endpoint, request.user.id,
+             tuple(sorted(kwargs.items())))
+    generation = catalog_cache.get_generation(namespace)
+    header = catalog_cache.get(namespace, scope, generation)
+    if header is not None:
+        page = _list_page_from_index(request, namespace, manager, marker,
+                                     scope, generation, header)
+        if page is not None:
+            return page
+    return _list_page_from_listing(request, namespace, manager, marker,
+                                   scope, generation, **kwargs)
+
+
+def _get_cached_list(request, namespace, manager, **kwargs):
+    """Return the resources listed by manager, kept in the catalog cache.
+
+    Used for the domains and the roles, which rarely change but are looked
+    up by most identity pages.
+    """
+    if not catalog_cache.is_enabled():
+        return manager.list(**kwargs)
+    scope = (request.user.endpoint, request.user.id, sorted(kwargs.items()))
+    generation = catalog_cache.get_generation(namespace)
+    infos = catalog_cache.get(namespace, scope, generation)
+    if infos is None:
+        infos = [resource._info for resource in manager.list(**kwargs)]
+        catalog_cache.set(namespace, scope, infos, generation=generation)
+    return [manager.resource_class(manager, info, loaded=True)
+            for info in infos]
+
+
 @profiler.trace
 def domain_create(request, name, description=None, enabled=None):
     manager = keystoneclient(request, admin=True).domains
-    return manager.create(name=name,
-                          description=description,
-                          enabled=enabled)
+    domain = manager.create(name=name,
+                            description=description,
+                            enabled=enabled)
+    catalog_cache.invalidate('domains')
+    return domain
 
 
 @profiler.trace
 def domain_get(request, domain_id):
     manager = keystoneclient(request, admin=True).domains
-    return manager.get(domain_id)
+    if not catalog_cache.is_enabled():
+        return manager.get(domain_id)
+    scope = (request.user.endpoint, request.user.id, domain_id)
+    generation = catalog_cache.get_generation('domains')
+    info = catalog_cache.get('domains', scope, generation)
+    if info is None:
+        info = manager.get(domain_id)._info
+        catalog_cache.set('domains', scope, info, generation=generation)
+    return manager.resource_class(manager, info, loaded=True)
 
 
 @profiler.trace
 def domain_delete(request, domain_id):
     manager = keystoneclient(request, admin=True).domains
     manager.delete(domain_id)
+    catalog_cache.invalidate('domains')
 
 
 @profiler.trace
 def domain_list(request):
     manager = keystoneclient(request, admin=True).domains
-    return manager.list()
+    return _get_cached_list(request, 'domains', manager)
 
 
 def domain_lookup(request):
@@ -261,6 +410,7 @@ def domain_update(request, domain_id, name=None, description=None,
     except Exception:
         LOG.exception("Unable to update Domain: %s", domain_id)
         raise
+    catalog_cache.invalidate('domains')
     return response
 
 
@@ -270,13 +420,15 @@ def tenant_create(request, name, description=None, enabled=None,
     manager = VERSIONS.get_project_manager(request, admin=True)
     try:
         if VERSIONS.active < 3:
-            return manager.create(name, description, enabled, **kwargs)
+            project = manager.create(name, description, enabled, **kwargs)
         else:
-            return manager.create(name, domain,
-                                  description=description,
-                                  enabled=enabled, **kwargs)
+            project = manager.create(name, domain,
+                                     description=description,
+                                     enabled=enabled, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    catalog_cache.invalidate('projects')
+    return project
 
 
 def get_default_domain(request, get_name=True):
@@ -364,6 +516,7 @@ def tenant_get(request, project, admin=True):
 def tenant_delete(request, project):
     manager = VERSIONS.get_project_manager(request, admin=True)
     manager.delete(project)
+    _invalidate_project_lists()
 
 
 @profiler.trace
@@ -404,6 +557,9 @@ def tenant_list(request, paginate=False, marker=None, domain=None, user=None,
                 tenants = []
             except Exception:
                 exceptions.handle(request)
+        elif paginate:
+            tenants, has_more_data = _list_page(request, 'projects', manager,
+                                                marker, **kwargs)
         else:
             tenants = manager.list(**kwargs)
     return tenants, has_more_data
@@ -415,28 +571,36 @@ def tenant_update(request, project, name=None, description=None,
     manager = VERSIONS.get_project_manager(request, admin=True)
     try:
         if VERSIONS.active < 3:
-            return manager.update(project, name, description, enabled,
-                                  **kwargs)
+            project = manager.update(project, name, description, enabled,
+                                     **kwargs)
         else:
-            return manager.update(project, name=name, description=description,
-                                  enabled=enabled, domain=domain, **kwargs)
+            project = manager.update(project, name=name,
+                                     description=description,
+                                     enabled=enabled, domain=domain, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    # The project lists show the name and the state of the projects.
+    _invalidate_project_lists()
+    return project
+
+
+def _user_list_kwargs(project=None, domain=None, group=None, filters=None):
+    if VERSIONS.active < 3:
+        return {"tenant_id": project}
+    kwargs = {
+        "project": project,
+        "domain": domain,
+        "group": group
+    }
+    if filters is not None:
+        kwargs.update(filters)
+    return kwargs
 
 
 @profiler.trace
 def user_list(request, project=None, domain=None, group=None, filters=None):
     users = []
-    if VERSIONS.active < 3:
-        kwargs = {"tenant_id": project}
-    else:
-        kwargs = {
-            "project": project,
-            "domain": domain,
-            "group": group
-        }
-        if filters is not None:
-            kwargs.update(filters)
+    kwargs = _user_list_kwargs(project, domain, group, filters)
     if 'id' in kwargs:
         try:
             users = [user_get(request, kwargs['id'])]
@@ -447,6 +611,44 @@ def user_list(request, project=None, domain=None, group=None, filters=None):
     return [VERSIONS.upgrade_v2_user(user) for user in users]
 
 
+@profiler.trace
+def user_list_paged(request, project=None, domain=None, group=None,
+                    filters=None, marker=None):
+    """Return a page of users sorted by name, and if more pages follow.
+
+    marker is the ID of the last user of the previous page.
+    """
+    kwargs = _user_list_kwargs(project, domain, group, filters)
+    if 'id' in kwargs:
+        return user_list(request, project, domain, group, filters), False
+    manager = keystoneclient(request, admin=True).users
+    users, has_more_data = _list_page(request, 'users', manager, marker,
+                                      **kwargs)
+    return [VERSIONS.upgrade_v2_user(user) for user in users], has_more_data
+
+
+@profiler.trace
+def user_search(request, query, domain=None, limit=None):
+    """Return the users of a domain whose name starts with query.
+
+    At most limit users are returned, sorted by name, ``API_RESULT_PAGE_SIZE``
+    by default. Keystone v3 filters the users by name.
+    """
+    if limit is None:
+        limit = utils.get_page_size(request)
+    manager = keystoneclient(request, admin=True).users
+    kwargs = _user_list_kwargs(domain=domain)
+    if VERSIONS.active >= 3:
+        kwargs['name__istartswith'] = query
+        users = manager.list(**kwargs)
+    else:
+        prefix = query.lower()
+        users = [user for user in manager.list(**kwargs)
+                 if _sort_key(user)[0].startswith(prefix)]
+    users = sorted(users, key=_sort_key)[:limit]
+    return [VERSIONS.upgrade_v2_user(user) for user in users]
+
+
 @profiler.trace
 def user_create(request, name=None, email=None, password=None, project=None,
                 enabled=None, domain=None, description=None, **data):
@@ -454,19 +656,22 @@ def user_create(request, name=None, email=None, password=None, project=None,
     try:
         if VERSIONS.active < 3:
             user = manager.create(name, password, email, project, enabled)
-            return VERSIONS.upgrade_v2_user(user)
+            user = VERSIONS.upgrade_v2_user(user)
         else:
-            return manager.create(name, password=password, email=email,
+            user = manager.create(name, password=password, email=email,
                                   default_project=project, enabled=enabled,
                                   domain=domain, description=description,
                                   **data)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    catalog_cache.invalidate('users')
+    return user
 
 
 @profiler.trace
 def user_delete(request, user_id):
     keystoneclient(request, admin=True).users.delete(user_id)
+    catalog_cache.invalidate('users')
 
 
 @profiler.trace
@@ -525,6 +730,7 @@ def user_update(request, user, **data):
             user = manager.update(user, **data)
         except keystone_exceptions.Conflict:
             raise exceptions.Conflict()
+    catalog_cache.invalidate('users')
 
 
 @profiler.trace
@@ -534,6 +740,7 @@ def user_update_enabled(request, user, enabled):
         manager.update_enabled(user, enabled)
     else:
         manager.update(user, enabled=enabled)
+    catalog_cache.invalidate('users')
 
 
 @profiler.trace
@@ -586,17 +793,21 @@ def user_update_own_password(request, origpassword, password):
 def user_update_tenant(request, user, project, admin=True):
     manager = keystoneclient(request, admin=admin).users
     if VERSIONS.active < 3:
-        return manager.update_tenant(user, project)
+        result = manager.update_tenant(user, project)
     else:
-        return manager.update(user, project=project)
+        result = manager.update(user, project=project)
+    catalog_cache.invalidate('users')
+    return result
 
 
 @profiler.trace
 def group_create(request, domain_id, name, description=None):
     manager = keystoneclient(request, admin=True).groups
-    return manager.create(domain=domain_id,
-                          name=name,
-                          description=description)
+    group = manager.create(domain=domain_id,
+                           name=name,
+                           description=description)
+    catalog_cache.invalidate('groups')
+    return group
 
 
 @profiler.trace
@@ -608,13 +819,12 @@ def group_get(request, group_id, admin=True):
 @profiler.trace
 def group_delete(request, group_id):
     manager = keystoneclient(request, admin=True).groups
-    return manager.delete(group_id)
+    result = manager.delete(group_id)
+    catalog_cache.invalidate('groups')
+    return result
 
 
-@profiler.trace
-def group_list(request, domain=None, project=None, user=None, filters=None):
-    manager = keystoneclient(request, admin=True).groups
-    groups = []
+def _group_list_kwargs(domain=None, user=None, filters=None):
     kwargs = {
         "domain": domain,
         "user": user,
@@ -622,6 +832,14 @@ def group_list(request, domain=None, project=None, user=None, filters=None):
     }
     if filters is not None:
         kwargs.update(filters)
+    return kwargs
+
+
+@profiler.trace
+def group_list(request, domain=None, project=None, user=None, filters=None):
+    manager = keystoneclient(request, admin=True).groups
+    groups = []
+    kwargs = _group_list_kwargs(domain, user, filters)
     if 'id' in kwargs:
         try:
             groups = [manager.get(kwargs['id'])]
@@ -640,24 +858,50 @@ def group_list(request, domain=None, project=None, user=None, filters=None):
     return groups
 
 
+@profiler.trace
+def group_list_paged(request, domain=None, user=None, filters=None,
+                     marker=None):
+    """Return a page of groups sorted by name, and if more pages follow.
+
+    marker is the ID of the last group of the previous page.
+    """
+    kwargs = _group_list_kwargs(domain, user, filters)
+    if 'id' in kwargs:
+        return group_list(request, domain, user=user, filters=filters), False
+    manager = keystoneclient(request, admin=True).groups
+    return _list_page(request, 'groups', manager, marker, **kwargs)
+
+
 @profiler.trace
 def group_update(request, group_id, name=None, description=None):
     manager = keystoneclient(request, admin=True).groups
-    return manager.update(group=group_id,
-                          name=name,
-                          description=description)
+    group = manager.update(group=group_id,
+                           name=name,
+                           description=description)
+    catalog_cache.invalidate('groups')
+    return group
 
 
 @profiler.trace
 def add_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.add_to_group(group=group_id, user=user_id)
+    result = manager.add_to_group(group=group_id, user=user_id)
+    _invalidate_project_lists(user_id)
+    # The group memberships filter the user and group lists.
+    catalog_cache.invalidate('users')
+    catalog_cache.invalidate('groups')
+    return result
 
 
 @profiler.trace
 def remove_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.remove_from_group(group=group_id, user=user_id)
+    result = manager.remove_from_group(group=group_id, user=user_id)
+    _invalidate_project_lists(user_id)
+    # The group memberships filter the user and group lists.
+    catalog_cache.invalidate('users')
+    catalog_cache.invalidate('groups')
+    return result
 
 
 def get_project_groups_roles(request, project):
@@ -709,7 +953,9 @@ def role_assignments_list(request, project=None, user=None, role=None,
 @profiler.trace
 def role_create(request, name):
     manager = keystoneclient(request, admin=True).roles
-    return manager.create(name)
+    role = manager.create(name)
+    catalog_cache.invalidate('roles')
+    return role
 
 
 @profiler.trace
@@ -721,13 +967,16 @@ def role_get(request, role_id):
 @profiler.trace
 def role_update(request, role_id, name=None):
     manager = keystoneclient(request, admin=True).roles
-    return manager.update(role_id, name)
+    role = manager.update(role_id, name)
+    _invalidate_roles()
+    return role
 
 
 @profiler.trace
 def role_delete(request, role_id):
     manager = keystoneclient(request, admin=True).roles
     manager.delete(role_id)
+    _invalidate_roles()
 
 
 @profiler.trace
@@ -746,7 +995,7 @@ def role_list(request, filters=None):
         except Exception:
             exceptions.handle(request)
     else:
-        roles = manager.list(**kwargs)
+        roles = _get_cached_list(request, 'roles', manager, **kwargs)
     return roles
 
 
@@ -829,6 +1078,7 @@ def add_tenant_user_role(request, project=None, user=None, role=None,
     else:
         manager.grant(role, user=user, project=project,
                       group=group, domain=domain)
+    _invalidate_project_lists(user)
 
 
 @profiler.trace
@@ -837,19 +1087,23 @@ def remove_tenant_user_role(request, project=None, user=None, role=None,
     """Removes a given single role for a user from a tenant."""
     manager = keystoneclient(request, admin=True).roles
     if VERSIONS.active < 3:
-        return manager.remove_user_role(user, role, project)
+        result = manager.remove_user_role(user, role, project)
     else:
-        return manager.revoke(role, user=user, project=project,
-                              group=group, domain=domain)
+        result = manager.revoke(role, user=user, project=project,
+                                group=group, domain=domain)
+    _invalidate_project_lists(user)
+    return result
 
 
 def remove_tenant_user(request, project=None, user=None, domain=None):
     """Removes all roles from a user on a tenant, removing them from it."""
     client = keystoneclient(request, admin=True)
     roles = client.roles.roles_for_user(user, project)
-    for role in roles:
-        remove_tenant_user_role(request, user=user, role=role.id,
-                                project=project, domain=domain)
+    result = update_project_roles(request, project,
+                                  revokes=[(user, role.id) for role in roles],
+                                  domain=domain)
+    if result['failed']:
+        raise result['failed'][0][3]
 
 
 @profiler.trace
@@ -862,16 +1116,20 @@ def roles_for_group(request, group, domain=None, project=None):
 def add_group_role(request, role, group, domain=None, project=None):
     """Adds a role for a group on a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.grant(role=role, group=group, domain=domain,
-                         project=project)
+    result = manager.grant(role=role, group=group, domain=domain,
+                           project=project)
+    _invalidate_project_lists()
+    return result
 
 
 @profiler.trace
 def remove_group_role(request, role, group, domain=None, project=None):
     """Removes a given single role for a group from a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.revoke(role=role, group=group, project=project,
-                          domain=domain)
+    result = manager.revoke(role=role, group=group, project=project,
+                            domain=domain)
+    _invalidate_project_lists()
+    return result
 
 
 @profiler.trace
@@ -884,24 +1142,98 @@ def remove_group_roles(request, group, domain=None, project=None):
                           domain=domain, project=project)
 
 
+def diff_project_roles(current, requested):
+    """Return the role grants and revocations turning current into requested.
+
+    Both arguments map user or group IDs to the IDs of their roles on a
+    project. The grants and the revocations are returned as two sorted lists
+    of (user or group ID, role ID) tuples.
+    """
+    grants = []
+    revokes = []
+    for actor_id in set(current) | set(requested):
+        current_ids = set(current.get(actor_id, ()))
+        requested_ids = set(requested.get(actor_id, ()))
+        grants.extend((actor_id, role_id)
+                      for role_id in requested_ids - current_ids)
+        revokes.extend((actor_id, role_id)
+                       for role_id in current_ids - requested_ids)
+    return sorted(grants), sorted(revokes)
+
+
+def update_project_roles(request, project, grants=(), revokes=(),
+                         group=False, domain=None):
+    """Grant and revoke roles of users or groups on a project in parallel.
+
+    grants and revokes are lists of (user or group ID, role ID) tuples, as
+    returned by diff_project_roles(). At most ``PARALLEL_CALL_MAX_WORKERS``
+    calls run at the same time and a failing call does not stop the others.
+
+    :returns: a dict with the numbers of roles ``granted`` and ``revoked``,
+        and the ``failed`` list of (operation, user or group ID, role ID,
+        exception) tuples, operation being ``'grant'`` or ``'revoke'``.
+    """
+    def call(operation, actor_id, role_id):
+        try:
+            if group:
+                func = (add_group_role if operation == 'grant'
+                        else remove_group_role)
+                func(request, role=role_id, group=actor_id, project=project)
+            elif operation == 'grant':
+                add_tenant_user_role(request, project=project, user=actor_id,
+                                     role=role_id)
+            else:
+                kwargs = {'domain': domain} if domain else {}
+                remove_tenant_user_role(request, project=project,
+                                        user=actor_id, role=role_id, **kwargs)
+        except Exception as e:
+            LOG.debug('Unable to %s role %s of %s on project %s: %s',
+                      operation, role_id, actor_id, project, e)
+            return operation, actor_id, role_id, e
+
+    operations = ([('grant', actor_id, role_id)
+                   for actor_id, role_id in grants] +
+                  [('revoke', actor_id, role_id)
+                   for actor_id, role_id in revokes])
+    failed = []
+    if operations:
+        results = futurist_utils.call_functions_parallel(
+            *[(call, operation) for operation in operations])
+        failed = [result for result in results if result is not None]
+    failed_grants = len([f for f in failed if f[0] == 'grant'])
+    return {'granted': len(grants) - failed_grants,
+            'revoked': len(revokes) - (len(failed) - failed_grants),
+            'failed': failed}
+
+
+def _invalidate_roles():
+    global DEFAULT_ROLE
+    DEFAULT_ROLE = None
+    catalog_cache.invalidate('roles')
+
+
 def get_default_role(request):
     """Gets the default role object from Keystone and saves it as a global.
 
     Since this is configured in settings and should not change from request
-    to request. Supports lookup by name or id.
+    to request. Supports lookup by name or id. When the catalog cache is
+    enabled, the role is looked up in the cached role list instead, for the
+    roles changed by other processes to be seen. The role previously found
+    is kept when the roles cannot be listed.
     """
     global DEFAULT_ROLE
     default = getattr(settings, "OPENSTACK_KEYSTONE_DEFAULT_ROLE", None)
-    if default and DEFAULT_ROLE is None:
+    if default and (DEFAULT_ROLE is None or catalog_cache.is_enabled()):
         try:
-            roles = keystoneclient(request, admin=True).roles.list()
+            roles = _get_cached_list(request, 'roles',
+                                     keystoneclient(request, admin=True).roles)
         except Exception:
-            roles = []
             exceptions.handle(request)
-        for role in roles:
-            if role.id == default or role.name == default:
-                DEFAULT_ROLE = role
-                break
+        else:
+            DEFAULT_ROLE = next((role for role in roles
+                                 if role.id == default or
+                                 role.name == default),
+                                None)
     return DEFAULT_ROLE
 
 
@@ -36,9 +36,12 @@ from horizon import exceptions
 from horizon import messages
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
+from openstack_dashboard.api import client_pool
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 
 
 LOG = logging.getLogger(__name__)
@@ -48,6 +51,13 @@ IP_VERSION_DICT = {4: 'IPv4', 6: 'IPv6'}
 OFF_STATE = 'OFF'
 ON_STATE = 'ON'
 
+# Namespace of the subnets reachable from external networks in the catalog
+# cache, dropped when routers, networks or subnets are changed.
+FIP_REACHABILITY_NAMESPACE = 'fip_reachability'
+# Lifetime of the reachable subnets in the catalog cache, short since router
+# interfaces added outside of Horizon do not drop them.
+FIP_REACHABILITY_CACHE_TIMEOUT = 30
+
 ROUTER_INTERFACE_OWNERS = (
     'network:router_interface',
     'network:router_interface_distributed',
@@ -643,6 +653,7 @@ class FloatingIpManager(object):
     def release(self, floating_ip_id):
         """Releases a floating IP specified."""
         self.client.delete_floatingip(floating_ip_id)
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
 
     @profiler.trace
     def associate(self, floating_ip_id, port_id):
@@ -661,6 +672,7 @@ class FloatingIpManager(object):
                        'fixed_ip_address': ip_address}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
 
     @profiler.trace
     def disassociate(self, floating_ip_id):
@@ -668,6 +680,54 @@ class FloatingIpManager(object):
         update_dict = {'port_id': None}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+
+    def _list_reachable_subnets(self, router_ports):
+        """Return the IDs of the subnets reachable from external networks.
+
+        They are the subnets of the interfaces of the routers whose gateway
+        is an external network, among router_ports, and the subnets of the
+        shared networks.
+        """
+        ext_net_ids = set(ext_net.id for ext_net in self.list_pools())
+        gw_routers = set(r.id for r in router_list(self.request)
+                         if (r.external_gateway_info and
+                             r.external_gateway_info.get('network_id')
+                             in ext_net_ids))
+        reachable_subnets = set(p.fixed_ips[0]['subnet_id']
+                                for p in router_ports
+                                if p.device_id in gw_routers and p.fixed_ips)
+        # we have to include any shared subnets as well because we may not
+        # have permission to see the router interface to infer connectivity
+        shared = set([s.id for n in network_list(self.request, shared=True)
+                      for s in n.subnets])
+        return reachable_subnets | shared
+
+    def _get_reachability_index(self):
+        """Return the cached IDs of the subnets reachable for floating IPs.
+
+        The index is built from all the router interfaces visible to the
+        user and kept in the catalog cache for at most
+        FIP_REACHABILITY_CACHE_TIMEOUT seconds, so that it is shared by the
+        association forms of the instances of the project opened in a row.
+        It is dropped when routers, networks or subnets are changed through
+        Horizon.
+        """
+        scope = (base.url_for(self.request, 'network'),
+                 self.request.user.project_id, self.request.user.id)
+        generation = catalog_cache.get_generation(FIP_REACHABILITY_NAMESPACE)
+        reachable_subnets = catalog_cache.get(FIP_REACHABILITY_NAMESPACE,
+                                              scope, generation)
+        if reachable_subnets is None:
+            router_ports = port_list(self.request,
+                                     device_owner=ROUTER_INTERFACE_OWNERS)
+            reachable_subnets = frozenset(
+                self._list_reachable_subnets(router_ports))
+            timeout = min(FIP_REACHABILITY_CACHE_TIMEOUT,
+                          catalog_cache.get_timeout())
+            catalog_cache.set(FIP_REACHABILITY_NAMESPACE, scope,
+                              reachable_subnets, timeout, generation)
+        return reachable_subnets
 
     def _get_reachable_subnets(self, ports, fetch_router_ports=False):
         if not is_enabled_by_config('enable_fip_topology_check', True):
@@ -675,26 +735,37 @@ class FloatingIpManager(object):
             return set(
                 p.fixed_ips[0]['subnet_id'] for p in ports if p.fixed_ips
             )
+        if catalog_cache.is_enabled():
+            return self._get_reachability_index()
         # Retrieve subnet list reachable from external network
-        ext_net_ids = [ext_net.id for ext_net in self.list_pools()]
-        gw_routers = [r.id for r in router_list(self.request)
-                      if (r.external_gateway_info and
-                          r.external_gateway_info.get('network_id')
-                          in ext_net_ids)]
         if fetch_router_ports:
             router_ports = port_list(self.request,
                                      device_owner=ROUTER_INTERFACE_OWNERS)
         else:
             router_ports = [p for p in ports
                             if p.device_owner in ROUTER_INTERFACE_OWNERS]
-        reachable_subnets = set([p.fixed_ips[0]['subnet_id']
-                                 for p in router_ports
-                                 if p.device_id in gw_routers])
-        # we have to include any shared subnets as well because we may not
-        # have permission to see the router interface to infer connectivity
-        shared = set([s.id for n in network_list(self.request, shared=True)
-                      for s in n.subnets])
-        return reachable_subnets | shared
+        return self._list_reachable_subnets(router_ports)
+
+    @staticmethod
+    def _build_targets(ports, reachable_subnets, server_names):
+        """Return the FloatingIpTarget of each reachable IPv4 address of ports.
+
+        server_names is a dict of instance ID -> label of the targets.
+        """
+        targets = []
+        for p in ports:
+            # Remove network ports from Floating IP targets
+            if p.device_owner.startswith('network:'):
+                continue
+            ips = [ip['ip_address'] for ip in p.fixed_ips
+                   if ip['subnet_id'] in reachable_subnets and
+                   # Floating IPs can only target IPv4 addresses, and
+                   # only IPv6 addresses contain colons.
+                   ':' not in ip['ip_address']]
+            if ips:
+                name = server_names.get(p.device_id)
+                targets.extend(FloatingIpTarget(p, ip, name) for ip in ips)
+        return targets
 
     @profiler.trace
     def list_targets(self):
@@ -707,28 +778,15 @@ class FloatingIpManager(object):
         FloatingIpTarget.name is displayed in Floating Ip Association Form.
         """
         tenant_id = self.request.user.tenant_id
-        ports = port_list(self.request, tenant_id=tenant_id)
-        servers, has_more = nova.server_list(self.request, detailed=False)
-        server_dict = collections.OrderedDict(
-            [(s.id, s.name) for s in servers])
+        ports, servers = futurist_utils.call_functions_parallel(
+            (port_list, [self.request], {'tenant_id': tenant_id}),
+            (self._list_server_names, []))
         reachable_subnets = self._get_reachable_subnets(ports)
+        return self._build_targets(ports, reachable_subnets, servers)
 
-        targets = []
-        for p in ports:
-            # Remove network ports from Floating IP targets
-            if p.device_owner.startswith('network:'):
-                continue
-            server_name = server_dict.get(p.device_id)
-
-            for ip in p.fixed_ips:
-                if ip['subnet_id'] not in reachable_subnets:
-                    continue
-                # Floating IPs can only target IPv4 addresses.
-                if netaddr.IPAddress(ip['ip_address']).version != 4:
-                    continue
-                targets.append(FloatingIpTarget(p, ip['ip_address'],
-                                                server_name))
-        return targets
+    def _list_server_names(self):
+        return dict((s.id, s.name)
+                    for s in nova.server_iter(self.request, detailed=False))
 
     def _target_ports_by_instance(self, instance_id):
         if not instance_id:
@@ -757,16 +815,8 @@ class FloatingIpManager(object):
             reachable_subnets = self._get_reachable_subnets(
                 ports, fetch_router_ports=True)
             name = self._get_server_name(instance_id)
-            targets = []
-            for p in ports:
-                for ip in p.fixed_ips:
-                    if ip['subnet_id'] not in reachable_subnets:
-                        continue
-                    # Floating IPs can only target IPv4 addresses.
-                    if netaddr.IPAddress(ip['ip_address']).version != 4:
-                        continue
-                    targets.append(FloatingIpTarget(p, ip['ip_address'], name))
-            return targets
+            return self._build_targets(ports, reachable_subnets,
+                                       {instance_id: name})
 
     def _get_server_name(self, server_id):
         try:
@@ -805,7 +855,7 @@ def get_auth_params_from_request(request):
     )
 
 
-@memoized
+@client_pool.pooled(get_auth_params_from_request)
 def neutronclient(request):
     token_id, neutron_url, auth_url = get_auth_params_from_request(request)
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
@@ -817,42 +867,40 @@ def neutronclient(request):
     return c
 
 
-@profiler.trace
-def list_resources_with_long_filters(list_method,
-                                     filter_attr, filter_values, **params):
-    """List neutron resources with handling RequestURITooLong exception.
+def _get_filter_chunks(filter_attr, filter_values, budget):
+    """Split filter_values in chunks whose query string fits in budget.
 
-    If filter parameters are long, list resources API request leads to
-    414 error (URL is too long). For such case, this method split
-    list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
-
-    :param list_method: Method used to retrieve resource list.
-    :param filter_attr: attribute name to be filtered. The value corresponding
-        to this attribute is specified by "filter_values".
-        If you want to specify more attributes for a filter condition,
-        pass them as keyword arguments like "attr2=values2".
-    :param filter_values: values of "filter_attr" to be filtered.
-        If filter_values are too long and the total URI length exceed the
-        maximum length supported by the neutron server, filter_values will
-        be split into sub lists if filter_values is a list.
-    :param params: parameters to pass a specified listing API call
-        without any changes. You can specify more filter conditions
-        in addition to a pair of filter_attr and filter_values.
+    Each value takes "<filter_attr>=<value>&" in the query string.
     """
+    chunks = []
+    chunk = []
+    length = 0
+    for value in filter_values:
+        value_len = len(filter_attr) + len(six.text_type(value)) + 2
+        if chunk and length + value_len > budget:
+            chunks.append(tuple(chunk))
+            chunk = []
+            length = 0
+        chunk.append(value)
+        length += value_len
+    if chunk:
+        chunks.append(tuple(chunk))
+    return chunks
+
+
+def _list_filtered_resources(list_method, filter_attr, filter_values, params):
+    params = dict(params)
+    params[filter_attr] = filter_values
     try:
-        params[filter_attr] = filter_values
         return list_method(**params)
     except neutron_exc.RequestURITooLong as uri_len_exc:
-        # The URI is too long because of too many filter values.
-        # Use the excess attribute of the exception to know how many
-        # filter values can be inserted into a single request.
-
-        # We consider only the filter condition from (filter_attr,
-        # filter_values) and do not consider other filter conditions
-        # which may be specified in **params.
+        # The URI is still too long, for instance because of the other
+        # filter conditions specified in params. Use the excess attribute
+        # of the exception to know how many filter values can be inserted
+        # into a single request.
         if not isinstance(filter_values, (list, tuple, set, frozenset)):
             filter_values = [filter_values]
+        filter_values = tuple(filter_values)
 
         # Length of each query filter is:
         # <key>=<value>& (e.g., id=<uuid>)
@@ -863,7 +911,7 @@ def list_resources_with_long_filters(list_method,
 
         val_maxlen = max(len(val) for val in filter_values)
         filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
+        chunk_size = max(1, allowed_filter_len // filter_maxlen)
 
         resources = []
         for i in range(0, len(filter_values), chunk_size):
@@ -872,6 +920,59 @@ def list_resources_with_long_filters(list_method,
         return resources
 
 
+@profiler.trace
+def list_resources_with_long_filters(list_method,
+                                     filter_attr, filter_values, **params):
+    """List neutron resources with handling RequestURITooLong exception.
+
+    If filter parameters are long, list resources API request leads to
+    414 error (URL is too long). For such case, this method split
+    list parameters specified by a list_field argument into chunks
+    and call the specified list_method for each of them in parallel.
+
+    The chunks are sized so that their filter conditions take at most
+    ``OPENSTACK_NEUTRON_FILTER_URI_BUDGET`` characters of the URI. A chunk
+    whose URI is still too long is split again according to the excess
+    length reported by the neutron client. When more filter values than
+    ``OPENSTACK_NEUTRON_UNFILTERED_LIST_THRESHOLD`` are given, the resources
+    are listed without the filter_attr condition and filtered here instead.
+
+    :param list_method: Method used to retrieve resource list.
+    :param filter_attr: attribute name to be filtered. The value corresponding
+        to this attribute is specified by "filter_values".
+        If you want to specify more attributes for a filter condition,
+        pass them as keyword arguments like "attr2=values2".
+    :param filter_values: values of "filter_attr" to be filtered.
+        If filter_values are too long and the total URI length exceed the
+        maximum length supported by the neutron server, filter_values will
+        be split into sub lists if filter_values is a list.
+    :param params: parameters to pass a specified listing API call
+        without any changes. You can specify more filter conditions
+        in addition to a pair of filter_attr and filter_values.
+    """
+    if not isinstance(filter_values, (list, tuple, set, frozenset)):
+        return _list_filtered_resources(list_method, filter_attr,
+                                        filter_values, params)
+
+    threshold = getattr(settings,
+                        'OPENSTACK_NEUTRON_UNFILTERED_LIST_THRESHOLD', 0)
+    if threshold and len(filter_values) > threshold:
+        wanted = frozenset(filter_values)
+        return [resource for resource in list_method(**params)
+                if getattr(resource, filter_attr, None) in wanted]
+
+    budget = getattr(settings, 'OPENSTACK_NEUTRON_FILTER_URI_BUDGET', 7168)
+    chunks = _get_filter_chunks(filter_attr, filter_values, budget)
+    if len(chunks) <= 1:
+        # The values are passed as is, as list_method may be memoized.
+        return _list_filtered_resources(list_method, filter_attr,
+                                        filter_values, params)
+    results = futurist_utils.call_functions_parallel(
+        *[(_list_filtered_resources,
+           [list_method, filter_attr, chunk, params]) for chunk in chunks])
+    return [resource for resources in results for resource in resources]
+
+
 @profiler.trace
 def trunk_show(request, trunk_id):
     LOG.debug("trunk_show(): trunk_id=%s", trunk_id)
@@ -1139,6 +1240,7 @@ def network_create(request, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body = {'network': kwargs}
     network = neutronclient(request).create_network(body=body).get('network')
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
     return Network(network)
 
 
@@ -1149,6 +1251,7 @@ def network_update(request, network_id, **kwargs):
     body = {'network': kwargs}
     network = neutronclient(request).update_network(network_id,
                                                     body=body).get('network')
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
     return Network(network)
 
 
@@ -1156,6 +1259,7 @@ def network_update(request, network_id, **kwargs):
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s", network_id)
     neutronclient(request).delete_network(network_id)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
@@ -1201,6 +1305,7 @@ def subnet_create(request, network_id, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['subnet'].update(kwargs)
     subnet = neutronclient(request).create_subnet(body=body).get('subnet')
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
     return Subnet(subnet)
 
 
@@ -1218,6 +1323,7 @@ def subnet_update(request, subnet_id, **kwargs):
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
@@ -1389,6 +1495,7 @@ def port_create(request, network_id, **kwargs):
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     neutronclient(request).delete_port(port_id)
+    catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
 
 
 @profiler.trace
@@ -1398,6 +1505,7 @@ def port_update(request, port_id, **kwargs):
     kwargs = unescape_port_kwargs(**kwargs)
     body = {'port': kwargs}
     port = neutronclient(request).update_port(port_id, body=body).get('port')
+    catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
     return Port(port)
 
 
@@ -1409,6 +1517,7 @@ def router_create(request, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['router'].update(kwargs)
     router = neutronclient(request).create_router(body=body).get('router')
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
     return Router(router)
 
 
@@ -1419,6 +1528,7 @@ def router_update(request, r_id, **kwargs):
     body = {'router': {}}
     body['router'].update(kwargs)
     router = neutronclient(request).update_router(r_id, body=body)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
     return Router(router['router'])
 
 
@@ -1446,6 +1556,7 @@ def router_list_on_l3_agent(request, l3_agent_id, **params):
 @profiler.trace
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
@@ -1456,7 +1567,9 @@ def router_add_interface(request, router_id, subnet_id=None, port_id=None):
     if port_id:
         body['port_id'] = port_id
     client = neutronclient(request)
-    return client.add_interface_router(router_id, body)
+    result = client.add_interface_router(router_id, body)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
+    return result
 
 
 @profiler.trace
@@ -1467,6 +1580,7 @@ def router_remove_interface(request, router_id, subnet_id=None, port_id=None):
     if port_id:
         body['port_id'] = port_id
     neutronclient(request).remove_interface_router(router_id, body)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
@@ -1475,11 +1589,13 @@ def router_add_gateway(request, router_id, network_id, enable_snat=None):
     if enable_snat is not None:
         body['enable_snat'] = enable_snat
     neutronclient(request).add_gateway_router(router_id, body)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
 def router_remove_gateway(request, router_id):
     neutronclient(request).remove_gateway_router(router_id)
+    catalog_cache.invalidate(FIP_REACHABILITY_NAMESPACE)
 
 
 @profiler.trace
@@ -1527,7 +1643,10 @@ def tenant_quota_get(request, tenant_id):
 @profiler.trace
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
-    return neutronclient(request).update_quota(tenant_id, quotas)
+    quotas = neutronclient(request).update_quota(tenant_id, quotas)
+    # Usages are cached by openstack_dashboard.usage.quotas.
+    catalog_cache.invalidate('quota_usages')
+    return quotas
 
 
 @profiler.trace
@@ -1680,6 +1799,32 @@ def server_update_security_groups(request, instance_id,
         instance_id, new_security_group_ids)
 
 
+def _server_addresses_scope(server):
+    # A server is refreshed from Neutron whenever Nova reports it changed.
+    updated = getattr(server, 'updated', None)
+    if not updated:
+        return None
+    return (server.id, updated)
+
+
+def _servers_apply_cached_addresses(servers, generation):
+    """Set the cached addresses of servers and return the other servers."""
+    scopes = dict((server.id, _server_addresses_scope(server))
+                  for server in servers)
+    cached = catalog_cache.get_many(
+        catalog_cache.SERVER_ADDRESSES_NAMESPACE,
+        [scope for scope in scopes.values() if scope is not None],
+        generation)
+    stale_servers = []
+    for server in servers:
+        scope = scopes[server.id]
+        if scope in cached:
+            server.addresses = cached[scope]
+        else:
+            stale_servers.append(server)
+    return stale_servers
+
+
 # TODO(pkarikh) need to uncomment when osprofiler will have no
 # issues with unicode in:
 # openstack_dashboard/test/test_data/nova_data.py#L470 data
@@ -1689,12 +1834,29 @@ def servers_update_addresses(request, servers, all_tenants=False):
 
        Should be used when up to date networking information is required,
        and Nova's networking info caching mechanism is not fast enough.
+
+       When ``OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT`` is set, addresses
+       retrieved from Neutron are cached per server and 'updated' timestamp
+       for that number of seconds, so only the servers changed since the
+       last call (or whose cached addresses expired) are looked up in
+       Neutron. Floating IP and port changes made through Horizon drop all
+       cached addresses, but those made directly in Neutron do not change
+       the 'updated' timestamp and are only seen once the addresses expire.
     """
 
     # NOTE(e0ne): we don't need to call neutron if we have no instances
     if not servers:
         return
 
+    cache_timeout = getattr(settings,
+                            'OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT', 0)
+    if cache_timeout > 0:
+        generation = catalog_cache.get_generation(
+            catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+        servers = _servers_apply_cached_addresses(servers, generation)
+        if not servers:
+            return
+
     # Get all (filtered for relevant servers) information from Neutron
     try:
         # NOTE(e0ne): we need tuple here to work with @memoized decorator.
@@ -1738,6 +1900,7 @@ def servers_update_addresses(request, servers, all_tenants=False):
     network_names = dict((network.id, network.name_or_id)
                          for network in networks)
 
+    cached_addresses = {}
     for server in servers:
         try:
             addresses = _server_get_addresses(
@@ -1750,6 +1913,13 @@ def servers_update_addresses(request, servers, all_tenants=False):
             LOG.error(six.text_type(e))
         else:
             server.addresses = addresses
+            scope = _server_addresses_scope(server)
+            if scope is not None:
+                cached_addresses[scope] = addresses
+
+    if cache_timeout > 0 and cached_addresses:
+        catalog_cache.set_many(catalog_cache.SERVER_ADDRESSES_NAMESPACE,
+                               cached_addresses, cache_timeout, generation)
 
 
 def _server_get_addresses(request, server, ports, floating_ips, network_names):
@@ -21,6 +21,7 @@
 from __future__ import absolute_import
 
 import collections
+import datetime
 import logging
 from operator import attrgetter
 
@@ -30,17 +31,22 @@ from django.utils.translation import ugettext_lazy as _
 from novaclient import api_versions
 from novaclient import client as nova_client
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors as nova_flavors
 from novaclient.v2 import instance_action as nova_instance_action
 from novaclient.v2 import list_extensions as nova_list_extensions
 from novaclient.v2 import servers as nova_servers
+from novaclient.v2 import usage as nova_usage
 
 from horizon import exceptions as horizon_exceptions
 from horizon.utils import functions as utils
 from horizon.utils import memoized
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
+from openstack_dashboard.api import client_pool
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import futurist_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -56,6 +62,11 @@ DEFAULT_QUOTA_NAME = 'default'
 INSECURE = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
 CACERT = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
+# Attributes of the usage of a project which are totals over its servers.
+USAGE_TOTALS = ('total_hours', 'total_vcpus_usage', 'total_memory_mb_usage',
+                'total_local_gb_usage')
+USAGE_CACHE_NAMESPACE = 'usage'
+
 
 @memoized.memoized
 def get_microversion(request, features):
@@ -121,7 +132,7 @@ class Server(base.APIResourceWrapper):
     _attrs = ['addresses', 'attrs', 'id', 'image', 'links', 'description',
               'metadata', 'name', 'private_ip', 'public_ip', 'status', 'uuid',
               'image_name', 'VirtualInterfaces', 'flavor', 'key_name', 'fault',
-              'tenant_id', 'user_id', 'created', 'locked',
+              'tenant_id', 'user_id', 'created', 'updated', 'locked',
               'OS-EXT-STS:power_state', 'OS-EXT-STS:task_state',
               'OS-EXT-SRV-ATTR:instance_name', 'OS-EXT-SRV-ATTR:host',
               'OS-EXT-AZ:availability_zone', 'OS-DCF:diskConfig']
@@ -231,6 +242,69 @@ class NovaUsage(base.APIResourceWrapper):
         return getattr(self, "total_memory_mb_usage", 0)
 
 
+class NovaUsageSummary(NovaUsage):
+    """The usage of a project without the usage of each of its servers.
+
+    The totals of the server usages are added up as the pages of usage
+    are retrieved, and the server usages are then dropped, so the memory
+    used does not depend on the number of servers.
+    """
+
+    # The totals of the active servers are attributes rather than
+    # properties computed from the server usages.
+    total_active_instances = 0
+    vcpus = 0
+    local_gb = 0
+    memory_mb = 0
+    server_usages = ()
+
+    def __init__(self, usage):
+        super(NovaUsageSummary, self).__init__(None)
+        self.tenant_id = usage.tenant_id
+        self.start = getattr(usage, 'start', None)
+        self.stop = getattr(usage, 'stop', None)
+        self.total_hours = 0
+        self.total_vcpus_usage = 0
+        self.total_memory_mb_usage = 0
+        self.total_local_gb_usage = 0
+        self.add(usage)
+
+    def add(self, usage):
+        """Add a page of the usage of the project."""
+        self.total_hours += getattr(usage, 'total_hours', 0)
+        self.total_vcpus_usage += getattr(usage, 'total_vcpus_usage', 0)
+        self.total_memory_mb_usage += getattr(usage,
+                                              'total_memory_mb_usage', 0)
+        self.total_local_gb_usage += getattr(usage, 'total_local_gb_usage',
+                                             0)
+        for server_usage in getattr(usage, 'server_usages', None) or ():
+            if server_usage['ended_at'] is None:
+                self.total_active_instances += 1
+                self.vcpus += server_usage['vcpus']
+                self.local_gb += server_usage['local_gb']
+                self.memory_mb += server_usage['memory_mb']
+
+    def merge(self, later):
+        """Merge the summary of the usage of a later period.
+
+        The totals of the two periods are added up. The active servers of
+        the later period are the ones active at its end.
+        """
+        self.stop = later.stop
+        for attr in USAGE_TOTALS:
+            setattr(self, attr, getattr(self, attr) + getattr(later, attr))
+        self.total_active_instances = later.total_active_instances
+        self.vcpus = later.vcpus
+        self.local_gb = later.local_gb
+        self.memory_mb = later.memory_mb
+
+    def clear_active(self):
+        self.total_active_instances = 0
+        self.vcpus = 0
+        self.local_gb = 0
+        self.memory_mb = 0
+
+
 class FlavorExtraSpec(object):
     def __init__(self, flavor_id, key, val):
         self.flavor_id = flavor_id
@@ -272,7 +346,7 @@ def novaclient(request, version=None):
     return cached_novaclient(request, version)
 
 
-@memoized.memoized
+@client_pool.pooled(get_auth_params_from_request)
 def cached_novaclient(request, version=None):
     (
         username,
@@ -347,6 +421,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public,
                                                 rxtx_factor=rxtx_factor)
+    catalog_cache.invalidate('flavors')
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -355,6 +430,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 @profiler.trace
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    catalog_cache.invalidate('flavors')
 
 
 @profiler.trace
@@ -376,6 +452,30 @@ def flavor_list(request, is_public=True, get_extras=False):
     return flavors
 
 
+def flavor_list_cached(request):
+    """Get the list of flavors available to the project, without extras.
+
+    The list is kept in the shared catalog cache (see
+    :mod:`openstack_dashboard.api.catalog_cache`) per compute endpoint and
+    project, and is meant for views which only need to look up flavors
+    by id, like instance tables. It is refreshed when a flavor is created
+    or deleted, or its access list changes.
+    """
+    if not catalog_cache.is_enabled():
+        return flavor_list(request)
+    scope = (base.url_for(request, 'compute'), request.user.tenant_id)
+    generation = catalog_cache.get_generation('flavors')
+    flavor_dicts = catalog_cache.get('flavors', scope, generation)
+    if flavor_dicts is None:
+        flavors = flavor_list(request)
+        catalog_cache.set('flavors', scope,
+                          [flavor.to_dict() for flavor in flavors],
+                          generation=generation)
+        return flavors
+    return [nova_flavors.Flavor(None, info, loaded=True)
+            for info in flavor_dicts]
+
+
 @profiler.trace
 def update_pagination(entities, page_size, marker, sort_dir, sort_key,
                       reversed_order):
@@ -441,15 +541,19 @@ def flavor_access_list(request, flavor=None):
 @profiler.trace
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    access = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    catalog_cache.invalidate('flavors')
+    return access
 
 
 @profiler.trace
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    access = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    catalog_cache.invalidate('flavors')
+    return access
 
 
 @profiler.trace
@@ -600,6 +704,43 @@ def server_list(request, search_opts=None, detailed=True):
     return (servers, has_more_data)
 
 
+@profiler.trace
+def server_iter(request, search_opts=None, detailed=True, page_size=None):
+    """Iterate over all the servers matching search_opts.
+
+    Unlike server_list(), which stops at the first API_RESULT_LIMIT
+    servers, servers are retrieved lazily a page at a time using Nova's
+    marker pagination, so only one page is held in memory and no more pages
+    are retrieved than the caller consumes. ``detailed=False`` only returns
+    the id and name of each server. Servers are compact wrappers (see
+    :func:`openstack_dashboard.api.base.compact_wrapper`) which do not keep
+    the novaclient resources alive.
+
+    :param page_size: The number of servers requested per call to Nova.
+        Defaults to ``API_RESULT_LIMIT``. Nova returns fewer servers when it
+        exceeds its ``[api] max_limit``, so pages are requested until one
+        comes back empty.
+    """
+    nova_client = get_novaclient_with_locked_status(request)
+    server_class = base.compact_wrapper(Server, slots=('request',))
+    if page_size is None:
+        page_size = getattr(settings, 'API_RESULT_LIMIT', 1000)
+    search_opts = dict(search_opts or {})
+    search_opts['limit'] = page_size
+    if search_opts.get('all_tenants', False):
+        search_opts['all_tenants'] = True
+    else:
+        search_opts['project_id'] = request.user.tenant_id
+
+    while True:
+        servers = nova_client.servers.list(detailed, dict(search_opts))
+        if not servers:
+            return
+        for server in servers:
+            yield server_class(server, request)
+        search_opts['marker'] = servers[-1].id
+
+
 @profiler.trace
 def server_console_output(request, instance_id, tail_length=None):
     """Gets console output of an instance."""
@@ -743,6 +884,8 @@ def tenant_quota_get(request, tenant_id):
 def tenant_quota_update(request, tenant_id, **kwargs):
     if kwargs:
         novaclient(request).quotas.update(tenant_id, **kwargs)
+        # Usages are cached by openstack_dashboard.usage.quotas.
+        catalog_cache.invalidate('quota_usages')
 
 
 @profiler.trace
@@ -769,58 +912,235 @@ def _get_usage_list_marker(usage_list):
     return marker
 
 
-def _merge_usage(usage, next_usage):
-    usage.server_usages.extend(next_usage.server_usages)
-    usage.total_hours += next_usage.total_hours
-    usage.total_memory_mb_usage += next_usage.total_memory_mb_usage
-    usage.total_vcpus_usage += next_usage.total_vcpus_usage
-    usage.total_local_gb_usage += next_usage.total_local_gb_usage
-
-
-def _merge_usage_list(usages, next_usage_list):
-    for next_usage in next_usage_list:
-        if next_usage.tenant_id in usages:
-            _merge_usage(usages[next_usage.tenant_id], next_usage)
-        else:
-            usages[next_usage.tenant_id] = next_usage
-
+def _usage_pages(request, start, end, tenant_id=None):
+    """Iterate over the pages of the usage of a project or of all projects.
 
-@profiler.trace
-def usage_get(request, tenant_id, start, end):
+    Each page is a list of the usages of projects.
+    """
     client = upgrade_api(request, novaclient(request), '2.40')
-    usage = client.usage.get(tenant_id, start, end)
+    if tenant_id:
+        def get_page(**kwargs):
+            return [client.usage.get(tenant_id, start, end, **kwargs)]
+    else:
+        def get_page(**kwargs):
+            return client.usage.list(start, end, True, **kwargs)
+
+    page = get_page()
+    yield page
     if client.api_version >= api_versions.APIVersion('2.40'):
         # If the number of instances used to calculate the usage is greater
         # than max_limit, the usage will be split across multiple requests
         # and the responses will need to be merged back together.
-        marker = _get_usage_marker(usage)
+        marker = _get_usage_list_marker(page)
         while marker:
-            next_usage = client.usage.get(tenant_id, start, end, marker=marker)
-            marker = _get_usage_marker(next_usage)
+            page = get_page(marker=marker)
+            marker = _get_usage_list_marker(page)
             if marker:
-                _merge_usage(usage, next_usage)
-    return NovaUsage(usage)
+                yield page
+
+
+def _usage_info(usage):
+    return dict((attr, getattr(usage, attr)) for attr in NovaUsage._attrs
+                if hasattr(usage, attr))
+
+
+def _add_usage_totals(info, next_info):
+    for attr in USAGE_TOTALS:
+        info[attr] = info.get(attr, 0) + next_info.get(attr, 0)
+
+
+def _merge_usage_info(info, next_info):
+    """Merge the usage of a project over a later period.
+
+    The usages of the servers which are in both periods are merged.
+    """
+    _add_usage_totals(info, next_info)
+    if 'stop' in next_info:
+        info['stop'] = next_info['stop']
+    server_usages = info.setdefault('server_usages', [])
+    servers = dict((server_usage.get('instance_id'), server_usage)
+                   for server_usage in server_usages)
+    for server_usage in next_info.get('server_usages') or ():
+        previous = servers.get(server_usage.get('instance_id'))
+        if previous is None:
+            server_usages.append(server_usage)
+        else:
+            hours = previous.get('hours', 0) + server_usage.get('hours', 0)
+            previous.update(server_usage)
+            previous['hours'] = hours
+
+
+def _get_period_usage(request, start, end, tenant_id, detailed):
+    """Return a dict of the usage of the projects over a period by id.
+
+    The usages are NovaUsageSummary objects, or dicts of the attributes of
+    NovaUsage if detailed is True.
+    """
+    usages = collections.OrderedDict()
+    for page in _usage_pages(request, start, end, tenant_id):
+        for usage in page:
+            # Nova returns an empty usage for projects without servers.
+            usage_tenant_id = getattr(usage, 'tenant_id', tenant_id)
+            previous = usages.get(usage_tenant_id)
+            if detailed:
+                info = _usage_info(usage)
+                if previous is None:
+                    usages[usage_tenant_id] = info
+                else:
+                    # The pages of a period have distinct servers.
+                    _add_usage_totals(previous, info)
+                    previous.setdefault('server_usages', []).extend(
+                        info.get('server_usages') or ())
+            elif not hasattr(usage, 'tenant_id'):
+                continue
+            elif previous is None:
+                usages[usage_tenant_id] = NovaUsageSummary(usage)
+            else:
+                previous.add(usage)
+    return usages
+
+
+def _get_month_start(date):
+    if date.month == 12:
+        return date.replace(year=date.year + 1, month=1, day=1, hour=0,
+                            minute=0, second=0, microsecond=0)
+    return date.replace(month=date.month + 1, day=1, hour=0, minute=0,
+                        second=0, microsecond=0)
+
+
+def _usage_periods(start, end, now=None):
+    """Split the range of a usage query in periods cached separately.
+
+    The past of the range is split at the start of the calendar months, so
+    that the usage of a whole past month is cached whatever range it is part
+    of, and the days of a month which are over are retrieved with a single
+    query. The rest of the range, from the start of the current day, is one
+    period.
+
+    There are no per-day periods: Nova only sums the usage of a range, so
+    they would take a query per day on a cold cache. The usage of the part
+    of a month a range covers is therefore only reused by the ranges
+    covering the same part of the month.
+    """
+    if not (isinstance(start, datetime.datetime) and
+            isinstance(end, datetime.datetime)):
+        return [(start, end)]
+    if now is None:
+        now = datetime.datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    closed_end = min(end, today)
+    periods = []
+    period_start = start
+    while period_start < closed_end:
+        period_end = _get_month_start(period_start)
+        # The ranges of the usage panels end at 23:59:59, the last second
+        # is counted so that the whole month is cached.
+        if period_end - closed_end > datetime.timedelta(seconds=1):
+            period_end = closed_end
+        periods.append((period_start, period_end))
+        period_start = period_end
+    if period_start < end:
+        periods.append((period_start, end))
+    return periods
+
+
+def get_usage_cache_timeout():
+    """Return the lifetime of the usage of closed periods in the cache.
+
+    A value of 0 or less disables the cache.
+    """
+    return getattr(settings, 'NOVA_USAGE_CACHE_TIMEOUT', 86400)
+
+
+def _get_usage(request, start, end, tenant_id=None, detailed=True):
+    """Return the usage of one or all projects by project id.
+
+    The range is split in periods (see _usage_periods()) which are
+    retrieved in parallel. The usage of the past days and months does not
+    change anymore, and is kept in the cache for
+    ``NOVA_USAGE_CACHE_TIMEOUT`` seconds, so only the usage of the current
+    day, and once a day the usage of the past days of the current month,
+    is retrieved again.
+    """
+    now = datetime.datetime.utcnow()
+    scopes = {}
+    cached = {}
+    timeout = get_usage_cache_timeout()
+    if timeout <= 0:
+        # The periods would only add up to more work for Nova.
+        periods = [(start, end)]
+    else:
+        periods = _usage_periods(start, end, now)
+    if timeout > 0 and isinstance(end, datetime.datetime):
+        # The usage is cached per user so that the cache does not bypass
+        # the authorization of Nova.
+        scope = (base.url_for(request, 'compute'), request.user.id,
+                 tenant_id, detailed)
+        for period in periods:
+            if period[1] <= now:
+                scopes[period] = scope + (period[0].isoformat(),
+                                          period[1].isoformat())
+        generation = catalog_cache.get_generation(USAGE_CACHE_NAMESPACE)
+        cached = catalog_cache.get_many(USAGE_CACHE_NAMESPACE,
+                                        scopes.values(), generation)
+
+    missing = [period for period in periods
+               if scopes.get(period) not in cached]
+    calls = [(_get_period_usage, [request, period[0], period[1], tenant_id,
+                                  detailed])
+             for period in missing]
+    if len(calls) > 1:
+        results = futurist_utils.call_functions_parallel(*calls)
+    else:
+        results = [call[0](*call[1]) for call in calls]
+    results = dict(zip(missing, results))
+    to_cache = dict((scopes[period], results[period]) for period in missing
+                    if period in scopes)
+    if to_cache:
+        catalog_cache.set_many(USAGE_CACHE_NAMESPACE, to_cache, timeout,
+                               generation)
+
+    usages = collections.OrderedDict()
+    period_usages = None
+    for period in periods:
+        period_usages = results.get(period)
+        if period_usages is None:
+            period_usages = cached[scopes[period]]
+        for usage_tenant_id, usage in period_usages.items():
+            previous = usages.get(usage_tenant_id)
+            if previous is None:
+                usages[usage_tenant_id] = usage
+            elif detailed:
+                _merge_usage_info(previous, usage)
+            else:
+                previous.merge(usage)
+    if not detailed and period_usages is not None:
+        # Only the servers active at the end of the range are counted.
+        for usage_tenant_id, usage in usages.items():
+            if usage_tenant_id not in period_usages:
+                usage.clear_active()
+    return usages
 
 
 @profiler.trace
-def usage_list(request, start, end):
-    client = upgrade_api(request, novaclient(request), '2.40')
-    usage_list = client.usage.list(start, end, True)
-    if client.api_version >= api_versions.APIVersion('2.40'):
-        # If the number of instances used to calculate the usage is greater
-        # than max_limit, the usage will be split across multiple requests
-        # and the responses will need to be merged back together.
-        usages = collections.OrderedDict()
-        _merge_usage_list(usages, usage_list)
-        marker = _get_usage_list_marker(usage_list)
-        while marker:
-            next_usage_list = client.usage.list(start, end, True,
-                                                marker=marker)
-            marker = _get_usage_list_marker(next_usage_list)
-            if marker:
-                _merge_usage_list(usages, next_usage_list)
-        usage_list = usages.values()
-    return [NovaUsage(u) for u in usage_list]
+def usage_get(request, tenant_id, start, end):
+    usage = _get_usage(request, start, end, tenant_id).get(tenant_id, {})
+    return NovaUsage(nova_usage.Usage(None, usage, loaded=True))
+
+
+@profiler.trace
+def usage_list(request, start, end, detailed=True):
+    """Get the usage of all the projects.
+
+    With ``detailed=False``, NovaUsageSummary objects are returned: the
+    usage of each server is not kept, and only one page of usage is held
+    in memory at a time.
+    """
+    usages = _get_usage(request, start, end, detailed=detailed).values()
+    if detailed:
+        return [NovaUsage(nova_usage.Usage(None, usage, loaded=True))
+                for usage in usages]
+    return list(usages)
 
 
 @profiler.trace
@@ -857,10 +1177,13 @@ def instance_volumes_list(request, instance_id):
     from openstack_dashboard.api import cinder
 
     volumes = novaclient(request).volumes.get_server_volumes(instance_id)
+    if not volumes:
+        return volumes
 
+    names = cinder.volume_names_get(request,
+                                    [volume.id for volume in volumes])
     for volume in volumes:
-        volume_data = cinder.cinderclient(request).volumes.get(volume.id)
-        volume.name = cinder.Volume(volume_data).name
+        volume.name = names[volume.id]
 
     return volumes
 
@@ -1065,15 +1388,21 @@ def remove_host_from_aggregate(request, aggregate_id, host):
 @profiler.trace
 def interface_attach(request,
                      server, port_id=None, net_id=None, fixed_ip=None):
-    return novaclient(request).servers.interface_attach(server,
-                                                        port_id,
-                                                        net_id,
-                                                        fixed_ip)
+    interface = novaclient(request).servers.interface_attach(server,
+                                                             port_id,
+                                                             net_id,
+                                                             fixed_ip)
+    # Addresses of servers retrieved from neutron are cached by
+    # api.neutron.servers_update_addresses().
+    catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+    return interface
 
 
 @profiler.trace
 def interface_detach(request, server, port_id):
-    return novaclient(request).servers.interface_detach(server, port_id)
+    result = novaclient(request).servers.interface_detach(server, port_id)
+    catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+    return result
 
 
 @profiler.trace
@@ -112,6 +112,37 @@ class Users(generic.View):
                 api.keystone.user_delete(request, user_id)
 
 
+@urls.register
+class UserSearch(generic.View):
+    """API for the search of keystone users by name."""
+    url_regex = r'keystone/users/search/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        """Get the users whose name starts with the "q" GET parameter.
+
+        The users of the current domain are searched, unless the domain_id
+        GET parameter is given. The limit GET parameter is the maximum
+        number of users returned, API_RESULT_PAGE_SIZE by default.
+
+        The listing result is an object with property "items".
+        """
+        domain_context = request.session.get('domain_context')
+        limit = request.GET.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise rest_utils.AjaxError(400, '"limit" must be an integer')
+        result = api.keystone.user_search(
+            request,
+            request.GET.get('q', ''),
+            domain=request.GET.get('domain_id', domain_context),
+            limit=limit
+        )
+        return {'items': [u.to_dict() for u in result]}
+
+
 @urls.register
 class User(generic.View):
     """API for a single keystone user."""
@@ -173,8 +173,25 @@ class Object(generic.View):
 
         :param file: the file data for the upload.
 
+        Unless the request is a multipart form, its body is the content of
+        the object, which is streamed to swift as it is received. Large
+        objects are uploaded in segments, and the following query
+        parameters are used:
+
+        :param upload_id: the identifier of the upload, to resume it if it
+            fails, chosen by the client. It is required for objects larger
+            than ``SWIFT_UPLOAD_SEGMENT_SIZE``.
+        :param offset: the offset in the object of the content of the
+            request, when resuming an upload.
+        :param filename: the original name of the file.
+
         :return:
         """
+        content_type = request.META.get('CONTENT_TYPE', '')
+        if (object_name[-1] != '/' and
+                not content_type.startswith('multipart/form-data')):
+            return self._post_stream(request, container, object_name)
+
         form = UploadObjectForm(request.POST, request.FILES)
         if not form.is_valid():
             raise rest_utils.AjaxError(500, 'Invalid request')
@@ -199,6 +216,35 @@ class Object(generic.View):
             u'/api/swift/containers/%s/object/%s' % (container, result.name)
         )
 
+    def _post_stream(self, request, container, object_name):
+        try:
+            size = int(request.META.get('CONTENT_LENGTH') or '')
+        except ValueError:
+            return rest_utils.JSONResponse('Length Required', 411)
+        try:
+            offset = int(request.GET.get('offset', 0))
+        except ValueError:
+            return rest_utils.JSONResponse('Invalid offset', 400)
+        try:
+            result = api.swift.swift_upload_object_stream(
+                request,
+                container,
+                object_name,
+                request,
+                size,
+                offset=offset,
+                upload_id=request.GET.get('upload_id'),
+                orig_filename=request.GET.get('filename')
+            )
+        except exceptions.BadRequest as e:
+            return rest_utils.JSONResponse(str(e), 400)
+        except exceptions.Conflict as e:
+            return rest_utils.JSONResponse(str(e), 409)
+
+        return rest_utils.CreatedResponse(
+            u'/api/swift/containers/%s/object/%s' % (container, result.name)
+        )
+
     @rest_utils.ajax()
     def delete(self, request, container, object_name):
         if object_name[-1] == '/':
@@ -235,6 +281,19 @@ class Object(generic.View):
         return response
 
 
+@urls.register
+class ObjectUpload(generic.View):
+    """API for the progress of a segmented upload of a swift object"""
+    url_regex = r'swift/containers/(?P<container>[^/]+)/upload/' \
+        '(?P<upload_id>[^/]+)/(?P<object_name>.+)$'
+
+    @rest_utils.ajax()
+    def get(self, request, container, upload_id, object_name):
+        """Get the number of bytes stored, to resume the upload from."""
+        return api.swift.swift_get_upload_status(request, container,
+                                                 object_name, upload_id)
+
+
 @urls.register
 class ObjectMetadata(generic.View):
     """API for a single swift object"""
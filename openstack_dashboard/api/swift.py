@@ -19,6 +19,7 @@
 from datetime import datetime
 
 import functools
+import json
 
 import six.moves.urllib.parse as urlparse
 import swiftclient
@@ -33,6 +34,11 @@ from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
+SEGMENT_SIZE = getattr(settings, 'SWIFT_UPLOAD_SEGMENT_SIZE',
+                       256 * 1024 * 1024)
+# The segments of an object are stored in the container of the object
+# with this suffix, as the swift command line client does.
+SEGMENT_CONTAINER_SUFFIX = "_segments"
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
 LIST_CONTENTS_ACL = ".rlistings"
@@ -327,6 +333,125 @@ def swift_upload_object(request, container_name, object_name,
     return StorageObject(obj_info, container_name)
 
 
+def _segment_prefix(object_name, upload_id):
+    return '%s/%s/%d/' % (object_name, upload_id, SEGMENT_SIZE)
+
+
+def _get_stored_segments(swift, segment_container, prefix):
+    """Return the full segments of an upload stored in a row from the start.
+
+    The last segment of an upload is shorter and is not returned, as it is
+    uploaded again with the manifest when the upload is resumed.
+    """
+    try:
+        objects = swift.get_container(segment_container, prefix=prefix,
+                                      full_listing=True)[1]
+    except swiftclient.client.ClientException as e:
+        if e.http_status == 404:
+            return []
+        raise
+    stored = dict((obj['name'], obj) for obj in objects)
+    segments = []
+    while True:
+        segment = stored.get('%s%08d' % (prefix, len(segments)))
+        if segment is None or segment['bytes'] != SEGMENT_SIZE:
+            return segments
+        segments.append(segment)
+
+
+@profiler.trace
+@safe_swift_exception
+def swift_get_upload_status(request, container_name, object_name, upload_id):
+    """Return the progress of a segmented upload of an object.
+
+    The returned offset is the number of bytes stored, from which the upload
+    can be resumed with swift_upload_object_stream().
+    """
+    segments = _get_stored_segments(
+        swift_api(request), container_name + SEGMENT_CONTAINER_SUFFIX,
+        _segment_prefix(object_name, upload_id))
+    return {'upload_id': upload_id,
+            'segment_size': SEGMENT_SIZE,
+            'segments': len(segments),
+            'offset': len(segments) * SEGMENT_SIZE}
+
+
+@profiler.trace
+@safe_swift_exception
+def swift_upload_object_stream(request, container_name, object_name, stream,
+                               size, offset=0, upload_id=None,
+                               orig_filename=None):
+    """Upload an object read from a file-like stream, chunk by chunk.
+
+    Reads size bytes from stream and sends them to swift as they are read.
+    Objects larger than ``SWIFT_UPLOAD_SEGMENT_SIZE`` are uploaded in
+    segments, joined by a static large object manifest, or a dynamic one
+    when the cluster does not support static large objects.
+
+    A segmented upload requires an upload_id, chosen by the client, so that
+    it can be resumed after a failure: the stream then starts at offset in
+    the object, which is the offset returned by swift_get_upload_status().
+    """
+    total = offset + size
+    if upload_id is None and total > SEGMENT_SIZE:
+        # The segments of a failed upload could neither be resumed nor
+        # found by the client.
+        raise exceptions.BadRequest(
+            _("An upload_id is required to upload objects larger than %d "
+              "bytes.") % SEGMENT_SIZE)
+    swift = swift_api(request)
+    headers = {}
+    if orig_filename:
+        headers['X-Object-Meta-Orig-Filename'] = orig_filename
+    if not offset and size <= SEGMENT_SIZE:
+        etag = swift.put_object(container_name, object_name, stream,
+                                content_length=size, chunk_size=CHUNK_SIZE,
+                                headers=headers)
+        obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
+        return StorageObject(obj_info, container_name)
+
+    segment_container = container_name + SEGMENT_CONTAINER_SUFFIX
+    prefix = _segment_prefix(object_name, upload_id)
+    segments = []
+    if offset:
+        segments = _get_stored_segments(swift, segment_container, prefix)
+        if offset % SEGMENT_SIZE or offset > len(segments) * SEGMENT_SIZE:
+            raise exceptions.Conflict(
+                _("The upload can only be resumed from %d bytes.")
+                % (len(segments) * SEGMENT_SIZE))
+        segments = segments[:offset // SEGMENT_SIZE]
+    else:
+        swift.put_container(segment_container)
+
+    position = offset
+    while position < total:
+        length = min(SEGMENT_SIZE, total - position)
+        name = '%s%08d' % (prefix, len(segments))
+        etag = swift.put_object(segment_container, name, stream,
+                                content_length=length, chunk_size=CHUNK_SIZE)
+        segments.append({'name': name, 'hash': etag, 'bytes': length})
+        position += length
+
+    slo = swift_get_capabilities(request).get('slo')
+    if slo is not None and len(segments) <= slo.get('max_manifest_segments',
+                                                    1000):
+        manifest = [{'path': '/%s/%s' % (segment_container, segment['name']),
+                     'etag': segment['hash'],
+                     'size_bytes': segment['bytes']}
+                    for segment in segments]
+        etag = swift.put_object(container_name, object_name,
+                                json.dumps(manifest), headers=headers,
+                                query_string='multipart-manifest=put')
+    else:
+        headers['X-Object-Manifest'] = urlparse.quote(
+            ('%s/%s' % (segment_container, prefix)).encode('utf-8'))
+        etag = swift.put_object(container_name, object_name, '',
+                                content_length=0, headers=headers)
+
+    obj_info = {'name': object_name, 'bytes': total, 'etag': etag}
+    return StorageObject(obj_info, container_name)
+
+
 @profiler.trace
 @safe_swift_exception
 def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
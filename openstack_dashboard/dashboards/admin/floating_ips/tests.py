@@ -25,7 +25,7 @@ INDEX_TEMPLATE = 'horizon/common/_data_table_view.html'
 class AdminFloatingIpViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
-        api.nova: ['server_list'],
+        api.nova: ['server_iter'],
         api.keystone: ['tenant_list'],
         api.neutron: ['network_list',
                       'is_extension_supported',
@@ -36,7 +36,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         servers = self.servers.list()
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
-        self.mock_server_list.return_value = [servers, False]
+        self.mock_server_iter.return_value = servers
         self.mock_tenant_list.return_value = [tenants, False]
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
@@ -55,7 +55,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         self.mock_tenant_floating_ip_list.assert_called_once_with(
             test.IsHttpRequest(),
             all_tenants=True)
-        self.mock_server_list.assert_called_once_with(
+        self.mock_server_iter.assert_called_once_with(
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
@@ -213,7 +213,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'floating_ip_disassociate',
                       'is_extension_supported',
                       'network_list'],
-        api.nova: ['server_list'],
+        api.nova: ['server_iter'],
         api.keystone: ['tenant_list']})
     def test_admin_disassociate_floatingip(self):
         # Use neutron test data
@@ -222,7 +222,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         servers = self.servers.list()
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
-        self.mock_server_list.return_value = [servers, False]
+        self.mock_server_iter.return_value = servers
         self.mock_tenant_list.return_value = [tenants, False]
         self.mock_network_list.return_value = self.networks.list()
         self.mock_floating_ip_disassociate.return_value = None
@@ -236,7 +236,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         self.assertNoFormErrors(res)
         self.mock_tenant_floating_ip_list.assert_called_once_with(
             test.IsHttpRequest(), all_tenants=True)
-        self.mock_server_list.assert_called_once_with(
+        self.mock_server_iter.assert_called_once_with(
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
@@ -253,7 +253,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         api.neutron: ['tenant_floating_ip_list',
                       'is_extension_supported',
                       'network_list'],
-        api.nova: ['server_list'],
+        api.nova: ['server_iter'],
         api.keystone: ['tenant_list']})
     def test_admin_delete_floatingip(self):
         # Use neutron test data
@@ -262,7 +262,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         servers = self.servers.list()
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
-        self.mock_server_list.return_value = [servers, False]
+        self.mock_server_iter.return_value = servers
         self.mock_tenant_list.return_value = [tenants, False]
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
@@ -275,7 +275,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         self.assertNoFormErrors(res)
         self.mock_tenant_floating_ip_list.assert_called_once_with(
             test.IsHttpRequest(), all_tenants=True)
-        self.mock_server_list.assert_called_once_with(
+        self.mock_server_iter.assert_called_once_with(
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
@@ -290,7 +290,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         api.neutron: ['tenant_floating_ip_list',
                       'is_extension_supported',
                       'network_list'],
-        api.nova: ['server_list'],
+        api.nova: ['server_iter'],
         api.keystone: ['tenant_list']})
     def test_floating_ip_table_actions(self):
         # Use neutron test data
@@ -298,7 +298,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         servers = self.servers.list()
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
-        self.mock_server_list.return_value = [servers, False]
+        self.mock_server_iter.return_value = servers
         self.mock_tenant_list.return_value = [tenants, False]
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
@@ -318,7 +318,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         self.assertContains(res, 'floating_ips__disassociate__%s' % fips[1].id)
         self.mock_tenant_floating_ip_list.assert_called_once_with(
             test.IsHttpRequest(), all_tenants=True)
-        self.mock_server_list.assert_called_once_with(
+        self.mock_server_iter.assert_called_once_with(
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
@@ -75,17 +75,18 @@ class IndexView(tables.DataTableView):
                               _('Unable to retrieve floating IP list.'))
 
         if floating_ips:
-            instances = []
+            instances_dict = {}
             try:
-                instances, has_more = api.nova.server_list(
+                instances = api.nova.server_iter(
                     self.request,
                     search_opts={'all_tenants': True},
                     detailed=False)
+                instances_dict = dict([(obj.id, obj.name)
+                                       for obj in instances])
             except Exception:
                 exceptions.handle(
                     self.request,
                     _('Unable to retrieve instance list.'))
-            instances_dict = dict([(obj.id, obj.name) for obj in instances])
 
             tenants = get_tenant_list(self.request)
             tenant_dict = OrderedDict([(t.id, t) for t in tenants])
@@ -93,6 +93,8 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    all_tenants = True
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
         try:
@@ -105,6 +107,34 @@ class AdminUpdateRow(project_tables.UpdateRow):
 
         return instance
 
+    def get_data_bulk(self, request, instance_ids):
+        data = super(AdminUpdateRow, self).get_data_bulk(request,
+                                                         instance_ids)
+        tenant_names = {}
+        for instance_id, instance in list(data.items()):
+            # The instances retrieved with get_data() when listing them
+            # failed have their project name already.
+            if (isinstance(instance, type) or
+                    hasattr(instance, 'tenant_name')):
+                continue
+            tenant_id = instance.tenant_id
+            if tenant_id not in tenant_names:
+                try:
+                    tenant = api.keystone.tenant_get(request, tenant_id,
+                                                     admin=True)
+                    tenant_names[tenant_id] = getattr(tenant, "name",
+                                                      tenant_id)
+                except keystone_exceptions.NotFound:
+                    tenant_names[tenant_id] = None
+                except Exception:
+                    tenant_names[tenant_id] = self.handle_data_error(request)
+            tenant_name = tenant_names[tenant_id]
+            if isinstance(tenant_name, type):
+                data[instance_id] = tenant_name
+            else:
+                instance.tenant_name = tenant_name
+        return data
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     # Change default name of 'filter' to distinguish this one from the
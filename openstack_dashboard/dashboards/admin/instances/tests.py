@@ -13,6 +13,7 @@
 #    under the License.
 
 from collections import OrderedDict
+import json
 import uuid
 
 import mock
@@ -222,6 +223,50 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_servers_update_addresses.assert_called_once_with(
             test.IsHttpRequest(), [server])
 
+    @test.create_mocks({api.nova: ['server_list', 'server_get',
+                                   'flavor_list_cached',
+                                   'extension_supported'],
+                        api.network: ['servers_update_addresses'],
+                        api.keystone: ['tenant_get']})
+    def test_rows_update(self):
+        servers = self.servers.list()[:2]
+        servers[1].tenant_id = 'broken-tenant'
+        servers_by_id = dict((server.id, server) for server in servers)
+        tenant = self.tenants.first()
+
+        def _tenant_get(request, tenant_id, admin):
+            if tenant_id != servers[0].tenant_id:
+                raise ValueError('unexpected')
+            return tenant
+
+        self.mock_server_get.side_effect = \
+            lambda request, server_id: servers_by_id[server_id]
+        self.mock_extension_supported.return_value = True
+        self.mock_flavor_list_cached.return_value = self.flavors.list()
+        self.mock_tenant_get.side_effect = _tenant_get
+        self.mock_servers_update_addresses.return_value = None
+
+        params = [('action', 'rows_update'), ('table', 'instances')]
+        params.extend(('obj_id', server.id) for server in servers)
+        res = self.client.get(INDEX_URL, params,
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        content = json.loads(res.content.decode('utf-8'))
+        self.assertEqual([servers[0].id], list(content['rows']))
+        self.assertIn(tenant.name, content['rows'][servers[0].id])
+        # Only the row of the project which failed is not updated.
+        self.assertEqual({servers[1].id: 500}, content['errors'])
+        # The servers of the other projects are not listed.
+        self.mock_server_list.assert_not_called()
+        self.assertEqual(2, self.mock_server_get.call_count)
+        self.mock_tenant_get.assert_has_calls([
+            mock.call(test.IsHttpRequest(), servers[0].tenant_id,
+                      admin=True),
+            mock.call(test.IsHttpRequest(), servers[1].tenant_id,
+                      admin=True)], any_order=True)
+        self.mock_servers_update_addresses.assert_called_once_with(
+            test.IsHttpRequest(), mock.ANY, all_tenants=True)
+
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list', 'extension_supported'],
         api.keystone: ['tenant_list'],
@@ -108,7 +108,7 @@ class AdminIndexView(tables.DataTableView):
     def _get_flavors(self):
         # Gather our flavors to correlate against IDs
         try:
-            flavors = api.nova.flavor_list(self.request)
+            flavors = api.nova.flavor_list_cached(self.request)
             return dict([(str(flavor.id), flavor) for flavor in flavors])
         except Exception:
             msg = _("Unable to retrieve flavor list.")
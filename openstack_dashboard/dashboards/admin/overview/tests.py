@@ -138,7 +138,8 @@ class UsageViewTests(test.BaseAdminViewTests):
                                   start_day.day, 0, 0, 0, 0),
                 datetime.datetime(now.year,
                                   now.month,
-                                  now.day, 23, 59, 59, 0))
+                                  now.day, 23, 59, 59, 0),
+                detailed=False)
         else:
             self.mock_usage_list.assert_not_called()
 
@@ -166,8 +167,10 @@ class UsageViewTests(test.BaseAdminViewTests):
         res = self.client.get(csv_url)
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.GlobalUsage)
+        # The CSV is streamed, its content can only be read once.
+        content = b''.join(res.streaming_content).decode('utf-8')
         hdr = 'Project Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours)'
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
             for obj in usage_obj:
@@ -176,7 +179,7 @@ class UsageViewTests(test.BaseAdminViewTests):
                                                             obj.memory_mb,
                                                             obj.disk_gb_hours,
                                                             obj.vcpu_hours)
-                self.assertContains(res, row)
+                self.assertIn(row, content)
 
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_extension_supported, 2,
@@ -192,6 +195,7 @@ class UsageViewTests(test.BaseAdminViewTests):
                                   0, 0, 0, 0),
                 datetime.datetime(now.year,
                                   now.month,
-                                  now.day, 23, 59, 59, 0))
+                                  now.day, 23, 59, 59, 0),
+                detailed=False)
         else:
             self.mock_usage_list.assert_not_called()
@@ -96,6 +96,10 @@ class AttachmentColumn(volumes_tables.AttachmentColumn):
     instance_detail_url = "horizon:admin:instances:detail"
 
 
+class UpdateRow(volumes_tables.UpdateRow):
+    all_tenants = True
+
+
 class VolumesTable(volumes_tables.VolumesTable):
     name = tables.WrappingColumn("name",
                                  verbose_name=_("Name"),
@@ -110,7 +114,7 @@ class VolumesTable(volumes_tables.VolumesTable):
         name = "volumes"
         verbose_name = _("Volumes")
         status_columns = ["status"]
-        row_class = volumes_tables.UpdateRow
+        row_class = UpdateRow
         table_actions = (ManageVolumeAction,
                          volumes_tables.DeleteVolume,
                          VolumesFilterAction)
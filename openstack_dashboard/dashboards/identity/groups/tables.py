@@ -116,6 +116,7 @@ class GroupsTable(tables.DataTable):
         row_actions = (ManageUsersLink, EditGroupLink, DeleteGroupsAction)
         table_actions = (GroupFilterAction, CreateGroupLink,
                          DeleteGroupsAction)
+        pagination_param = "group_marker"
 
 
 class UserFilterAction(tables.FilterAction):
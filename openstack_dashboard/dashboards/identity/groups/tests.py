@@ -43,14 +43,14 @@ class GroupsViewTests(test.BaseAdminViewTests):
         return groups
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'group_list',)})
+                                       'group_list_paged',)})
     def test_index(self):
         domain_id = self._get_domain_id()
         groups = self._get_groups(domain_id)
         filters = {}
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_group_list.return_value = groups
+        self.mock_group_list_paged.return_value = (groups, False)
 
         res = self.client.get(GROUPS_INDEX_URL)
 
@@ -66,11 +66,11 @@ class GroupsViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
-                                                     domain=domain_id,
-                                                     filters=filters)
+        self.mock_group_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
 
-    @test.create_mocks({api.keystone: ('group_list',)})
+    @test.create_mocks({api.keystone: ('group_list_paged',)})
     def test_index_with_domain(self):
         domain = self.domains.get(id="1")
         filters = {}
@@ -78,7 +78,7 @@ class GroupsViewTests(test.BaseAdminViewTests):
                               domain_context_name=domain.name)
         groups = self._get_groups(domain.id)
 
-        self.mock_group_list.return_value = groups
+        self.mock_group_list_paged.return_value = (groups, False)
 
         res = self.client.get(GROUPS_INDEX_URL)
 
@@ -92,19 +92,19 @@ class GroupsViewTests(test.BaseAdminViewTests):
         self.assertContains(res, 'Edit')
         self.assertContains(res, 'Delete Group')
 
-        self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
-                                                     domain=domain.id,
-                                                     filters=filters)
+        self.mock_group_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain.id, filters=filters,
+            marker=None)
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'group_list',
+                                       'group_list_paged',
                                        'keystone_can_edit_group')})
     def test_index_with_keystone_can_edit_group_false(self):
         domain_id = self._get_domain_id()
         groups = self._get_groups(domain_id)
         filters = {}
         self.mock_get_effective_domain_id.return_value = domain_id
-        self.mock_group_list.return_value = groups
+        self.mock_group_list_paged.return_value = (groups, False)
         self.mock_keystone_can_edit_group.return_value = False
 
         res = self.client.get(GROUPS_INDEX_URL)
@@ -118,10 +118,9 @@ class GroupsViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_group_list.assert_called_once_with(
-            test.IsHttpRequest(),
-            domain=domain_id,
-            filters=filters)
+        self.mock_group_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_keystone_can_edit_group, 19, mock.call())
 
@@ -200,7 +199,7 @@ class GroupsViewTests(test.BaseAdminViewTests):
             name=group.name)
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'group_list',
+                                       'group_list_paged',
                                        'group_delete')})
     def test_delete_group(self):
         domain_id = self._get_domain_id()
@@ -208,7 +207,7 @@ class GroupsViewTests(test.BaseAdminViewTests):
         group = self.groups.get(id="2")
 
         self.mock_get_effective_domain_id.return_value = domain_id
-        self.mock_group_list.return_value = self.groups.list()
+        self.mock_group_list_paged.return_value = (self.groups.list(), False)
         self.mock_group_delete.return_value = None
 
         formData = {'action': 'groups__delete__%s' % group.id}
@@ -218,9 +217,9 @@ class GroupsViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
-                                                     domain=domain_id,
-                                                     filters=filters)
+        self.mock_group_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.mock_group_delete.assert_called_once_with(test.IsHttpRequest(),
                                                        group.id)
 
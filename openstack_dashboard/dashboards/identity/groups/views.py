@@ -42,8 +42,14 @@ class IndexView(tables.DataTableView):
     def needs_filter_first(self, table):
         return self._needs_filter_first
 
+    def has_more_data(self, table):
+        return self._more
+
     def get_data(self):
         groups = []
+        marker = self.request.GET.get(
+            project_tables.GroupsTable._meta.pagination_param, None)
+        self._more = False
         filters = self.get_filters()
         self._needs_filter_first = False
 
@@ -61,9 +67,11 @@ class IndexView(tables.DataTableView):
 
             domain_id = identity.get_domain_id_for_operation(self.request)
             try:
-                groups = api.keystone.group_list(self.request,
-                                                 domain=domain_id,
-                                                 filters=filters)
+                groups, self._more = api.keystone.group_list_paged(
+                    self.request,
+                    domain=domain_id,
+                    filters=filters,
+                    marker=marker)
             except Exception:
                 exceptions.handle(self.request,
                                   _('Unable to retrieve group list.'))
@@ -222,6 +222,9 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
+        self.assertContains(
+            res, 'data-search-url="/api/keystone/users/search/?domain_id=%s"'
+            % domain_id)
 
     def test_add_project_get_domain(self):
         domain = self.domains.get(id="1")
@@ -314,6 +317,80 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.assertEqual(len(expected_add_group_role),
                          self.mock_add_group_role.call_count)
 
+    @test.create_mocks({api.keystone: ('get_default_role',
+                                       'add_group_role',
+                                       'add_tenant_user_role',
+                                       'tenant_create',
+                                       'user_get',
+                                       'user_list',
+                                       'group_list',
+                                       'role_list',
+                                       'domain_get')})
+    def test_add_project_post_searched_user(self):
+        project = self.tenants.first()
+        default_role = self.roles.first()
+        domain_id = self._get_default_domain().id
+        users = self._get_all_users(domain_id)
+        # The first user is missing from the truncated user list, and was
+        # found through the user search.
+        searched_user = users[0]
+
+        self.mock_get_default_role.return_value = default_role
+        self.mock_user_list.return_value = users[1:]
+        self.mock_user_get.return_value = searched_user
+        self.mock_role_list.return_value = self.roles.list()
+        self.mock_group_list.return_value = self._get_all_groups(domain_id)
+        self.mock_tenant_create.return_value = project
+        self.mock_add_tenant_user_role.return_value = None
+
+        workflow_data = self._get_workflow_data(project)
+        workflow_data[USER_ROLE_PREFIX + default_role.id] = [searched_user.id]
+
+        url = reverse('horizon:identity:projects:create')
+        res = self.client.post(url, workflow_data)
+
+        self.assertNoFormErrors(res)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+        self.mock_add_tenant_user_role.assert_called_once_with(
+            test.IsHttpRequest(), project=project.id, user=searched_user.id,
+            role=default_role.id)
+        self.mock_user_get.assert_called_once_with(test.IsHttpRequest(),
+                                                   searched_user.id)
+
+    @test.create_mocks({api.keystone: ('get_default_domain',
+                                       'get_default_role',
+                                       'tenant_create',
+                                       'user_get',
+                                       'user_list',
+                                       'group_list',
+                                       'role_list')})
+    def test_add_project_post_user_of_other_domain(self):
+        project = self.tenants.first()
+        default_role = self.roles.first()
+        domain_id = self._get_default_domain().id
+        users = self._get_all_users(domain_id)
+        other_user = self.users.get(id='1')
+        other_user.domain_id = 'other'
+
+        self.mock_get_default_domain.return_value = self._get_default_domain()
+        self.mock_get_default_role.return_value = default_role
+        self.mock_user_list.return_value = users[1:]
+        self.mock_role_list.return_value = self.roles.list()
+        self.mock_group_list.return_value = self._get_all_groups(domain_id)
+        self.mock_user_get.return_value = other_user
+
+        workflow_data = self._get_workflow_data(project)
+        workflow_data[USER_ROLE_PREFIX + default_role.id] = [other_user.id]
+
+        url = reverse('horizon:identity:projects:create')
+        res = self.client.post(url, workflow_data)
+
+        # The user is not a valid choice, so the project is not created.
+        self.assertContains(res, "Select a valid choice")
+        self.mock_tenant_create.assert_not_called()
+        self.mock_user_get.assert_called_once_with(test.IsHttpRequest(),
+                                                   other_user.id)
+
     def test_add_project_post_domain(self):
         domain = self.domains.get(id="1")
         self.setSessionValues(domain_context=domain.id,
@@ -628,7 +705,6 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                                        'remove_tenant_user_role',
                                        'add_tenant_user_role',
                                        'user_list',
-                                       'roles_for_group',
                                        'remove_group_role',
                                        'add_group_role',
                                        'group_list',
@@ -708,12 +784,7 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         expected_remove_tenant_user_role = []
         self.mock_remove_tenant_user_role.side_effect = \
             retvals_remove_tenant_user_role
-        retvals_roles_for_group = []
-        expected_roles_for_group = []
-        self.mock_roles_for_group.side_effect = retvals_roles_for_group
-        retvals_remove_group_role = []
-        expected_remove_group_role = []
-        self.mock_remove_group_role.side_effect = retvals_remove_group_role
+        expected_add_group_role = []
 
         if keystone_api_version >= 3:
             # admin role with attempt to remove current admin, results in
@@ -754,29 +825,15 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             retvals_group_list.append(groups)
             expected_group_list.append(
                 mock.call(test.IsHttpRequest(),
-                          domain=self.domain.id,
-                          project=self.tenant.id))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='1',
-                          project=self.tenant.id))
-            retvals_remove_group_role.append(None)
-            expected_remove_group_role.append(
-                mock.call(test.IsHttpRequest(),
-                          project=self.tenant.id,
-                          group='1',
-                          role='1'))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='2',
-                          project=self.tenant.id))
-            retvals_roles_for_group.append(roles)
-            expected_roles_for_group.append(
-                mock.call(test.IsHttpRequest(),
-                          group='3',
-                          project=self.tenant.id))
+                          domain=self.domain.id))
+            # Group 1 keeps role 2, give groups 2 and 3 roles 1 and 2
+            for group_id in ('2', '3'):
+                for role_id in ('1', '2'):
+                    expected_add_group_role.append(
+                        mock.call(test.IsHttpRequest(),
+                                  project=self.tenant.id,
+                                  group=group_id,
+                                  role=role_id))
         else:
             retvals_user_list.append(proj_users)
             expected_user_list.append(
@@ -785,17 +842,17 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
             # admin user - try to remove all roles on current project, warning
             retvals_roles_for_user.append(roles)
-            expected_roles_for_group.append(
+            expected_roles_for_user.append(
                 mock.call(test.IsHttpRequest(), '1', self.tenant.id))
 
             # member user 1 - has role 1, will remove it
             retvals_roles_for_user.append((roles[1],))
-            expected_roles_for_group.append(
+            expected_roles_for_user.append(
                 mock.call(test.IsHttpRequest(), '2', self.tenant.id))
 
             # member user 3 - has role 2
             retvals_roles_for_user.append((roles[0],))
-            expected_roles_for_group.append(
+            expected_roles_for_user.append(
                 mock.call(test.IsHttpRequest(), '3', self.tenant.id))
             # add role 2
             retvals_add_tenant_user_role.append(self.exceptions.keystone)
@@ -853,14 +910,13 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                           expected_add_tenant_user_role, any_order=True)
         _check_mock_calls(self.mock_remove_tenant_user_role,
                           expected_remove_tenant_user_role, any_order=True)
-        _check_mock_calls(self.mock_roles_for_group,
-                          expected_roles_for_group)
-        _check_mock_calls(self.mock_remove_group_role,
-                          expected_remove_group_role)
+        _check_mock_calls(self.mock_add_group_role,
+                          expected_add_group_role, any_order=True)
+        self.mock_remove_group_role.assert_not_called()
 
         if keystone_api_version >= 3:
             self.assert_mock_multiple_calls_with_same_arguments(
-                self.mock_role_assignments_list, 3,
+                self.mock_role_assignments_list, 4,
                 mock.call(test.IsHttpRequest(), project=self.tenant.id))
         else:
             self.mock_role_assignments_list.assert_not_called()
@@ -17,10 +17,12 @@
 #    under the License.
 
 import abc
+import collections
 import logging
 
 from django.conf import settings
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 
 from openstack_auth import utils
@@ -268,6 +270,36 @@ class CreateProjectInfo(workflows.Step):
             self.contributes += tuple(EXTRA_INFO.keys())
 
 
+def _get_requested_roles(member_step, data, available_roles):
+    """Return the IDs of the roles of each member selected in a step."""
+    requested = collections.defaultdict(list)
+    for role in available_roles:
+        field_name = member_step.get_member_field_name(role.id)
+        for member_id in data[field_name]:
+            requested[member_id].append(role.id)
+    return requested
+
+
+def _update_roles(request, project_id, current, requested, group=False):
+    """Apply the role changes from current to requested roles on a project.
+
+    Returns the number of users or groups whose roles could not all be
+    changed, along with the first error.
+    """
+    grants, revokes = api.keystone.diff_project_roles(current, requested)
+    result = api.keystone.update_project_roles(request, project_id,
+                                               grants=grants,
+                                               revokes=revokes, group=group)
+    LOG.debug('Granted %(granted)s and revoked %(revoked)s roles on project '
+              '%(project)s, %(failed)s operations failed.',
+              {'granted': result['granted'], 'revoked': result['revoked'],
+               'project': project_id, 'failed': len(result['failed'])})
+    if not result['failed']:
+        return 0, None
+    failed_members = set(failed[1] for failed in result['failed'])
+    return len(failed_members), result['failed'][0][3]
+
+
 class UpdateProjectMembersAction(workflows.MembershipAction):
     def __init__(self, request, *args, **kwargs):
         super(UpdateProjectMembersAction, self).__init__(request,
@@ -316,8 +348,12 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
             exceptions.handle(request,
                               err_msg,
                               redirect=reverse(INDEX_URL))
-        for role in role_list:
-            field_name = self.get_member_field_name(role.id)
+        field_names = [self.get_member_field_name(role.id)
+                       for role in role_list]
+        if self.is_bound:
+            users_list.extend(self._get_posted_users(users_list, field_names,
+                                                     domain_id))
+        for role, field_name in zip(role_list, field_names):
             label = role.name
             self.fields[field_name] = forms.MultipleChoiceField(required=False,
                                                                 label=label)
@@ -340,6 +376,27 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
                     field_name = self.get_member_field_name(role_id)
                     self.fields[field_name].initial.append(user_id)
 
+    def _get_posted_users(self, users_list, field_names, domain_id):
+        # The user list may be truncated by the list_limit of Keystone, the
+        # users missing from it are then found through the user search and
+        # posted along with the listed ones. They are only accepted if they
+        # belong to the domain of the project, the others are left out of
+        # the choices for the fields to reject them.
+        listed_ids = set(user_id for user_id, name in users_list)
+        posted_ids = set()
+        for field_name in field_names:
+            posted_ids.update(self.data.getlist(field_name))
+        posted_users = []
+        for user_id in posted_ids - listed_ids:
+            try:
+                user = api.keystone.user_get(self.request, user_id)
+            except Exception:
+                continue
+            if domain_id and getattr(user, 'domain_id', None) != domain_id:
+                continue
+            posted_users.append((user.id, user.name))
+        return posted_users
+
     class Meta(object):
         name = _("Project Members")
         slug = PROJECT_USER_MEMBER_SLUG
@@ -352,6 +409,13 @@ class UpdateProjectMembers(workflows.UpdateMembersStep):
     no_available_text = _("No users found.")
     no_members_text = _("No users.")
 
+    def get_available_search_url(self):
+        url = settings.WEBROOT + 'api/keystone/users/search/'
+        domain_id = self.action.initial.get('domain_id')
+        if domain_id:
+            url += '?' + urlencode({'domain_id': domain_id})
+        return url
+
     def contribute(self, data, context):
         if data:
             try:
@@ -529,23 +593,13 @@ class CreateProject(workflows.Workflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
             # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            requested = _get_requested_roles(member_step, data,
+                                             available_roles)
+            users_to_add, error = _update_roles(request, project_id, {},
+                                                requested)
+            if error is not None:
+                raise error
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -563,24 +617,13 @@ class CreateProject(workflows.Workflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
             # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            requested = _get_requested_roles(member_step, data,
+                                             available_roles)
+            groups_to_add, error = _update_roles(request, project_id, {},
+                                                 requested, group=True)
+            if error is not None:
+                raise error
         except Exception:
             exceptions.handle(request,
                               _('Failed to add %s project groups '
@@ -710,39 +753,6 @@ class UpdateProject(workflows.Workflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -782,7 +792,6 @@ class UpdateProject(workflows.Workflow):
             # can diff against it.
             users_roles = api.keystone.get_project_users_roles(
                 request, project=project_id)
-            users_to_modify = len(users_roles)
 
             # TODO(bpokorny): The following lines are needed to make sure we
             # only modify roles for users who are in the current domain.
@@ -794,44 +803,29 @@ class UpdateProject(workflows.Workflow):
                                                domain=data['domain_id'])
             users_dict = {user.id: user.name for user in all_users}
 
-            for user_id in users_roles:
-                # Don't remove roles if the user isn't in the domain
+            requested = _get_requested_roles(member_step, data,
+                                             available_roles)
+            for user_id, role_ids in users_roles.items():
+                # Don't change the roles if the user isn't in the domain
                 if user_id not in users_dict:
-                    users_to_modify -= 1
-                    continue
-
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
+                    requested[user_id] = role_ids
+
+            # Prevent admins from doing stupid things to themselves.
+            user_id = request.user.id
+            removed_role_ids = list(set(users_roles.get(user_id, ())) -
+                                    set(requested.get(user_id, ())))
+            if (removed_role_ids and
+                    self._is_removing_self_admin_role(
+                        request, project_id, user_id, available_roles,
+                        removed_role_ids)):
+                # Keep all the roles the current user would lose.
+                requested[user_id] = (list(requested.get(user_id, ())) +
+                                      removed_role_ids)
+
+            users_to_modify, error = _update_roles(request, project_id,
+                                                   users_roles, requested)
+            if error is not None:
+                raise error
             return True
         except Exception:
             if PROJECT_GROUP_ENABLED:
@@ -853,64 +847,22 @@ class UpdateProject(workflows.Workflow):
         try:
             available_roles = self._get_available_roles(request)
             # Get the groups currently associated with this project so we
-            # can diff against it.
-            project_groups = api.keystone.group_list(request,
-                                                     domain=domain_id,
-                                                     project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for group_id in data[field_name]:
-                    if not list(filter(lambda x: group_id == x.id,
-                                       project_groups)):
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
+            # can diff against it. Only the groups of the domain are
+            # modified, like the users.
+            groups_roles = api.keystone.get_project_groups_roles(
+                request, project=project_id)
+            domain_groups = api.keystone.group_list(request, domain=domain_id)
+            current = dict((group.id, groups_roles[group.id])
+                           for group in domain_groups
+                           if group.id in groups_roles)
+
+            requested = _get_requested_roles(member_step, data,
+                                             available_roles)
+            groups_to_modify, error = _update_roles(request, project_id,
+                                                    current, requested,
+                                                    group=True)
+            if error is not None:
+                raise error
             return True
         except Exception:
             exceptions.handle(request,
@@ -921,10 +873,6 @@ class UpdateProject(workflows.Workflow):
             return False
 
     def handle(self, request, data):
-        # FIXME(gabriel): This should be refactored to use Python's built-in
-        # sets and do this all in a single "roles to add" and "roles to remove"
-        # pass instead of the multi-pass thing happening now.
-
         project = self._update_project(request, data)
         if not project:
             return False
@@ -222,3 +222,4 @@ class UsersTable(tables.DataTable):
                        DeleteUsersAction)
         table_actions = (UserFilterAction, CreateUserLink, DeleteUsersAction)
         row_class = UpdateRow
+        pagination_param = "user_marker"
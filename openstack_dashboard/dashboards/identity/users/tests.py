@@ -53,7 +53,7 @@ class UsersViewTests(test.BaseAdminViewTests):
                      if user.domain_id == domain_id]
         return users
 
-    @test.create_mocks({api.keystone: ('user_list',
+    @test.create_mocks({api.keystone: ('user_list_paged',
                                        'get_effective_domain_id',
                                        'domain_lookup')})
     def test_index(self, with_domain=False):
@@ -64,7 +64,7 @@ class UsersViewTests(test.BaseAdminViewTests):
 
         if not with_domain:
             self.mock_get_effective_domain_id.return_value = domain_id
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
         res = self.client.get(USERS_INDEX_URL)
@@ -80,9 +80,9 @@ class UsersViewTests(test.BaseAdminViewTests):
         else:
             self.mock_get_effective_domain_id.assert_called_once_with(
                 test.IsHttpRequest())
-        self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
-                                                    domain=domain_id,
-                                                    filters=filters)
+        self.mock_user_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.mock_domain_lookup.assert_called_once_with(test.IsHttpRequest())
 
     def test_index_with_domain(self):
@@ -628,7 +628,7 @@ class UsersViewTests(test.BaseAdminViewTests):
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
                                        'user_update_enabled',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_enable_user(self):
         domain = self._get_default_domain()
@@ -639,7 +639,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         user.enabled = False
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_user_update_enabled.return_value = user
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
@@ -650,15 +650,16 @@ class UsersViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_user_list.assert_called_once_with(
-            test.IsHttpRequest(), domain=domain_id, filters=filters)
+        self.mock_user_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.mock_user_update_enabled.assert_called_once_with(
             test.IsHttpRequest(), user.id, True)
         self.mock_domain_lookup.assert_called_once_with(test.IsHttpRequest())
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
                                        'user_update_enabled',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_disable_user(self):
         domain = self._get_default_domain()
@@ -670,7 +671,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         self.assertTrue(user.enabled)
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_user_update_enabled.return_value = user
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
@@ -681,15 +682,16 @@ class UsersViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_user_list.assert_called_once_with(
-            test.IsHttpRequest(), domain=domain_id, filters=filters)
+        self.mock_user_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.mock_user_update_enabled.assert_called_once_with(
             test.IsHttpRequest(), user.id, False)
         self.mock_domain_lookup.assert_called_once_with(test.IsHttpRequest())
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
                                        'user_update_enabled',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_enable_disable_user_exception(self):
         domain = self._get_default_domain()
@@ -700,7 +702,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         user.enabled = False
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_user_update_enabled.side_effect = self.exceptions.keystone
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
@@ -711,14 +713,15 @@ class UsersViewTests(test.BaseAdminViewTests):
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
-        self.mock_user_list.assert_called_once_with(
-            test.IsHttpRequest(), domain=domain_id, filters=filters)
+        self.mock_user_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain_id, filters=filters,
+            marker=None)
         self.mock_user_update_enabled.assert_called_once_with(
             test.IsHttpRequest(), user.id, True)
         self.mock_domain_lookup.assert_called_once_with(test.IsHttpRequest())
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_disabling_current_user(self):
         domain = self._get_default_domain()
@@ -727,7 +730,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         users = self._get_users(domain_id)
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
         formData = {'action': 'users__toggle__%s' % self.request.user.id}
@@ -741,14 +744,15 @@ class UsersViewTests(test.BaseAdminViewTests):
             self.mock_get_effective_domain_id, 2,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_user_list, 2,
-            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters))
+            self.mock_user_list_paged, 2,
+            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters,
+                      marker=None))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_domain_lookup, 2,
             mock.call(test.IsHttpRequest()))
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_disabling_current_user_domain_name(self):
         domain = self._get_default_domain()
@@ -762,7 +766,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         for u in users:
             u.domain_name = domain_lookup.get(u.domain_id)
         self.mock_domain_lookup.return_value = domain_lookup
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
 
         formData = {'action': 'users__toggle__%s' % self.request.user.id}
         res = self.client.post(USERS_INDEX_URL, formData, follow=True)
@@ -778,11 +782,12 @@ class UsersViewTests(test.BaseAdminViewTests):
             self.mock_domain_lookup, 2,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_user_list, 2,
-            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters))
+            self.mock_user_list_paged, 2,
+            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters,
+                      marker=None))
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_delete_user_with_improper_permissions(self):
         domain = self._get_default_domain()
@@ -791,7 +796,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         users = self._get_users(domain_id)
 
         self.mock_get_effective_domain_id.return_value = None
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_domain_lookup.return_value = {domain.id: domain.name}
 
         formData = {'action': 'users__delete__%s' % self.request.user.id}
@@ -805,14 +810,15 @@ class UsersViewTests(test.BaseAdminViewTests):
             self.mock_get_effective_domain_id, 2,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_user_list, 2,
-            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters))
+            self.mock_user_list_paged, 2,
+            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters,
+                      marker=None))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_domain_lookup, 2,
             mock.call(test.IsHttpRequest()))
 
     @test.create_mocks({api.keystone: ('get_effective_domain_id',
-                                       'user_list',
+                                       'user_list_paged',
                                        'domain_lookup')})
     def test_delete_user_with_improper_permissions_domain_name(self):
         domain = self._get_default_domain()
@@ -825,7 +831,7 @@ class UsersViewTests(test.BaseAdminViewTests):
         self.mock_get_effective_domain_id.return_value = None
         for u in users:
             u.domain_name = domain_lookup.get(u.domain_id)
-        self.mock_user_list.return_value = users
+        self.mock_user_list_paged.return_value = (users, False)
         self.mock_domain_lookup.return_value = domain_lookup
 
         formData = {'action': 'users__delete__%s' % self.request.user.id}
@@ -839,8 +845,9 @@ class UsersViewTests(test.BaseAdminViewTests):
             self.mock_get_effective_domain_id, 2,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_user_list, 2,
-            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters))
+            self.mock_user_list_paged, 2,
+            mock.call(test.IsHttpRequest(), domain=domain_id, filters=filters,
+                      marker=None))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_domain_lookup, 2,
             mock.call(test.IsHttpRequest()))
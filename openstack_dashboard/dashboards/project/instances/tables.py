@@ -43,6 +43,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.views import get_url_with_pagination
 
 LOG = logging.getLogger(__name__)
@@ -777,6 +778,13 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    # Whether the instances may belong to other projects. They are then
+    # always retrieved one by one, as listing them would list the servers
+    # of all the projects.
+    all_tenants = False
+    # The largest number of instances retrieved one by one, in parallel,
+    # rather than picked from the list of the servers of the project.
+    bulk_get_max = 10
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
@@ -800,6 +808,71 @@ class UpdateRow(tables.Row):
             messages.error(request, error)
         return instance
 
+    def _get_servers(self, request, instance_ids):
+        def _server_get(instance_id):
+            try:
+                return api.nova.server_get(request, instance_id)
+            except Exception:
+                return self.handle_data_error(request)
+
+        instance_ids = list(instance_ids)
+        servers = futurist_utils.call_functions_parallel(
+            *[(_server_get, [instance_id]) for instance_id in instance_ids])
+        return dict(zip(instance_ids, servers))
+
+    def get_data_bulk(self, request, instance_ids):
+        wanted = set(instance_ids)
+        if self.all_tenants or len(wanted) <= self.bulk_get_max:
+            data = self._get_servers(request, wanted)
+        else:
+            # Nova only lets admins filter servers by id, so the servers of
+            # the project are listed and the requested ones picked from the
+            # list.
+            try:
+                servers = api.nova.server_list(request)[0]
+            except Exception:
+                return super(UpdateRow, self).get_data_bulk(request,
+                                                            instance_ids)
+            data = dict((server.id, server) for server in servers
+                        if server.id in wanted)
+            # The servers missing from the list were deleted, or the list
+            # was truncated to API_RESULT_LIMIT servers.
+            data.update(self._get_servers(request,
+                                          wanted.difference(data)))
+        instances = [instance for instance in data.values()
+                     if not isinstance(instance, type)]
+
+        try:
+            flavors = dict((flavor.id, flavor) for flavor
+                           in api.nova.flavor_list_cached(request))
+        except Exception:
+            flavors = {}
+        for instance in instances:
+            flavor_id = instance.flavor["id"]
+            try:
+                if flavor_id not in flavors:
+                    flavors[flavor_id] = api.nova.flavor_get(request,
+                                                             flavor_id)
+                instance.full_flavor = flavors[flavor_id]
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve flavor information '
+                                    'for instance "%s".') % instance.id,
+                                  ignore=True)
+        try:
+            api.network.servers_update_addresses(
+                request, instances, all_tenants=self.all_tenants)
+        except Exception:
+            exceptions.handle(request,
+                              _('Unable to retrieve Network information '
+                                'for instances.'),
+                              ignore=True)
+        for instance in instances:
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
+        return data
+
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "start"
@@ -30,6 +30,7 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.http import urlencode
 import mock
+from novaclient import exceptions as nova_exceptions
 import six
 
 from horizon import exceptions
@@ -5221,6 +5222,99 @@ class InstanceAjaxTests(helpers.TestCase, InstanceTestHelperMixin):
         self.mock_servers_update_addresses.assert_called_once_with(
             helpers.IsHttpRequest(), [server])
 
+    @helpers.create_mocks({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_list_cached",
+                                      "flavor_get",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update(self):
+        servers = self.servers.list()[:2]
+        deleted_id = 'deleted-server'
+        flavors = self.flavors.list()
+        servers_by_id = dict((server.id, server) for server in servers)
+
+        def _server_get(request, instance_id):
+            if instance_id not in servers_by_id:
+                raise nova_exceptions.NotFound(404)
+            return servers_by_id[instance_id]
+
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_get.side_effect = _server_get
+        self.mock_flavor_list_cached.return_value = flavors
+        self.mock_servers_update_addresses.return_value = None
+
+        params = [('action', 'rows_update'),
+                  ('table', 'instances')]
+        params.extend(('obj_id', obj_id) for obj_id
+                      in [server.id for server in servers] + [deleted_id])
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        content = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(set(server.id for server in servers),
+                         set(content['rows']))
+        for server in servers:
+            self.assertIn(server.name, content['rows'][server.id])
+        self.assertEqual({deleted_id: 404}, content['errors'])
+
+        # A few instances are retrieved one by one.
+        self.mock_server_list.assert_not_called()
+        self.assertItemsEqual(
+            [mock.call(helpers.IsHttpRequest(), instance_id)
+             for instance_id in list(servers_by_id) + [deleted_id]],
+            self.mock_server_get.call_args_list)
+        self.mock_flavor_list_cached.assert_called_once_with(
+            helpers.IsHttpRequest())
+        self.mock_flavor_get.assert_not_called()
+        self.mock_servers_update_addresses.assert_called_once_with(
+            helpers.IsHttpRequest(), mock.ANY, all_tenants=False)
+        self.assertEqual(
+            set(server.id for server in servers),
+            set(server.id for server
+                in self.mock_servers_update_addresses.call_args[0][1]))
+
+    @helpers.create_mocks({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_list_cached",
+                                      "extension_supported",
+                                      "is_feature_available"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update_listed(self):
+        servers = self.servers.list()[:2]
+        deleted_id = 'deleted-server'
+
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_server_get.side_effect = nova_exceptions.NotFound(404)
+        self.mock_flavor_list_cached.return_value = self.flavors.list()
+        self.mock_servers_update_addresses.return_value = None
+
+        params = [('action', 'rows_update'),
+                  ('table', 'instances')]
+        params.extend(('obj_id', obj_id) for obj_id
+                      in [server.id for server in servers] + [deleted_id])
+        with mock.patch.object(tables.UpdateRow, 'bulk_get_max', 1):
+            res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                                  HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        content = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(set(server.id for server in servers),
+                         set(content['rows']))
+        self.assertEqual({deleted_id: 404}, content['errors'])
+
+        # The servers of the project are listed, and only the servers
+        # missing from the list are retrieved one by one.
+        self.mock_server_list.assert_called_once_with(
+            helpers.IsHttpRequest())
+        self.mock_server_get.assert_called_once_with(helpers.IsHttpRequest(),
+                                                     deleted_id)
+        self.mock_servers_update_addresses.assert_called_once_with(
+            helpers.IsHttpRequest(), mock.ANY, all_tenants=False)
+
 
 class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
 
@@ -69,7 +69,7 @@ class IndexView(tables.DataTableView):
     def _get_flavors(self):
         # Gather our flavors to correlate our instances to them
         try:
-            flavors = api.nova.flavor_list(self.request)
+            flavors = api.nova.flavor_list_cached(self.request)
             return dict([(str(flavor.id), flavor) for flavor in flavors])
         except Exception:
             exceptions.handle(self.request, ignore=True)
@@ -79,7 +79,7 @@ class IndexView(tables.DataTableView):
         # Gather our images to correlate our instances to them
         try:
             # TODO(gabriel): Handle pagination.
-            images = api.glance.image_list_detailed(self.request)[0]
+            images = api.glance.image_list_cached(self.request)
             return dict([(str(image.id), image) for image in images])
         except Exception:
             exceptions.handle(self.request, ignore=True)
@@ -101,13 +101,11 @@ class IndexView(tables.DataTableView):
         if not instances:
             return []
 
-        # TODO(future): Explore more efficient logic to sync IP address
-        # and drop the setting OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES.
         # The situation servers_update_addresses() is needed is only
         # when IP address of a server is updated via neutron API and
-        # nova network info cache is not synced. Precisely there is no
-        # need to check IP addresses of all servers. It is sufficient to
-        # fetch IP address information for servers recently updated.
+        # nova network info cache is not synced. servers_update_addresses()
+        # caches the addresses it retrieves, so only the servers updated
+        # since the last call are looked up in neutron.
         if not getattr(settings,
                        'OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES', True):
             return instances
@@ -30,7 +30,7 @@ INDEX_URL = reverse('horizon:project:network_topology:index')
 class NetworkTopologyTests(test.TestCase):
     trans = views.TranslationHelper()
 
-    @test.create_mocks({api.nova: ('server_list',),
+    @test.create_mocks({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'network_list',
                                       'router_list',
@@ -40,14 +40,14 @@ class NetworkTopologyTests(test.TestCase):
 
     @django.test.utils.override_settings(
         OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
-    @test.create_mocks({api.nova: ('server_list',),
+    @test.create_mocks({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'port_list')})
     def test_json_view_router_disabled(self):
         self._test_json_view(router_enable=False)
 
     @django.test.utils.override_settings(CONSOLE_TYPE=None)
-    @test.create_mocks({api.nova: ('server_list',),
+    @test.create_mocks({api.nova: ('server_iter',),
                         api.neutron: ('network_list_for_tenant',
                                       'network_list',
                                       'router_list',
@@ -56,7 +56,7 @@ class NetworkTopologyTests(test.TestCase):
         self._test_json_view(with_console=False)
 
     def _test_json_view(self, router_enable=True, with_console=True):
-        self.mock_server_list.return_value = [self.servers.list(), False]
+        self.mock_server_iter.return_value = self.servers.list()
 
         tenant_networks = [net for net in self.networks.list()
                            if not net['router:external']]
@@ -170,7 +170,7 @@ class NetworkTopologyTests(test.TestCase):
                  'fixed_ips': []})
         self.assertEqual(expect_port_urls, data['ports'])
 
-        self.mock_server_list.assert_called_once_with(
+        self.mock_server_iter.assert_called_once_with(
             test.IsHttpRequest())
         self.mock_network_list_for_tenant.assert_called_once_with(
             test.IsHttpRequest(), self.tenant.id,
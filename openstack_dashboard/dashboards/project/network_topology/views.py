@@ -235,7 +235,7 @@ class JSONView(View):
     def _get_servers(self, request):
         # Get nova data
         try:
-            servers, more = api.nova.server_list(request)
+            servers = list(api.nova.server_iter(request))
         except Exception:
             servers = []
         data = []
@@ -180,6 +180,12 @@ class UsageViewTests(test.TestCase):
                               "?format=csv")
         self.assertTemplateUsed(res, 'project/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.ProjectUsage)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertIn('Instance Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours),'
+                      'Time since created (Seconds),State\r\n', content)
+        if nova_stu_enabled:
+            for instance in res.context['usage'].get_instances():
+                self.assertIn('\r\n%s,' % instance['name'], content)
         self._check_api_calls(nova_stu_enabled,
                               overview_days_range=overview_days_range)
 
@@ -33,6 +33,7 @@ from horizon import tables
 from openstack_dashboard import api
 from openstack_dashboard.api import cinder
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 
 DELETABLE_STATES = ("available", "error", "error_extending")
 
@@ -338,6 +339,13 @@ class DeleteTransfer(VolumePolicyTargetMixin, tables.Action):
 
 class UpdateRow(tables.Row):
     ajax = True
+    # Whether the volumes may belong to other projects. They are then always
+    # retrieved one by one, as listing them would list the volumes of all
+    # the projects.
+    all_tenants = False
+    # The largest number of volumes retrieved one by one, in parallel,
+    # rather than picked from the list of the volumes of the project.
+    bulk_get_max = 10
 
     def get_data(self, request, volume_id):
         volume = cinder.volume_get(request, volume_id)
@@ -351,6 +359,49 @@ class UpdateRow(tables.Row):
             volume.group = None
         return volume
 
+    def _get_volumes(self, request, volume_ids):
+        def _volume_get(volume_id):
+            try:
+                return cinder.volume_get(request, volume_id)
+            except Exception:
+                return self.handle_data_error(request)
+
+        volume_ids = list(volume_ids)
+        volumes = futurist_utils.call_functions_parallel(
+            *[(_volume_get, [volume_id]) for volume_id in volume_ids])
+        return dict(zip(volume_ids, volumes))
+
+    def get_data_bulk(self, request, volume_ids):
+        wanted = set(volume_ids)
+        if self.all_tenants or len(wanted) <= self.bulk_get_max:
+            data = self._get_volumes(request, wanted)
+        else:
+            # The volumes of the project are listed and the requested ones
+            # picked from the list, as Cinder does not filter volumes by id.
+            try:
+                volumes = cinder.volume_list(request)
+            except Exception:
+                return super(UpdateRow, self).get_data_bulk(request,
+                                                            volume_ids)
+            data = dict((volume.id, volume) for volume in volumes
+                        if volume.id in wanted)
+            # The volumes missing from the list were deleted.
+            data.update(self._get_volumes(request, wanted.difference(data)))
+
+        groups = {}
+        for volume in data.values():
+            if isinstance(volume, type):
+                continue
+            group_id = getattr(volume, 'group_id', None)
+            if group_id and group_id not in groups:
+                try:
+                    groups[group_id] = cinder.group_get(request, group_id)
+                except Exception:
+                    exceptions.handle(request, _("Unable to retrieve group."))
+                    groups[group_id] = None
+            volume.group = groups.get(group_id)
+        return data
+
 
 def get_size(volume):
     return _("%sGiB") % volume.size
@@ -13,7 +13,9 @@
 #    under the License.
 
 import copy
+import json
 
+from cinderclient import exceptions as cinder_exceptions
 import mock
 import six
 
@@ -1142,6 +1144,83 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         self.assertNotContains(res, 'Delete Volume')
         self.assertNotContains(res, 'delete')
 
+    @mock.patch.object(cinder, 'tenant_absolute_limits')
+    @mock.patch.object(cinder, 'group_get')
+    @mock.patch.object(cinder, 'volume_get')
+    @mock.patch.object(cinder, 'volume_list')
+    def test_rows_update(self, mock_list, mock_get, mock_group_get,
+                         mock_limits):
+        volumes = [api.cinder.Volume(volume) for volume
+                   in self.cinder_group_volumes.list()]
+        group = self.cinder_groups.first()
+        deleted_id = 'deleted-volume'
+
+        volumes_by_id = dict((volume.id, volume) for volume in volumes)
+
+        def _volume_get(request, volume_id):
+            if volume_id not in volumes_by_id:
+                raise cinder_exceptions.NotFound(404)
+            return volumes_by_id[volume_id]
+
+        mock_get.side_effect = _volume_get
+        mock_group_get.return_value = group
+        mock_limits.return_value = self.cinder_limits['absolute']
+
+        params = [('action', 'rows_update'), ('table', 'volumes')]
+        params.extend(('obj_id', obj_id) for obj_id
+                      in [volume.id for volume in volumes] + [deleted_id])
+        res = self.client.get(INDEX_URL, params,
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(res.status_code, 200)
+        content = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(set(volume.id for volume in volumes),
+                         set(content['rows']))
+        for volume in volumes:
+            self.assertIn(volume.name, content['rows'][volume.id])
+            self.assertIn(group.name, content['rows'][volume.id])
+        self.assertEqual({deleted_id: 404}, content['errors'])
+        # A few volumes are retrieved one by one.
+        mock_list.assert_not_called()
+        self.assertItemsEqual(
+            [mock.call(test.IsHttpRequest(), volume_id)
+             for volume_id in list(volumes_by_id) + [deleted_id]],
+            mock_get.call_args_list)
+        # The group of the volumes is retrieved once.
+        mock_group_get.assert_called_once_with(test.IsHttpRequest(),
+                                               group.id)
+
+    @mock.patch.object(cinder, 'tenant_absolute_limits')
+    @mock.patch.object(cinder, 'group_get')
+    @mock.patch.object(cinder, 'volume_get')
+    @mock.patch.object(cinder, 'volume_list')
+    def test_rows_update_listed(self, mock_list, mock_get, mock_group_get,
+                                mock_limits):
+        volumes = [api.cinder.Volume(volume) for volume
+                   in self.cinder_group_volumes.list()]
+        deleted_id = 'deleted-volume'
+
+        mock_list.return_value = volumes
+        mock_get.side_effect = cinder_exceptions.NotFound(404)
+        mock_group_get.return_value = self.cinder_groups.first()
+        mock_limits.return_value = self.cinder_limits['absolute']
+
+        params = [('action', 'rows_update'), ('table', 'volumes')]
+        params.extend(('obj_id', obj_id) for obj_id
+                      in [volume.id for volume in volumes] + [deleted_id])
+        with mock.patch.object(volume_tables.UpdateRow, 'bulk_get_max', 0):
+            res = self.client.get(INDEX_URL, params,
+                                  HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        content = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(set(volume.id for volume in volumes),
+                         set(content['rows']))
+        self.assertEqual({deleted_id: 404}, content['errors'])
+        # The volumes of the project are listed, and only the volumes
+        # missing from the list are retrieved one by one.
+        mock_list.assert_called_once_with(test.IsHttpRequest())
+        mock_get.assert_called_once_with(test.IsHttpRequest(), deleted_id)
+
     @mock.patch.object(api.nova, 'server_list')
     @mock.patch.object(cinder, 'volume_get')
     @override_settings(OPENSTACK_HYPERVISOR_FEATURES={'can_set_mount_point':
@@ -218,10 +218,55 @@ SESSION_COOKIE_MAX_SIZE = 4093
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.PickleSerializer'
 
 # MEMOIZED_MAX_SIZE_DEFAULT allows setting a global default to help control
-# memory usage when caching. It should at least be 2 x the number of threads
-# with a little bit of extra buffer.
+# memory usage when caching. It applies per request to functions taking the
+# request as their first argument. For other functions, it should at least be
+# 2 x the number of threads with a little bit of extra buffer.
 MEMOIZED_MAX_SIZE_DEFAULT = 25
 
+# Service API clients are shared across requests made with the same token,
+# project and endpoint so that their HTTP connections are reused.
+# API_CLIENT_POOL_MAX_SIZE bounds the number of pooled clients and
+# API_CLIENT_POOL_TTL (in seconds) the time a client is kept in the pool.
+# Clients never outlive the token they were created with.
+API_CLIENT_POOL_ENABLED = True
+API_CLIENT_POOL_MAX_SIZE = 100
+API_CLIENT_POOL_TTL = 300
+
+# API calls made in parallel by views share a process-wide thread pool of
+# PARALLEL_EXECUTOR_MAX_WORKERS threads. Once PARALLEL_EXECUTOR_MAX_BACKLOG
+# calls are waiting for a thread, new calls run in the request thread.
+# PARALLEL_CALL_MAX_WORKERS limits the fan-out of a single request.
+PARALLEL_EXECUTOR_MAX_WORKERS = 10
+PARALLEL_EXECUTOR_MAX_BACKLOG = 100
+PARALLEL_CALL_MAX_WORKERS = 5
+
+# Flavors and images used to decorate instance tables are kept in the
+# Django cache for RESOURCE_CATALOG_CACHE_TIMEOUT seconds (0 disables it).
+# Image catalogs are revalidated against Glance after
+# RESOURCE_CATALOG_CACHE_REVALIDATE_INTERVAL seconds.
+RESOURCE_CATALOG_CACHE_TIMEOUT = 300
+RESOURCE_CATALOG_CACHE_REVALIDATE_INTERVAL = 30
+
+# Quotas and usages of each service are shared by the requests of a project
+# for QUOTA_USAGES_CACHE_TIMEOUT seconds (0 disables it), so that pages
+# loaded in a row do not retrieve them again.
+QUOTA_USAGES_CACHE_TIMEOUT = 10
+
+# The dashboards and panels a user can access are kept in the Django cache
+# for NAV_ACCESS_CACHE_TIMEOUT seconds (0 disables it), and shared by users
+# with the same roles, project, domain and services.
+NAV_ACCESS_CACHE_TIMEOUT = 300
+
+# The projects a user can access are kept in the Django cache for
+# PROJECT_LIST_CACHE_TIMEOUT seconds (0 disables it), so that the project
+# picker does not list them on each page.
+PROJECT_LIST_CACHE_TIMEOUT = 300
+
+# The usage of instances of the days and months which are over is kept in
+# the Django cache for NOVA_USAGE_CACHE_TIMEOUT seconds (0 disables it), so
+# that the overview panels mostly retrieve the usage of the current day.
+NOVA_USAGE_CACHE_TIMEOUT = 86400
+
 CSRF_FAILURE_VIEW = 'openstack_dashboard.views.csrf_failure'
 
 LANGUAGES = (
@@ -342,6 +387,11 @@ THEME_COOKIE_NAME = 'theme'
 
 POLICY_CHECK_FUNCTION = 'openstack_auth.policy.check'
 
+# The decisions of openstack_auth.policy.check are cached per process, keyed
+# on the credentials and the target fields the rules read. This bounds the
+# number of cached decisions, 0 disables the cache.
+POLICY_DECISION_CACHE_SIZE = 10000
+
 CSRF_COOKIE_AGE = None
 
 COMPRESS_OFFLINE_CONTEXT = 'horizon.themes.offline_context'
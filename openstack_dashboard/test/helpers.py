@@ -24,6 +24,7 @@ import traceback
 
 from django.conf import settings
 from django.contrib.messages.storage import default_storage
+from django.core.cache import cache
 from django.core.handlers import wsgi
 from django.test.client import RequestFactory
 from django.test import tag
@@ -41,6 +42,7 @@ from horizon import base
 from horizon import conf
 from horizon.test import helpers as horizon_helpers
 from openstack_dashboard import api
+from openstack_dashboard.api import client_pool
 from openstack_dashboard import context_processors
 from openstack_dashboard.test.test_data import utils as test_utils
 
@@ -203,6 +205,13 @@ class TestCase(horizon_helpers.TestCase):
 
         self.patchers = _apply_panel_mocks()
 
+        # API clients are shared across requests with the same token,
+        # which is the same in every test.
+        client_pool.pool.clear()
+        # The catalog cache lives in the local memory cache, which culls
+        # entries once full; start every test with an empty one.
+        cache.clear()
+
         super(TestCase, self).setUp()
 
     def _setup_test_data(self):
@@ -266,6 +266,15 @@ REST_API_ADDITIONAL_SETTINGS = ['REST_API_SETTING_2']
 
 ALLOWED_PRIVATE_SUBNET_CIDR = {'ipv4': [], 'ipv6': []}
 
+# The cache is shared by all tests, so catalogs listed by a test would be
+# used by the next ones. Tests of the catalog cache enable it explicitly.
+RESOURCE_CATALOG_CACHE_TIMEOUT = 0
+OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT = 0
+QUOTA_USAGES_CACHE_TIMEOUT = 0
+NAV_ACCESS_CACHE_TIMEOUT = 0
+PROJECT_LIST_CACHE_TIMEOUT = 0
+NOVA_USAGE_CACHE_TIMEOUT = 0
+
 
 # --------------------
 # Test-only settings
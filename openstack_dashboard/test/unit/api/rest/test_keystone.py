@@ -97,6 +97,31 @@ class KeystoneRestTestCase(test.TestCase):
                                                     group=None,
                                                     filters=filters)
 
+    @test.create_mocks({api.keystone: ['user_search']})
+    def test_user_search(self):
+        request = self.mock_rest_request(**{
+            'session.get': mock.Mock(return_value='the_domain'),
+            'GET': {'q': 'Ni', 'limit': '5'},
+        })
+        self.mock_user_search.return_value = [
+            mock.Mock(**{'to_dict.return_value': {'name': 'Ni!'}}),
+        ]
+        response = keystone.UserSearch().get(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual(response.json, {"items": [{"name": "Ni!"}]})
+        self.mock_user_search.assert_called_once_with(
+            request, 'Ni', domain='the_domain', limit=5)
+
+    @test.create_mocks({api.keystone: ['user_search']})
+    def test_user_search_invalid_limit(self):
+        request = self.mock_rest_request(**{
+            'session.get': mock.Mock(return_value='the_domain'),
+            'GET': {'q': 'Ni', 'limit': 'many'},
+        })
+        response = keystone.UserSearch().get(request)
+        self.assertStatusCode(response, 400)
+        self.mock_user_search.assert_not_called()
+
     def test_user_create_full(self):
         self._test_user_create(
             '{"name": "bob", '
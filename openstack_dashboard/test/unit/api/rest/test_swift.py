@@ -13,6 +13,8 @@
 # limitations under the License.
 import mock
 
+from horizon import exceptions
+
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import swift
 from openstack_dashboard.test import helpers as test
@@ -197,6 +199,55 @@ class SwiftRestTestCase(test.TestCase):
         self.mock_swift_upload_object.assert_called_once_with(
             request, 'spam', u'test_object%\u6346', _file)
 
+    @test.create_mocks({api.swift: ['swift_upload_object_stream']})
+    def test_object_create_stream(self):
+        request = self.mock_rest_request(
+            META={'CONTENT_TYPE': 'application/octet-stream',
+                  'CONTENT_LENGTH': '10'},
+            GET={'upload_id': 'upload', 'offset': '8',
+                 'filename': 'file.txt'})
+        self.mock_swift_upload_object_stream.return_value = \
+            self.objects.first()
+        response = swift.Object().post(request, 'spam', 'test_object')
+        self.assertStatusCode(response, 201)
+        self.mock_swift_upload_object_stream.assert_called_once_with(
+            request, 'spam', 'test_object', request, 10, offset=8,
+            upload_id='upload', orig_filename='file.txt')
+
+    @test.create_mocks({api.swift: ['swift_upload_object_stream']})
+    def test_object_create_stream_without_upload_id(self):
+        request = self.mock_rest_request(
+            META={'CONTENT_TYPE': 'application/octet-stream',
+                  'CONTENT_LENGTH': '10'}, GET={})
+        self.mock_swift_upload_object_stream.side_effect = \
+            exceptions.BadRequest('An upload_id is required')
+        response = swift.Object().post(request, 'spam', 'test_object')
+        self.assertStatusCode(response, 400)
+        self.mock_swift_upload_object_stream.assert_called_once_with(
+            request, 'spam', 'test_object', request, 10, offset=0,
+            upload_id=None, orig_filename=None)
+
+    @test.create_mocks({api.swift: ['swift_upload_object_stream']})
+    def test_object_create_stream_without_length(self):
+        request = self.mock_rest_request(
+            META={'CONTENT_TYPE': 'application/octet-stream'}, GET={})
+        response = swift.Object().post(request, 'spam', 'test_object')
+        self.assertStatusCode(response, 411)
+        self.mock_swift_upload_object_stream.assert_not_called()
+
+    @test.create_mocks({api.swift: ['swift_get_upload_status']})
+    def test_object_upload_status(self):
+        request = self.mock_rest_request()
+        status = {'upload_id': 'upload', 'segment_size': 4, 'segments': 1,
+                  'offset': 4}
+        self.mock_swift_get_upload_status.return_value = status
+        response = swift.ObjectUpload().get(request, 'spam', 'upload',
+                                            'test_object')
+        self.assertStatusCode(response, 200)
+        self.assertEqual(status, response.json)
+        self.mock_swift_get_upload_status.assert_called_once_with(
+            request, 'spam', 'test_object', 'upload')
+
     @test.create_mocks({api.swift: ['swift_create_pseudo_folder'],
                         swift: ['UploadObjectForm']})
     def test_folder_create(self):
@@ -19,6 +19,11 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django.test.utils import override_settings
+import mock
+
+from openstack_auth import user as auth_user
+from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
 
@@ -132,6 +137,78 @@ class APIResourceWrapperTests(test.TestCase):
         self.assertNotIn('baz', resource_str)
 
 
+class CompactWrapperTests(test.TestCase):
+
+    class PropertyResource(APIResource):
+        _attrs = ['foo', 'bar', 'baz', 'OS-EXT:qux']
+
+        def __init__(self, apiresource, request):
+            super(CompactWrapperTests.PropertyResource, self).__init__(
+                apiresource)
+            self.request = request
+
+        @property
+        def bar(self):
+            return self._apiresource.bar.upper()
+
+    def _get_inner_object(self):
+        class InnerAPIResource(object):
+            pass
+
+        inner = InnerAPIResource()
+        inner.foo = 'foo'
+        inner.bar = 'bar'
+        inner.hidden = 'hidden'
+        setattr(inner, 'OS-EXT:qux', 'qux')
+        return inner
+
+    def test_attributes(self):
+        compact_class = api_base.compact_wrapper(self.PropertyResource,
+                                                 slots=('request',))
+        resource = compact_class(self._get_inner_object(), 'request')
+
+        self.assertIsInstance(resource, self.PropertyResource)
+        self.assertEqual(('_apiresource', 'foo', 'baz', 'request'),
+                         compact_class.__slots__)
+        self.assertEqual('foo', resource.foo)
+        self.assertEqual('BAR', resource.bar)
+        self.assertEqual('qux', getattr(resource, 'OS-EXT:qux'))
+        self.assertEqual('request', resource.request)
+        with self.assertRaises(AttributeError):
+            resource.baz
+        with self.assertRaises(AttributeError):
+            resource.missing
+        self.assertEqual({'foo': 'foo', 'bar': 'BAR', 'baz': None,
+                          'OS-EXT:qux': 'qux'}, resource.to_dict())
+
+    def test_resource_not_kept(self):
+        compact_class = api_base.compact_wrapper(self.PropertyResource)
+        inner = self._get_inner_object()
+        resource = compact_class(inner, 'request')
+
+        self.assertIsInstance(resource._apiresource, api_base.ResourceRecord)
+        with self.assertRaises(AttributeError):
+            resource._apiresource.hidden
+
+    def test_fallback(self):
+        compact_class = api_base.compact_wrapper(self.PropertyResource,
+                                                 fallback=True)
+        inner = self._get_inner_object()
+        resource = compact_class(inner, 'request')
+
+        self.assertIs(inner, resource._apiresource)
+        self.assertEqual('BAR', resource.bar)
+
+    def test_class_is_reused(self):
+        self.assertIs(api_base.compact_wrapper(APIResource),
+                      api_base.compact_wrapper(APIResource))
+        self.assertIsNot(api_base.compact_wrapper(APIResource),
+                         api_base.compact_wrapper(APIResource, fallback=True))
+
+    def test_not_a_resource_wrapper(self):
+        self.assertRaises(TypeError, api_base.compact_wrapper, APIDict)
+
+
 class APIDictWrapperTests(test.TestCase):
 
     # APIDict allows for both attribute access and dictionary style [element]
@@ -292,6 +369,68 @@ class ApiHelperTests(test.TestCase):
             url = api_base.url_for(self.request, 'image')
 
 
+class ServiceCatalogIndexTests(test.TestCase):
+
+    def _get_user(self, catalog=None, region='RegionOne'):
+        return auth_user.User(id='1', token=self.token,
+                              service_catalog=catalog or self.service_catalog,
+                              services_region=region)
+
+    def test_lookups_match_catalog_scan(self):
+        index = auth_utils.ServiceCatalogIndex(self.service_catalog)
+        service_types = [service['type'] for service in self.service_catalog]
+        for service_type in service_types + ['notAnApi']:
+            service = api_base.get_service_from_catalog(self.service_catalog,
+                                                        service_type)
+            for region in ('RegionOne', 'RegionTwo', 'bogus_value'):
+                self.assertEqual(
+                    bool(service) and any(
+                        service_type == 'identity' or
+                        auth_utils.get_endpoint_region(endpoint) == region
+                        for endpoint in service['endpoints']),
+                    index.is_service_enabled(service_type, region))
+                for endpoint_type in ('publicURL', 'internalURL',
+                                      'adminURL'):
+                    expected = (api_base.get_url_for_service(
+                        service, region, endpoint_type) if service else None)
+                    self.assertEqual(expected, index.url_for(
+                        service_type, region, (endpoint_type,)))
+
+    def test_url_for(self):
+        self.request.user = self._get_user()
+        self.assertEqual('http://int.cinder.example.com:8776/v3',
+                         api_base.url_for(self.request, 'volumev3',
+                                          endpoint_type='internalURL'))
+        self.request.user = self._get_user(region='RegionTwo')
+        self.assertEqual('http://public.nova2.example.com:8774/v2',
+                         api_base.url_for(self.request, 'compute'))
+        with self.assertRaises(exceptions.ServiceCatalogException):
+            api_base.url_for(self.request, 'image')
+
+    @override_settings(SECONDARY_ENDPOINT_TYPE='publicURL')
+    def test_url_for_fallback_endpoint_type(self):
+        catalog = [{'type': 'compute', 'name': 'nova', 'endpoints': [
+            {'region': 'RegionOne', 'interface': 'public',
+             'url': 'http://public.nova.example.com:8774/v2'}]}]
+        self.request.user = self._get_user(catalog)
+        self.assertEqual('http://public.nova.example.com:8774/v2',
+                         api_base.url_for(self.request, 'compute',
+                                          endpoint_type='adminURL'))
+
+    def test_index_shared_by_token(self):
+        user = self._get_user()
+        with mock.patch.object(auth_utils, 'ServiceCatalogIndex',
+                               wraps=auth_utils.ServiceCatalogIndex) as index:
+            other_user = self._get_user(catalog=list(self.service_catalog))
+            self.assertIs(user.service_catalog_index,
+                          other_user.service_catalog_index)
+            index.assert_not_called()
+
+    def test_available_services_regions(self):
+        self.assertEqual(['RegionOne', 'RegionTwo'],
+                         self._get_user().available_services_regions)
+
+
 class QuotaSetTests(test.TestCase):
 
     def test_quotaset_add_with_plus(self):
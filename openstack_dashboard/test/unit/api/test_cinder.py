@@ -29,6 +29,60 @@ class CinderApiTests(test.APIMockTestCase):
                               '_cinderclient_with_generic_groups').start()
         return p.return_value
 
+    @mock.patch.object(api.cinder, 'cinderclient')
+    def test_volume_names_get(self, mock_cinderclient):
+        volumes = [v._apiresource for v in self.cinder_volumes.list()]
+        cinderclient = mock_cinderclient.return_value
+        cinderclient.volumes.list.return_value = volumes[:2]
+        volumes_by_id = dict((v.id, v) for v in volumes)
+        cinderclient.volumes.get.side_effect = volumes_by_id.get
+        volume_ids = [v.id for v in volumes]
+
+        names = api.cinder.volume_names_get(self.request, volume_ids)
+
+        self.assertEqual(dict((v.id, api.cinder.Volume(v).name)
+                              for v in volumes), names)
+        cinderclient.volumes.list.assert_called_once_with(detailed=False)
+        self.assertItemsEqual(
+            [mock.call(v.id) for v in volumes[2:]],
+            cinderclient.volumes.get.call_args_list)
+
+    @mock.patch.object(api.cinder, 'cinderclient')
+    def test_volume_names_get_few_volumes(self, mock_cinderclient):
+        volumes = [v._apiresource for v in self.cinder_volumes.list()]
+        volumes = volumes[:api.cinder.VOLUME_NAMES_MAX_GETS]
+        cinderclient = mock_cinderclient.return_value
+        volumes_by_id = dict((v.id, v) for v in volumes)
+        cinderclient.volumes.get.side_effect = volumes_by_id.get
+
+        names = api.cinder.volume_names_get(self.request, list(volumes_by_id))
+
+        self.assertEqual(dict((v.id, api.cinder.Volume(v).name)
+                              for v in volumes), names)
+        cinderclient.volumes.list.assert_not_called()
+        self.assertItemsEqual(
+            [mock.call(v.id) for v in volumes],
+            cinderclient.volumes.get.call_args_list)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.cinder, 'cinderclient')
+    def test_volume_names_get_cached(self, mock_cinderclient):
+        volumes = [v._apiresource for v in self.cinder_volumes.list()]
+        cinderclient = mock_cinderclient.return_value
+        cinderclient.volumes.list.return_value = volumes
+        volume_ids = [v.id for v in volumes]
+        api.cinder.catalog_cache.invalidate(
+            api.cinder.VOLUME_NAMES_NAMESPACE)
+
+        api.cinder.volume_names_get(self.request, volume_ids)
+        names = api.cinder.volume_names_get(self.request, volume_ids)
+        self.assertEqual(set(volume_ids), set(names))
+        self.assertEqual(1, cinderclient.volumes.list.call_count)
+
+        api.cinder.volume_update(self.request, volume_ids[0], 'new', '')
+        api.cinder.volume_names_get(self.request, volume_ids)
+        self.assertEqual(2, cinderclient.volumes.list.call_count)
+
     @test.create_mocks({
         api.cinder: [
             'cinderclient',
@@ -0,0 +1,109 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+from django.contrib.auth import signals as auth_signals
+from django.test.utils import override_settings
+from django.utils import timezone
+import mock
+
+from openstack_dashboard.api import client_pool
+from openstack_dashboard.test import helpers as test
+
+
+class ClientPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(ClientPoolTests, self).setUp()
+        self.factory_calls = []
+
+        @client_pool.pooled(lambda request: request.user.token.id)
+        def fake_client(request, version=None):
+            client = mock.Mock(version=version)
+            self.factory_calls.append(client)
+            return client
+
+        self.fake_client = fake_client
+
+    def _set_token_expiry(self, seconds):
+        self.request.user.token.expires = (
+            timezone.now() + datetime.timedelta(seconds=seconds))
+
+    def test_client_shared_across_requests(self):
+        self._set_token_expiry(3600)
+        client = self.fake_client(self.request)
+        other_request = self.factory.get('/')
+        other_request.user = self.request.user
+
+        self.assertIs(client, self.fake_client(other_request))
+        self.assertEqual(1, len(self.factory_calls))
+
+    def test_client_per_version(self):
+        self._set_token_expiry(3600)
+        client = self.fake_client(self.request)
+        client_v2 = self.fake_client(self.request, version='2.1')
+
+        self.assertIsNot(client, client_v2)
+        self.assertEqual('2.1', client_v2.version)
+        self.assertEqual(2, len(self.factory_calls))
+
+    def test_expired_token_not_pooled(self):
+        self._set_token_expiry(-10)
+        self.fake_client(self.request)
+        self.fake_client(self.request)
+
+        self.assertEqual(2, len(self.factory_calls))
+
+    @override_settings(API_CLIENT_POOL_TTL=0)
+    def test_zero_ttl_not_pooled(self):
+        self._set_token_expiry(3600)
+        self.fake_client(self.request)
+        self.fake_client(self.request)
+
+        self.assertEqual(2, len(self.factory_calls))
+
+    @override_settings(API_CLIENT_POOL_MAX_SIZE=2)
+    def test_lru_eviction(self):
+        self._set_token_expiry(3600)
+        first = self.fake_client(self.request, version='1')
+        self.fake_client(self.request, version='2')
+        # Touch the first client so the second one is evicted.
+        self.fake_client(self.request, version='1')
+        self.fake_client(self.request, version='3')
+
+        self.assertEqual(2, len(client_pool.pool))
+        self.assertIs(first, self.fake_client(self.request, version='1'))
+        self.fake_client(self.request, version='2')
+        self.assertEqual(4, len(self.factory_calls))
+
+    @override_settings(API_CLIENT_POOL_ENABLED=False)
+    def test_pool_disabled(self):
+        self._set_token_expiry(3600)
+        client = self.fake_client(self.request)
+        other_request = self.factory.get('/')
+        other_request.user = self.request.user
+
+        self.assertIs(client, self.fake_client(self.request))
+        self.assertIsNot(client, self.fake_client(other_request))
+        self.assertEqual(0, len(client_pool.pool))
+
+    def test_logout_evicts_token_clients(self):
+        self._set_token_expiry(3600)
+        self.fake_client(self.request)
+        self.assertEqual(1, len(client_pool.pool))
+
+        auth_signals.user_logged_out.send(sender=self.__class__,
+                                          request=self.request,
+                                          user=self.request.user)
+
+        self.assertEqual(0, len(client_pool.pool))
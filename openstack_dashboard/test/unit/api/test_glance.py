@@ -18,10 +18,12 @@
 
 from django.conf import settings
 from django.test.utils import override_settings
+from glanceclient import exc as glance_exc
 import mock
 
 from openstack_dashboard import api
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.test import helpers as test
 
 
@@ -446,3 +448,106 @@ class GlanceApiTests(test.APIMockTestCase):
         self.assertNotIn('properties', meta)
         self.assertEqual(meta['description'], form_data['description'])
         self.assertEqual(meta['architecture'], form_data['architecture'])
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_cached(self, mock_image_list_detailed):
+        images = self.imagesV2.list()
+        public_images = [i for i in images if i.visibility == 'public']
+        private_images = [i for i in images if i.visibility != 'public']
+        mock_image_list_detailed.side_effect = [
+            (public_images, False, False),
+            ([], False, False),
+            ([], False, False),
+            (private_images, False, False),
+        ]
+        catalog_cache.invalidate('images')
+
+        api.glance.image_list_cached(self.request)
+        cached_images = api.glance.image_list_cached(self.request)
+
+        self.assertEqual(sorted(i.id for i in images),
+                         sorted(i.id for i in cached_images))
+        cached_names = dict((i.id, i.name) for i in cached_images)
+        for image in images:
+            self.assertEqual(image.name, cached_names[image.id])
+        mock_image_list_detailed.assert_has_calls([
+            mock.call(self.request, filters={'visibility': 'public'}),
+            mock.call(self.request, filters={'visibility': 'community'}),
+            mock.call(self.request, filters={'visibility': 'shared'}),
+            mock.call(self.request, filters={'owner': self.tenant.id}),
+        ])
+        self.assertEqual(4, mock_image_list_detailed.call_count)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300,
+                       RESOURCE_CATALOG_CACHE_REVALIDATE_INTERVAL=0)
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_cached_revalidate(self, mock_image_list_detailed):
+        image = self.imagesV2.first()
+        updated_image = api.glance.Image(api.glance.CachedImageResource(
+            image._apiresource, name='renamed',
+            updated_at='2020-01-01T00:00:00Z'))
+        mock_image_list_detailed.side_effect = [
+            ([image], False, False),
+            ([], False, False),
+            ([], False, False),
+            ([], False, False),
+            ([updated_image], False, False),
+            ([], False, False),
+            ([], False, False),
+            ([], False, False),
+        ]
+        catalog_cache.invalidate('images')
+
+        api.glance.image_list_cached(self.request)
+        cached_images = api.glance.image_list_cached(self.request)
+
+        self.assertEqual(['renamed'], [i.name for i in cached_images])
+        mock_image_list_detailed.assert_any_call(
+            self.request,
+            filters={'visibility': 'public',
+                     'updated_at': 'gte:%s' % image.updated_at})
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_cached_without_community(self,
+                                                 mock_image_list_detailed):
+        images = self.imagesV2.list()
+
+        def image_list_detailed(request, filters):
+            if filters.get('visibility') == 'community':
+                raise glance_exc.HTTPBadRequest()
+            if filters.get('visibility') == 'public':
+                return images, False, False
+            return [], False, False
+
+        mock_image_list_detailed.side_effect = image_list_detailed
+        catalog_cache.invalidate('images')
+
+        cached_images = api.glance.image_list_cached(self.request)
+
+        self.assertEqual(sorted(i.id for i in images),
+                         sorted(i.id for i in cached_images))
+
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_cached_disabled(self, mock_image_list_detailed):
+        images = self.imagesV2.list()
+        mock_image_list_detailed.return_value = (images, False, False)
+
+        self.assertEqual(images, api.glance.image_list_cached(self.request))
+        mock_image_list_detailed.assert_called_once_with(self.request)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.glance, 'glanceclient')
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_cached_invalidated_by_delete(
+            self, mock_image_list_detailed, mock_glanceclient):
+        mock_image_list_detailed.return_value = (self.imagesV2.list(),
+                                                 False, False)
+        catalog_cache.invalidate('images')
+
+        api.glance.image_list_cached(self.request)
+        api.glance.image_delete(self.request, self.imagesV2.first().id)
+        api.glance.image_list_cached(self.request)
+
+        self.assertEqual(8, mock_image_list_detailed.call_count)
@@ -18,10 +18,17 @@
 
 from __future__ import absolute_import
 
+from django.test.utils import override_settings
+from keystoneclient import exceptions as keystone_exceptions
+from keystoneclient.v3 import domains as domains_v3
+from keystoneclient.v3 import roles as roles_v3
+from keystoneclient.v3 import groups as groups_v3
+from keystoneclient.v3 import users as users_v3
 import mock
 import six
 
 from openstack_dashboard import api
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.test import helpers as test
 
 
@@ -54,9 +61,73 @@ class RoleAPITests(test.APIMockTestCase):
                        group=None,
                        project=tenant.id,
                        user=self.user.id)
-             for role in self.roles]
+             for role in self.roles],
+            any_order=True
         )
 
+    def test_diff_project_roles(self):
+        current = {'1': ['1', '2'], '2': ['1'], '3': ['2']}
+        requested = {'1': ['2', '3'], '2': ['1'], '4': ['1']}
+
+        grants, revokes = api.keystone.diff_project_roles(current, requested)
+
+        self.assertEqual([('1', '3'), ('4', '1')], grants)
+        self.assertEqual([('1', '1'), ('3', '2')], revokes)
+
+    @mock.patch.object(api.keystone, 'remove_tenant_user_role')
+    @mock.patch.object(api.keystone, 'add_tenant_user_role')
+    def test_update_project_roles(self, mock_add, mock_remove):
+        error = self.exceptions.keystone
+
+        def add(request, project, user, role):
+            if user == '2':
+                raise error
+
+        mock_add.side_effect = add
+
+        result = api.keystone.update_project_roles(
+            self.request, '1', grants=[('1', '1'), ('2', '1'), ('2', '2')],
+            revokes=[('3', '1')])
+
+        self.assertEqual(1, result['granted'])
+        self.assertEqual(1, result['revoked'])
+        self.assertEqual([('grant', '2', '1', error),
+                          ('grant', '2', '2', error)], result['failed'])
+        mock_add.assert_has_calls([
+            mock.call(self.request, project='1', user=user, role=role)
+            for user, role in (('1', '1'), ('2', '1'), ('2', '2'))],
+            any_order=True)
+        mock_remove.assert_called_once_with(self.request, project='1',
+                                            user='3', role='1')
+
+    @mock.patch.object(api.keystone, 'remove_group_role')
+    @mock.patch.object(api.keystone, 'add_group_role')
+    def test_update_project_roles_group(self, mock_add, mock_remove):
+        result = api.keystone.update_project_roles(
+            self.request, '1', grants=[('1', '2')], revokes=[('2', '3')],
+            group=True)
+
+        self.assertEqual({'granted': 1, 'revoked': 1, 'failed': []}, result)
+        mock_add.assert_called_once_with(self.request, role='2', group='1',
+                                         project='1')
+        mock_remove.assert_called_once_with(self.request, role='3',
+                                            group='2', project='1')
+
+    @mock.patch.object(api.keystone.auth_utils, 'invalidate_project_list')
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_role_changes_invalidate_project_lists(self, mock_keystoneclient,
+                                                   mock_invalidate):
+        tenant = self.tenants.first()
+
+        api.keystone.add_tenant_user_role(self.request, project=tenant.id,
+                                          user=self.user, role=self.role.id)
+        mock_invalidate.assert_called_once_with(user_id=self.user.id)
+
+        mock_invalidate.reset_mock()
+        api.keystone.add_group_role(self.request, self.role.id, 'group',
+                                    project=tenant.id)
+        mock_invalidate.assert_called_once_with(user_id=None)
+
     @mock.patch.object(api.keystone, 'keystoneclient')
     def test_get_default_role(self, mock_keystoneclient):
         keystoneclient = mock_keystoneclient.return_value
@@ -70,6 +141,221 @@ class RoleAPITests(test.APIMockTestCase):
         role = api.keystone.get_default_role(self.request)
         keystoneclient.roles.list.assert_called_once_with()
 
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300,
+                       OPENSTACK_KEYSTONE_DEFAULT_ROLE='member')
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_get_default_role_cached(self, mock_keystoneclient):
+        catalog_cache.invalidate('roles')
+        manager = mock_keystoneclient.return_value.roles
+        manager.resource_class = roles_v3.Role
+        manager.list.return_value = [
+            roles_v3.Role(manager, {'id': '1', 'name': 'admin'}, loaded=True),
+            roles_v3.Role(manager, {'id': '2', 'name': 'member'},
+                          loaded=True)]
+
+        self.assertEqual('2', api.keystone.get_default_role(self.request).id)
+        self.assertEqual('2', api.keystone.get_default_role(self.request).id)
+        manager.list.assert_called_once_with()
+
+        # Deleting a role drops the cached roles and the default role.
+        manager.list.return_value = manager.list.return_value[:1]
+        api.keystone.role_delete(self.request, '2')
+        self.assertIsNone(api.keystone.get_default_role(self.request))
+        self.assertEqual(2, manager.list.call_count)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300,
+                       OPENSTACK_KEYSTONE_DEFAULT_ROLE='member')
+    @mock.patch.object(api.keystone.exceptions, 'handle')
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_get_default_role_list_error(self, mock_keystoneclient,
+                                         mock_handle):
+        catalog_cache.invalidate('roles')
+        manager = mock_keystoneclient.return_value.roles
+        manager.resource_class = roles_v3.Role
+        manager.list.return_value = [
+            roles_v3.Role(manager, {'id': '2', 'name': 'member'},
+                          loaded=True)]
+        self.assertEqual('2', api.keystone.get_default_role(self.request).id)
+
+        # A failure to list the roles keeps the role previously found.
+        catalog_cache.invalidate('roles')
+        manager.list.side_effect = self.exceptions.keystone
+        self.assertEqual('2', api.keystone.get_default_role(self.request).id)
+        self.assertEqual(2, manager.list.call_count)
+        mock_handle.assert_called_once_with(self.request)
+
+
+class DomainAPITests(test.APIMockTestCase):
+    def _mock_domains(self, mock_keystoneclient):
+        manager = mock_keystoneclient.return_value.domains
+        manager.resource_class = domains_v3.Domain
+        manager.list.return_value = [
+            domains_v3.Domain(manager, {'id': '1', 'name': 'Default'},
+                              loaded=True)]
+        manager.get.return_value = manager.list.return_value[0]
+        return manager
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_domain_list_cached(self, mock_keystoneclient):
+        catalog_cache.invalidate('domains')
+        manager = self._mock_domains(mock_keystoneclient)
+        stats = catalog_cache.get_stats()['domains']
+
+        for i in range(2):
+            domains = api.keystone.domain_list(self.request)
+            self.assertEqual(['Default'], [d.name for d in domains])
+        manager.list.assert_called_once_with()
+
+        api.keystone.domain_update(self.request, '1', name='Renamed')
+        api.keystone.domain_list(self.request)
+        self.assertEqual(2, manager.list.call_count)
+        self.assertEqual({'hits': stats['hits'] + 1,
+                          'misses': stats['misses'] + 2,
+                          'invalidations': stats['invalidations'] + 1},
+                         catalog_cache.get_stats()['domains'])
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_domain_get_cached(self, mock_keystoneclient):
+        catalog_cache.invalidate('domains')
+        manager = self._mock_domains(mock_keystoneclient)
+
+        for i in range(2):
+            domain = api.keystone.domain_get(self.request, '1')
+            self.assertEqual('Default', domain.name)
+        manager.get.assert_called_once_with('1')
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_domain_list_not_cached(self, mock_keystoneclient):
+        manager = self._mock_domains(mock_keystoneclient)
+
+        api.keystone.domain_list(self.request)
+        api.keystone.domain_list(self.request)
+
+        self.assertEqual(2, manager.list.call_count)
+
+
+class UserAPITests(test.APIMockTestCase):
+    def _mock_users(self, mock_keystoneclient, names):
+        manager = mock_keystoneclient.return_value.users
+        manager.resource_class = users_v3.User
+        manager.list.return_value = [
+            users_v3.User(manager, {'id': str(index), 'name': name},
+                          loaded=True)
+            for index, name in enumerate(names)]
+        return manager
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_list_paged(self, mock_keystoneclient):
+        manager = self._mock_users(mock_keystoneclient,
+                                   ['carol', 'Bob', 'alice'])
+
+        users, has_more = api.keystone.user_list_paged(self.request,
+                                                       domain='1')
+        self.assertEqual(['alice', 'Bob'], [user.name for user in users])
+        self.assertTrue(has_more)
+
+        users, has_more = api.keystone.user_list_paged(
+            self.request, domain='1', marker=users[-1].id)
+        self.assertEqual(['carol'], [user.name for user in users])
+        self.assertFalse(has_more)
+
+        # An unknown marker starts over at the first page.
+        users, has_more = api.keystone.user_list_paged(
+            self.request, domain='1', marker='unknown')
+        self.assertEqual(['alice', 'Bob'], [user.name for user in users])
+
+        manager.list.assert_called_with(project=None, domain='1',
+                                        group=None)
+        self.assertEqual(3, manager.list.call_count)
+
+    @override_settings(API_RESULT_PAGE_SIZE=2,
+                       RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.keystone, 'LIST_INDEX_CHUNK_SIZE', 2)
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_list_paged_indexed(self, mock_keystoneclient):
+        catalog_cache.invalidate('users')
+        manager = self._mock_users(
+            mock_keystoneclient, ['erin', 'carol', 'Bob', 'alice', 'dave'])
+        users_by_id = dict((user.id, user)
+                           for user in manager.list.return_value)
+
+        def _get(user_id):
+            if user_id not in users_by_id:
+                raise keystone_exceptions.NotFound()
+            return users_by_id[user_id]
+
+        manager.get.side_effect = _get
+
+        users, has_more = api.keystone.user_list_paged(self.request,
+                                                       domain='1')
+        self.assertEqual(['alice', 'Bob'], [user.name for user in users])
+        self.assertTrue(has_more)
+        manager.get.assert_not_called()
+
+        # The following pages are looked up in the index, across chunks.
+        users, has_more = api.keystone.user_list_paged(
+            self.request, domain='1', marker=users[-1].id)
+        self.assertEqual(['carol', 'dave'], [user.name for user in users])
+        self.assertTrue(has_more)
+        users, has_more = api.keystone.user_list_paged(
+            self.request, domain='1', marker=users[-1].id)
+        self.assertEqual(['erin'], [user.name for user in users])
+        self.assertFalse(has_more)
+        manager.list.assert_called_once_with(project=None, domain='1',
+                                             group=None)
+
+        # Deleted users are left out of the page.
+        del users_by_id['4']
+        users, has_more = api.keystone.user_list_paged(
+            self.request, domain='1', marker='2')
+        self.assertEqual(['carol'], [user.name for user in users])
+
+        # Changing a user drops the index.
+        api.keystone.user_delete(self.request, '4')
+        api.keystone.user_list_paged(self.request, domain='1', marker='2')
+        self.assertEqual(2, manager.list.call_count)
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_group_list_paged(self, mock_keystoneclient):
+        manager = mock_keystoneclient.return_value.groups
+        manager.resource_class = groups_v3.Group
+        manager.list.return_value = [
+            groups_v3.Group(manager, {'id': str(index), 'name': name},
+                            loaded=True)
+            for index, name in enumerate(['b', 'a', 'c'])]
+
+        groups, has_more = api.keystone.group_list_paged(
+            self.request, domain='1', marker='1')
+
+        self.assertEqual(['b', 'c'], [group.name for group in groups])
+        self.assertFalse(has_more)
+        manager.list.assert_called_once_with(domain='1', user=None,
+                                             name=None)
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_search(self, mock_keystoneclient):
+        manager = self._mock_users(mock_keystoneclient, ['alice', 'Alan'])
+
+        users = api.keystone.user_search(self.request, 'al', domain='1')
+
+        self.assertEqual(['Alan', 'alice'], [user.name for user in users])
+        manager.list.assert_called_once_with(project=None, domain='1',
+                                             group=None,
+                                             name__istartswith='al')
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_search_limit(self, mock_keystoneclient):
+        self._mock_users(mock_keystoneclient, ['albert', 'Alan', 'al'])
+
+        users = api.keystone.user_search(self.request, 'al', domain='1',
+                                         limit=2)
+
+        self.assertEqual(['al', 'Alan'], [user.name for user in users])
+
 
 class ServiceAPITests(test.APIMockTestCase):
     def test_service_wrapper(self):
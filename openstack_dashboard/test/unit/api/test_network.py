@@ -13,6 +13,7 @@
 #    under the License.
 
 import collections
+import copy
 
 import mock
 import netaddr
@@ -20,6 +21,7 @@ import netaddr
 from django.test.utils import override_settings
 
 from openstack_dashboard import api
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.test import helpers as test
 
 
@@ -142,3 +144,66 @@ class NetworkApiNeutronTests(test.APIMockTestCase):
     @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
     def test_servers_update_addresses_router_disabled(self):
         self._test_servers_update_addresses(router_enabled=False)
+
+    def _mock_servers_addresses_lookup(self):
+        server_ids = [server.id for server in self.servers.list()]
+        server_ports = [p for p in self.api_ports.list()
+                        if p['device_id'] in server_ids]
+        self.qclient.list_ports.return_value = {'ports': server_ports}
+        self.qclient.list_networks.return_value = {
+            'networks': self.api_networks.list()}
+        self.qclient.list_subnets.return_value = {'subnets':
+                                                  self.api_subnets.list()}
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+                       OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT=60)
+    def test_servers_update_addresses_cached(self):
+        self._mock_servers_addresses_lookup()
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+
+        servers = self.servers.list()
+        api.network.servers_update_addresses(self.request, servers)
+        addresses = [copy.deepcopy(server.addresses) for server in servers]
+        for server in servers:
+            server.addresses = {}
+        api.network.servers_update_addresses(self.request, servers)
+
+        self.assertEqual(addresses,
+                         [server.addresses for server in servers])
+        self.assertTrue(servers[0].addresses)
+        self.assertEqual(1, self.qclient.list_ports.call_count)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+                       OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT=60)
+    def test_servers_update_addresses_only_changed_servers(self):
+        self._mock_servers_addresses_lookup()
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+
+        servers = self.servers.list()
+        api.network.servers_update_addresses(self.request, servers)
+        servers[1].updated = '2012-02-29T10:00:00Z'
+        api.network.servers_update_addresses(self.request, servers)
+
+        self.assertEqual(2, self.qclient.list_ports.call_count)
+        self.qclient.list_ports.assert_called_with(
+            device_id=(servers[1].id,))
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+                       OPENSTACK_INSTANCE_ADDRESSES_CACHE_TIMEOUT=60)
+    @mock.patch.object(api.neutron, 'list_resources_with_long_filters',
+                       wraps=api.neutron.list_resources_with_long_filters)
+    def test_servers_update_addresses_invalidated_by_port_delete(
+            self, mock_list_resources):
+        self._mock_servers_addresses_lookup()
+        catalog_cache.invalidate(catalog_cache.SERVER_ADDRESSES_NAMESPACE)
+
+        servers = self.servers.list()
+        api.network.servers_update_addresses(self.request, servers)
+        api.neutron.port_delete(self.request, self.api_ports.first()['id'])
+        api.network.servers_update_addresses(self.request, servers)
+
+        # port_list() is memoized for the request, so the ports lookups
+        # are counted before it.
+        port_lookups = [c for c in mock_list_resources.call_args_list
+                        if c[0][1] == 'device_id']
+        self.assertEqual(2, len(port_lookups))
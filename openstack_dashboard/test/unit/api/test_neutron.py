@@ -19,9 +19,11 @@ from neutronclient.common import exceptions as neutron_exc
 from oslo_utils import uuidutils
 import six
 
+from django.conf import settings
 from django.test.utils import override_settings
 
 from openstack_dashboard import api
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
 
@@ -1085,6 +1087,51 @@ class NeutronApiTests(test.APIMockTestCase):
             expected_calls.append(mock.call(id=tuple(port_ids[i:i + 4])))
         neutronclient.list_ports.assert_has_calls(expected_calls)
 
+    @override_settings(OPENSTACK_NEUTRON_FILTER_URI_BUDGET=180)
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_list_resources_with_long_filters_chunks(self,
+                                                     mock_neutronclient):
+        # Each port ID takes 40 chars of the URI, so a budget of 180 chars
+        # allows 4 port IDs per request, without a first request with all
+        # the port IDs.
+        ports = [{'id': uuidutils.generate_uuid(),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = tuple([port['id'] for port in ports])
+        ports_by_id = dict((port['id'], port) for port in ports)
+
+        def list_ports(id):
+            return {'ports': [ports_by_id[port_id] for port_id in id]}
+
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.list_ports.side_effect = list_ports
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids, request=self.request)
+        self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
+
+        neutronclient.list_ports.assert_has_calls(
+            [mock.call(id=port_ids[i:i + 4]) for i in range(0, 10, 4)],
+            any_order=True)
+        self.assertEqual(3, neutronclient.list_ports.call_count)
+
+    @override_settings(OPENSTACK_NEUTRON_UNFILTERED_LIST_THRESHOLD=2)
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_list_resources_with_long_filters_unfiltered(
+            self, mock_neutronclient):
+        ports = self.api_ports.list()
+        port_ids = tuple([port['id'] for port in ports[:3]])
+
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.list_ports.return_value = {'ports': ports}
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids, request=self.request)
+
+        self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
+        neutronclient.list_ports.assert_called_once_with()
+
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_qos_policies_list(self, mock_neutronclient):
         exp_policies = self.qos_policies.list()
@@ -1545,7 +1592,7 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
         novaclient = mock_novaclient.return_value
         ver = mock.Mock(min_version='2.1', version='2.45')
         novaclient.versions.get_current.return_value = ver
-        novaclient.servers.list.return_value = servers
+        novaclient.servers.list.side_effect = [servers, []]
 
         ext_nets = [n for n in self.api_networks.list()
                     if n['router:external']]
@@ -1569,8 +1616,15 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
 
         self.qclient.list_ports.assert_called_once_with(**filters)
         novaclient.versions.get_current.assert_called_once_with()
-        novaclient.servers.list.assert_called_once_with(
-            False, {'project_id': self.request.user.tenant_id})
+        novaclient.servers.list.assert_has_calls([
+            mock.call(False, {'project_id': self.request.user.tenant_id,
+                              'limit': getattr(settings, 'API_RESULT_LIMIT',
+                                               1000)}),
+            mock.call(False, {'project_id': self.request.user.tenant_id,
+                              'limit': getattr(settings, 'API_RESULT_LIMIT',
+                                               1000),
+                              'marker': servers[-1].id}),
+        ])
         self.qclient.list_networks.assert_has_calls([
             mock.call(**{'router:external': True}),
             mock.call(shared=True),
@@ -1664,6 +1718,79 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
         self.assertEqual(candidates[0]['id'], ret_val.port_id)
         self.assertEqual(candidates[0]['device_id'], ret_val.instance_id)
 
+    @override_settings(
+        OPENSTACK_NEUTRON_NETWORK={
+            'enable_fip_topology_check': True,
+        },
+        RESOURCE_CATALOG_CACHE_TIMEOUT=300,
+    )
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_target_floating_ip_port_by_instance_cached_index(
+            self, mock_novaclient):
+        catalog_cache.invalidate(api.neutron.FIP_REACHABILITY_NAMESPACE)
+        server = self.servers.first()
+        ports = self.api_ports.list()
+        candidates = [p for p in ports if p['device_id'] == server.id]
+        rinfs = [p for p in ports
+                 if p['device_owner'] in api.neutron.ROUTER_INTERFACE_OWNERS]
+        ext_nets = [n for n in self.api_networks.list()
+                    if n['router:external']]
+        shared_nets = [n for n in self.api_networks.list() if n['shared']]
+
+        def list_ports(**params):
+            if 'device_owner' in params:
+                return {'ports': rinfs}
+            return {'ports': candidates}
+
+        def list_networks(**params):
+            if params.get('router:external'):
+                return {'networks': ext_nets}
+            return {'networks': shared_nets}
+
+        self.qclient.list_ports.side_effect = list_ports
+        self.qclient.list_networks.side_effect = list_networks
+        self.qclient.list_routers.return_value = {
+            'routers': self.api_routers.list()}
+        self.qclient.list_subnets.return_value = {
+            'subnets': self.api_subnets.list()}
+        novaclient = mock_novaclient.return_value
+        novaclient.versions.get_current.return_value = mock.Mock(
+            min_version='2.1', version='2.45')
+        novaclient.servers.get.return_value = server
+
+        for i in range(2):
+            ret = api.neutron.floating_ip_target_list_by_instance(
+                self.request, server.id)
+            self.assertEqual([self._get_target_id(candidates[0])],
+                             [target.id for target in ret])
+        self.qclient.list_routers.assert_called_once_with()
+
+        # Changing the routers drops the index.
+        api.neutron.router_add_interface(self.request, 'router_id',
+                                         subnet_id='subnet_id')
+        api.neutron.floating_ip_target_list_by_instance(self.request,
+                                                        server.id)
+        self.assertEqual(2, self.qclient.list_routers.call_count)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(catalog_cache, 'set')
+    @mock.patch.object(api.neutron, 'port_list')
+    def test_reachability_index_timeout(self, mock_port_list, mock_set):
+        catalog_cache.invalidate(api.neutron.FIP_REACHABILITY_NAMESPACE)
+        mock_port_list.return_value = []
+        fip_manager = api.neutron.FloatingIpManager(self.request)
+
+        with mock.patch.object(fip_manager, '_list_reachable_subnets',
+                               return_value={'subnet_id'}):
+            index = fip_manager._get_reachability_index()
+
+        self.assertEqual(frozenset(['subnet_id']), index)
+        # The index has a short lifetime of its own, since changes made
+        # outside of Horizon do not drop it.
+        mock_set.assert_called_once_with(
+            api.neutron.FIP_REACHABILITY_NAMESPACE, mock.ANY, index,
+            api.neutron.FIP_REACHABILITY_CACHE_TIMEOUT, mock.ANY)
+
     def _get_preloaded_targets(self):
         return [
             api.neutron.FloatingIpTarget(
@@ -19,6 +19,9 @@
 
 from __future__ import absolute_import
 
+import copy
+import datetime
+
 from django.conf import settings
 from django.test.utils import override_settings
 
@@ -28,9 +31,11 @@ from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import flavor_access as nova_flavor_access
 from novaclient.v2 import quotas
 from novaclient.v2 import servers
+from novaclient.v2 import usage as nova_usage
 
 from horizon import exceptions as horizon_exceptions
 from openstack_dashboard import api
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.test import helpers as test
 
 
@@ -184,6 +189,60 @@ class ComputeApiTests(test.APIMockTestCase):
         novaclient.servers.list.assert_called_once_with(
             True, {'all_tenants': True})
 
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_server_iter(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.side_effect = [servers[:2], servers[2:4], []]
+
+        ret_val = list(api.nova.server_iter(self.request,
+                                            {'all_tenants': True},
+                                            page_size=2))
+
+        self.assertEqual([s.id for s in servers], [s.id for s in ret_val])
+        for server in ret_val:
+            self.assertIsInstance(server, api.nova.Server)
+        novaclient.servers.list.assert_has_calls([
+            mock.call(True, {'all_tenants': True, 'limit': 2}),
+            mock.call(True, {'all_tenants': True, 'limit': 2,
+                             'marker': servers[1].id}),
+            mock.call(True, {'all_tenants': True, 'limit': 2,
+                             'marker': servers[3].id}),
+        ])
+        self.assertEqual(3, novaclient.servers.list.call_count)
+
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_server_iter_pages_capped_by_nova(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        # Nova returns at most its max_limit servers, fewer than requested.
+        novaclient.servers.list.side_effect = [servers[:1], servers[1:2],
+                                               servers[2:], []]
+
+        ret_val = list(api.nova.server_iter(self.request, page_size=3))
+
+        self.assertEqual([s.id for s in servers], [s.id for s in ret_val])
+        self.assertEqual(4, novaclient.servers.list.call_count)
+        novaclient.servers.list.assert_called_with(
+            True, {'project_id': self.request.user.tenant_id, 'limit': 3,
+                   'marker': servers[-1].id})
+
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_server_iter_early_termination(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.return_value = servers[:2]
+
+        ret_val = api.nova.server_iter(self.request, detailed=False,
+                                       page_size=2)
+
+        self.assertEqual(servers[0].id, next(ret_val).id)
+        novaclient.servers.list.assert_called_once_with(
+            False, {'project_id': self.request.user.tenant_id, 'limit': 2})
+
     @mock.patch.object(api.nova, 'novaclient')
     def test_server_list_pagination(self, mock_novaclient):
         page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 20)
@@ -302,6 +361,173 @@ class ComputeApiTests(test.APIMockTestCase):
                       marker=u'063cf7f3-ded1-4297-bc4c-31eae876cc93'),
         ])
 
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_usage_list_summary(self, mock_novaclient):
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.40')
+
+        def copy_usages(usages):
+            return [nova_usage.Usage(None, copy.deepcopy(u.to_dict()),
+                                     loaded=True) for u in usages]
+
+        def pages():
+            # The usage of the first project continues on the second page.
+            return [copy_usages(self.usages.list()),
+                    copy_usages(self.usages.list()[:1]), {}]
+
+        novaclient.usage.list.side_effect = pages()
+        detailed = api.nova.usage_list(self.request, 'start', 'end')
+        novaclient.usage.list.side_effect = pages()
+        summaries = api.nova.usage_list(self.request, 'start', 'end',
+                                        detailed=False)
+
+        self.assertEqual([usage.tenant_id for usage in detailed],
+                         [summary.tenant_id for summary in summaries])
+        for usage, summary in zip(detailed, summaries):
+            self.assertIsInstance(summary, api.nova.NovaUsageSummary)
+            self.assertEqual(usage.get_summary(), summary.get_summary())
+            self.assertEqual(usage.total_hours, summary.total_hours)
+            self.assertEqual((), summary.server_usages)
+        self.assertEqual(4, summaries[0].total_active_instances)
+
+    def test_usage_periods(self):
+        now = datetime.datetime(2019, 3, 5, 10, 0)
+        start = datetime.datetime(2019, 1, 30)
+        end = datetime.datetime(2019, 3, 5, 23, 59, 59)
+        # The past days of the current month are a single period.
+        self.assertEqual(
+            [(start, datetime.datetime(2019, 2, 1)),
+             (datetime.datetime(2019, 2, 1), datetime.datetime(2019, 3, 1)),
+             (datetime.datetime(2019, 3, 1), datetime.datetime(2019, 3, 5)),
+             (datetime.datetime(2019, 3, 5), end)],
+            api.nova._usage_periods(start, end, now))
+        # A past month ending at 23:59:59 is a whole month.
+        end = datetime.datetime(2019, 1, 31, 23, 59, 59)
+        self.assertEqual([(start, datetime.datetime(2019, 2, 1))],
+                         api.nova._usage_periods(start, end, now))
+        end = datetime.datetime(2019, 1, 31, 12, 0)
+        self.assertEqual([(start, end)],
+                         api.nova._usage_periods(start, end, now))
+        # The last day of a month is not merged with the current day.
+        now = datetime.datetime(2019, 3, 31, 10, 0)
+        end = datetime.datetime(2019, 3, 31, 23, 59, 59)
+        self.assertEqual(
+            [(start, datetime.datetime(2019, 2, 1)),
+             (datetime.datetime(2019, 2, 1), datetime.datetime(2019, 3, 1)),
+             (datetime.datetime(2019, 3, 1), datetime.datetime(2019, 3, 31)),
+             (datetime.datetime(2019, 3, 31), end)],
+            api.nova._usage_periods(start, end, now))
+        self.assertEqual([('start', 'end')],
+                         api.nova._usage_periods('start', 'end', now))
+
+    @override_settings(NOVA_USAGE_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_usage_get_periods(self, mock_novaclient):
+        catalog_cache.invalidate(api.nova.USAGE_CACHE_NAMESPACE)
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.1')
+        usage = self.usages.first()
+        novaclient.usage.get.side_effect = lambda *args: nova_usage.Usage(
+            None, copy.deepcopy(usage.to_dict()), loaded=True)
+        start = datetime.datetime(2019, 1, 31)
+        end = datetime.datetime(2019, 2, 1, 23, 59, 59)
+
+        ret_val = api.nova.usage_get(self.request, self.tenant.id, start, end)
+
+        self.assertIsInstance(ret_val, api.nova.NovaUsage)
+        # The usages of the servers in both months are merged.
+        self.assertEqual(
+            [(s['instance_id'], s['hours'] * 2) for s in usage.server_usages],
+            [(s['instance_id'], s['hours']) for s in ret_val.server_usages])
+        self.assertEqual(usage.total_hours * 2, ret_val.total_hours)
+        self.assertEqual(api.nova.NovaUsage(usage).vcpus, ret_val.vcpus)
+        self.assertEqual(2, novaclient.usage.get.call_count)
+        novaclient.usage.get.assert_has_calls([
+            mock.call(self.tenant.id, start, datetime.datetime(2019, 2, 1)),
+            mock.call(self.tenant.id, datetime.datetime(2019, 2, 1), end),
+        ], any_order=True)
+
+        # The past periods are not retrieved again.
+        novaclient.usage.get.reset_mock()
+        cached = api.nova.usage_get(self.request, self.tenant.id, start, end)
+        novaclient.usage.get.assert_not_called()
+        self.assertEqual(ret_val.server_usages, cached.server_usages)
+
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_usage_get_cache_disabled(self, mock_novaclient):
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.1')
+        novaclient.usage.get.return_value = self.usages.first()
+        start = datetime.datetime(2019, 1, 1)
+        end = datetime.datetime(2019, 2, 10, 23, 59, 59)
+
+        api.nova.usage_get(self.request, self.tenant.id, start, end)
+
+        novaclient.usage.get.assert_called_once_with(self.tenant.id, start,
+                                                     end)
+
+    @override_settings(NOVA_USAGE_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_usage_list_periods_cached(self, mock_novaclient):
+        catalog_cache.invalidate(api.nova.USAGE_CACHE_NAMESPACE)
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.1')
+        usages = self.usages.list()
+        novaclient.usage.list.side_effect = lambda *args: [
+            nova_usage.Usage(None, copy.deepcopy(u.to_dict()), loaded=True)
+            for u in usages]
+        now = datetime.datetime.utcnow()
+        start = datetime.datetime(now.year - 1, 11, 15)
+        end = now.replace(hour=23, minute=59, second=59, microsecond=0)
+        periods = api.nova._usage_periods(start, end)
+
+        summaries = api.nova.usage_list(self.request, start, end,
+                                        detailed=False)
+
+        self.assertEqual(len(periods), novaclient.usage.list.call_count)
+        self.assertEqual(
+            set((period[0], period[1], True) for period in periods),
+            set(c[0] for c in novaclient.usage.list.call_args_list))
+        self.assertEqual([u.tenant_id for u in usages],
+                         [summary.tenant_id for summary in summaries])
+        for usage, summary in zip(usages, summaries):
+            usage = api.nova.NovaUsage(usage)
+            self.assertAlmostEqual(usage.total_hours * len(periods),
+                                   summary.total_hours)
+            # The servers active at the end of the range are counted once.
+            self.assertEqual(usage.total_active_instances,
+                             summary.total_active_instances)
+            self.assertEqual(usage.vcpus, summary.vcpus)
+
+        # Only the current day is retrieved again.
+        novaclient.usage.list.reset_mock()
+        cached_summaries = api.nova.usage_list(self.request, start, end,
+                                               detailed=False)
+        novaclient.usage.list.assert_called_once_with(periods[-1][0], end,
+                                                      True)
+        self.assertEqual([s.get_summary() for s in summaries],
+                         [s.get_summary() for s in cached_summaries])
+
+    @mock.patch.object(api.cinder, 'volume_names_get')
+    @mock.patch.object(api.nova, 'novaclient')
+    def test_instance_volumes_list(self, mock_novaclient,
+                                   mock_volume_names_get):
+        server = self.servers.first()
+        volumes = self.volumes.list()
+        novaclient = mock_novaclient.return_value
+        novaclient.volumes.get_server_volumes.return_value = volumes
+        mock_volume_names_get.return_value = dict(
+            (volume.id, 'name-%s' % volume.id) for volume in volumes)
+
+        api_volumes = api.nova.instance_volumes_list(self.request, server.id)
+
+        self.assertEqual(['name-%s' % volume.id for volume in volumes],
+                         [volume.name for volume in api_volumes])
+        novaclient.volumes.get_server_volumes.assert_called_once_with(
+            server.id)
+        mock_volume_names_get.assert_called_once_with(
+            self.request, [volume.id for volume in volumes])
+
     @mock.patch.object(api.nova, 'novaclient')
     def test_server_get(self, mock_novaclient):
         server = self.servers.first()
@@ -493,6 +719,57 @@ class ComputeApiTests(test.APIMockTestCase):
         self.assertEqual(len(flavors), len(api_flavors))
         novaclient.flavors.list.assert_called_once_with(is_public=True)
 
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.nova, 'flavor_list')
+    def test_flavor_list_cached(self, mock_flavor_list):
+        flavors = self.flavors.list()
+        mock_flavor_list.return_value = flavors
+        catalog_cache.invalidate('flavors')
+
+        api.nova.flavor_list_cached(self.request)
+        api_flavors = api.nova.flavor_list_cached(self.request)
+
+        self.assertEqual([f.id for f in flavors],
+                         [f.id for f in api_flavors])
+        self.assertEqual([f.ram for f in flavors],
+                         [f.ram for f in api_flavors])
+        mock_flavor_list.assert_called_once_with(self.request)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.nova, 'novaclient')
+    @mock.patch.object(api.nova, 'flavor_list')
+    def test_flavor_list_cached_invalidated_by_delete(
+            self, mock_flavor_list, mock_novaclient):
+        flavors = self.flavors.list()
+        mock_flavor_list.return_value = flavors
+        catalog_cache.invalidate('flavors')
+
+        api.nova.flavor_list_cached(self.request)
+        api.nova.flavor_delete(self.request, flavors[0].id)
+        api.nova.flavor_list_cached(self.request)
+
+        self.assertEqual(2, mock_flavor_list.call_count)
+
+    @override_settings(RESOURCE_CATALOG_CACHE_TIMEOUT=300)
+    @mock.patch.object(api.nova, 'flavor_list')
+    def test_flavor_list_cached_invalidated_while_listing(
+            self, mock_flavor_list):
+        flavors = self.flavors.list()
+
+        def _flavor_list(request):
+            # A flavor is deleted by another request meanwhile.
+            catalog_cache.invalidate('flavors')
+            return flavors
+
+        mock_flavor_list.side_effect = _flavor_list
+        catalog_cache.invalidate('flavors')
+
+        api.nova.flavor_list_cached(self.request)
+        api.nova.flavor_list_cached(self.request)
+
+        # The list fetched before the invalidation is not used.
+        self.assertEqual(2, mock_flavor_list.call_count)
+
     @mock.patch.object(api.nova, 'novaclient')
     def test_flavor_get_no_extras(self, mock_novaclient):
         flavor = self.flavors.list()[1]
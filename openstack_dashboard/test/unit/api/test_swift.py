@@ -18,7 +18,10 @@
 
 from __future__ import absolute_import
 
+import json
+
 import mock
+import six
 
 from horizon import exceptions
 
@@ -257,6 +260,141 @@ class SwiftApiTests(test.APIMockTestCase):
             content_length=0,
             headers={})
 
+    def test_swift_upload_object_stream(self, mock_swiftclient):
+        container = self.containers.first()
+        obj = self.objects.first()
+        stream = six.BytesIO(b'abc')
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.return_value = 'etag'
+
+        response = api.swift.swift_upload_object_stream(
+            self.request, container.name, obj.name, stream, 3,
+            orig_filename='fake_object.jpg')
+
+        self.assertEqual(3, response['bytes'])
+        swift_api.put_object.assert_called_once_with(
+            container.name, obj.name, stream, content_length=3,
+            chunk_size=api.swift.CHUNK_SIZE,
+            headers={'X-Object-Meta-Orig-Filename': 'fake_object.jpg'})
+        swift_api.put_container.assert_not_called()
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_upload_object_stream_slo(self, mock_swiftclient):
+        stream = six.BytesIO(b'0123456789')
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        swift_api.put_object.side_effect = ['etag0', 'etag1', 'etag2',
+                                            'manifest']
+
+        response = api.swift.swift_upload_object_stream(
+            self.request, 'spam', 'eggs', stream, 10, upload_id='upload')
+
+        self.assertEqual(10, response['bytes'])
+        self.assertEqual('manifest', response['etag'])
+        swift_api.put_container.assert_called_once_with('spam_segments')
+        swift_api.put_object.assert_has_calls([
+            mock.call('spam_segments', 'eggs/upload/4/%08d' % i, stream,
+                      content_length=length,
+                      chunk_size=api.swift.CHUNK_SIZE)
+            for i, length in enumerate((4, 4, 2))])
+        args, kwargs = swift_api.put_object.call_args
+        self.assertEqual(('spam', 'eggs'), args[:2])
+        self.assertEqual('multipart-manifest=put', kwargs['query_string'])
+        self.assertEqual(
+            [{'path': '/spam_segments/eggs/upload/4/%08d' % i,
+              'etag': 'etag%d' % i, 'size_bytes': length}
+             for i, length in enumerate((4, 4, 2))],
+            json.loads(args[2]))
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_upload_object_stream_dlo(self, mock_swiftclient):
+        stream = six.BytesIO(b'01234')
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {}
+        swift_api.put_object.return_value = 'etag'
+
+        api.swift.swift_upload_object_stream(
+            self.request, 'spam', u'eggs\u6346', stream, 5,
+            upload_id='upload')
+
+        self.assertEqual(3, swift_api.put_object.call_count)
+        swift_api.put_object.assert_called_with(
+            'spam', u'eggs\u6346', '', content_length=0,
+            headers={'X-Object-Manifest':
+                     'spam_segments/eggs%E6%8D%86/upload/4/'})
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_upload_object_stream_resume(self, mock_swiftclient):
+        stream = six.BytesIO(b'89')
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        swift_api.get_container.return_value = ({}, [
+            {'name': 'eggs/upload/4/%08d' % i, 'hash': 'etag%d' % i,
+             'bytes': 4} for i in range(2)])
+        swift_api.put_object.side_effect = ['etag2', 'manifest']
+
+        response = api.swift.swift_upload_object_stream(
+            self.request, 'spam', 'eggs', stream, 2, offset=8,
+            upload_id='upload')
+
+        self.assertEqual(10, response['bytes'])
+        swift_api.put_container.assert_not_called()
+        swift_api.get_container.assert_called_once_with(
+            'spam_segments', prefix='eggs/upload/4/', full_listing=True)
+        self.assertEqual(2, swift_api.put_object.call_count)
+        swift_api.put_object.assert_any_call(
+            'spam_segments', 'eggs/upload/4/00000002', stream,
+            content_length=2, chunk_size=api.swift.CHUNK_SIZE)
+        manifest = json.loads(swift_api.put_object.call_args[0][2])
+        self.assertEqual(['etag0', 'etag1', 'etag2'],
+                         [segment['etag'] for segment in manifest])
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_upload_object_stream_resume_conflict(self,
+                                                        mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = ({}, [
+            {'name': 'eggs/upload/4/00000000', 'hash': 'etag0', 'bytes': 4},
+            {'name': 'eggs/upload/4/00000001', 'hash': 'etag1', 'bytes': 2},
+        ])
+
+        with self.assertRaises(exceptions.Conflict):
+            api.swift.swift_upload_object_stream(
+                self.request, 'spam', 'eggs', six.BytesIO(b'89'), 2,
+                offset=8, upload_id='upload')
+
+        swift_api.put_object.assert_not_called()
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_upload_object_stream_without_upload_id(self,
+                                                          mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+
+        with self.assertRaises(exceptions.BadRequest):
+            api.swift.swift_upload_object_stream(
+                self.request, 'spam', 'eggs', six.BytesIO(b'0123456789'), 10)
+
+        swift_api.put_container.assert_not_called()
+        swift_api.put_object.assert_not_called()
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    def test_swift_get_upload_status(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = ({}, [
+            {'name': 'eggs/upload/4/00000000', 'hash': 'etag0', 'bytes': 4},
+            {'name': 'eggs/upload/4/00000002', 'hash': 'etag2', 'bytes': 4},
+        ])
+
+        status = api.swift.swift_get_upload_status(self.request, 'spam',
+                                                   'eggs', 'upload')
+
+        self.assertEqual({'upload_id': 'upload', 'segment_size': 4,
+                          'segments': 1, 'offset': 4}, status)
+
     def test_swift_object_exists(self, mock_swiftclient):
         container = self.containers.first()
         obj = self.objects.first()
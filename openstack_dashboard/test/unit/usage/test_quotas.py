@@ -27,6 +27,7 @@ import mock
 
 from horizon import exceptions
 from openstack_dashboard import api
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.api import cinder
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.usage import quotas
@@ -433,6 +434,83 @@ class QuotaTests(test.APITestCase):
         else:
             self.mock_cinder_tenant_absolute_limits.assert_not_called()
 
+    @test.create_mocks({
+        api.nova: (('tenant_absolute_limits', 'nova_tenant_absolute_limits'),),
+        api.base: ('is_service_enabled',),
+        cinder: (('tenant_absolute_limits', 'cinder_tenant_absolute_limits'),
+                 'is_volume_service_enabled')})
+    def test_tenant_quota_usages_targets_share_snapshot(self):
+        self._mock_service_enabled()
+        self.mock_nova_tenant_absolute_limits.return_value = \
+            self.limits['absolute']
+        self.mock_cinder_tenant_absolute_limits.return_value = \
+            self.cinder_limits['absolute']
+
+        quotas.tenant_quota_usages(self.request, targets=('instances', ))
+        quotas.tenant_quota_usages(self.request, targets=('cores', 'ram'))
+        quota_usages = quotas.tenant_quota_usages(self.request)
+
+        expected = self.get_usages_from_limits()
+        self.assertAvailableQuotasEqual(expected, quota_usages.usages)
+        self.mock_nova_tenant_absolute_limits.assert_called_once_with(
+            test.IsHttpRequest(), reserved=True,
+            tenant_id=self.request.user.tenant_id)
+        self.mock_cinder_tenant_absolute_limits.assert_called_once_with(
+            test.IsHttpRequest(), self.request.user.tenant_id)
+
+    @override_settings(QUOTA_USAGES_CACHE_TIMEOUT=10)
+    @test.create_mocks({
+        api.nova: (('tenant_absolute_limits', 'nova_tenant_absolute_limits'),
+                   'novaclient'),
+        api.base: ('is_service_enabled',),
+        cinder: ('is_volume_service_enabled',)})
+    def test_tenant_quota_usages_shared_snapshot(self):
+        self._mock_service_enabled(volume_enabled=False)
+        self.mock_nova_tenant_absolute_limits.return_value = \
+            self.limits['absolute']
+        catalog_cache.invalidate(quotas.QUOTA_USAGES_NAMESPACE)
+
+        targets = ('instances', 'cores', 'ram')
+        quotas.tenant_quota_usages(self.request, targets=targets)
+        # Another request for the same project uses the shared snapshot.
+        request = self.factory.get('/')
+        request.user = self.request.user
+        quota_usages = quotas.tenant_quota_usages(request, targets=targets)
+
+        expected = self.get_usages_from_limits(with_volume=False)
+        expected = dict((k, v) for k, v in expected.items() if k in targets)
+        self.assertAvailableQuotasEqual(expected, quota_usages.usages)
+        self.assertEqual(1, self.mock_nova_tenant_absolute_limits.call_count)
+
+        # Updating quotas drops the snapshot.
+        api.nova.tenant_quota_update(self.request,
+                                     self.request.user.tenant_id, cores=30)
+        request = self.factory.get('/')
+        request.user = self.request.user
+        quotas.tenant_quota_usages(request, targets=targets)
+        self.assertEqual(2, self.mock_nova_tenant_absolute_limits.call_count)
+
+    @override_settings(QUOTA_USAGES_CACHE_TIMEOUT=0)
+    @test.create_mocks({api.neutron: ('is_extension_supported',
+                                      'tenant_quota_detail_get')})
+    def test_tenant_network_usages_missing_quota_details(self):
+        self.mock_is_extension_supported.return_value = True
+        # Without the security-group and router extensions, their quotas
+        # are missing from the quota details.
+        self.mock_tenant_quota_detail_get.return_value = dict(
+            (name, {'limit': 10, 'used': 2, 'reserved': 1})
+            for name in ('network', 'subnet', 'port'))
+        usages = quotas.QuotaUsage()
+
+        quotas._get_tenant_network_usages(
+            self.request, usages, {'security_group', 'router', 'floatingip'},
+            '1')
+
+        self.assertEqual({'network', 'subnet', 'port'}, set(usages.usages))
+        self.assertEqual(3, usages['network']['used'])
+        self.mock_tenant_quota_detail_get.assert_called_once_with(
+            test.IsHttpRequest(), '1')
+
     def test_tenant_quota_usages_neutron_with_target_network_resources(self):
         self._test_tenant_quota_usages_neutron_with_target(
             targets=('network', 'subnet', 'router', ))
@@ -10,8 +10,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import threading
+import time
 import unittest
 
+from django.test.utils import override_settings
+import futurist
+import mock
+
 from openstack_dashboard.utils import futurist_utils
 
 
@@ -58,3 +65,89 @@ class FuturistUtilsTests(unittest.TestCase):
             (func2, [], {'a': 10, 'b': 20}),
             func3)
         self.assertEqual(ret, (5, 30, 3))
+
+    def test_call_functions_parallel_shared_executor(self):
+        executor = futurist_utils.get_executor()
+        futurist_utils.call_functions_parallel(lambda: 1, lambda: 2)
+        self.assertIs(executor, futurist_utils.get_executor())
+
+    def test_call_functions_parallel_max_workers(self):
+        lock = threading.Lock()
+        counts = {'running': 0, 'max': 0}
+
+        def func():
+            with lock:
+                counts['running'] += 1
+                counts['max'] = max(counts['max'], counts['running'])
+            time.sleep(0.01)
+            with lock:
+                counts['running'] -= 1
+            return 1
+
+        ret = futurist_utils.call_functions_parallel(
+            *[func] * 6, max_workers=2)
+        self.assertEqual(ret, (1,) * 6)
+        self.assertLessEqual(counts['max'], 2)
+
+    def test_call_functions_parallel_exception_cancels_siblings(self):
+        called = []
+
+        def func1():
+            raise ValueError('failure')
+
+        def func2():
+            called.append(2)
+
+        with override_settings(PARALLEL_CALL_MAX_WORKERS=1):
+            self.assertRaises(ValueError,
+                              futurist_utils.call_functions_parallel,
+                              func1, func2)
+        self.assertEqual(called, [])
+
+        self.assertRaises(ValueError,
+                          futurist_utils.call_functions_parallel,
+                          func1, func2, max_workers=2)
+
+    def test_call_functions_parallel_timeout(self):
+        event = threading.Event()
+
+        def func():
+            event.wait(5)
+
+        self.assertRaises(futures.TimeoutError,
+                          futurist_utils.call_functions_parallel,
+                          func, func, timeout=0.01)
+        event.set()
+
+    def test_call_functions_parallel_nested(self):
+        def func():
+            return futurist_utils.call_functions_parallel(lambda: 1,
+                                                          lambda: 2)
+
+        with override_settings(PARALLEL_EXECUTOR_MAX_WORKERS=1):
+            futurist_utils.shutdown_executor()
+            try:
+                ret = futurist_utils.call_functions_parallel(func, func)
+            finally:
+                futurist_utils.shutdown_executor()
+        self.assertEqual(ret, ((1, 2), (1, 2)))
+
+    @mock.patch.object(futurist_utils, 'get_executor')
+    def test_call_functions_parallel_rejected(self, mock_get_executor):
+        mock_get_executor.return_value.submit.side_effect = \
+            futurist.RejectedSubmission()
+
+        ret = futurist_utils.call_functions_parallel(lambda: 1, lambda: 2)
+        self.assertEqual(ret, (1, 2))
+
+    def test_call_functions_parallel_unexpected_option(self):
+        self.assertRaises(TypeError,
+                          futurist_utils.call_functions_parallel,
+                          lambda: 1, foo=1)
+
+    def test_get_executor_stats(self):
+        futurist_utils.call_functions_parallel(lambda: 1, lambda: 2)
+        stats = futurist_utils.get_executor_stats()
+        self.assertEqual(0, stats['queued'])
+        self.assertEqual(0, stats['running'])
+        self.assertGreaterEqual(stats['executed'], 2)
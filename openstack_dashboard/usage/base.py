@@ -157,7 +157,8 @@ class GlobalUsage(BaseUsage):
     show_deleted = True
 
     def get_usage_list(self, start, end):
-        return api.nova.usage_list(self.request, start, end)
+        # Only the totals of each project are shown.
+        return api.nova.usage_list(self.request, start, end, detailed=False)
 
 
 class ProjectUsage(BaseUsage):
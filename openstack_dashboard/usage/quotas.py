@@ -14,12 +14,14 @@ from collections import defaultdict
 import itertools
 import logging
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import catalog_cache
 from openstack_dashboard.api import cinder
 from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
@@ -90,6 +92,9 @@ NEUTRON_QUOTA_FIELDS = {"network",
 
 QUOTA_FIELDS = NOVA_QUOTA_FIELDS | CINDER_QUOTA_FIELDS | NEUTRON_QUOTA_FIELDS
 
+# Namespace of the usage snapshots in the catalog cache
+QUOTA_USAGES_NAMESPACE = 'quota_usages'
+
 QUOTA_NAMES = {
     # nova
     "metadata_items": _('Metadata Items'),
@@ -303,6 +308,77 @@ def _add_limit_and_usage_neutron(usages, name, quota_name,
     usages.tally(name, detail['used'] + detail['reserved'])
 
 
+def _get_shared_usage_data(request, service, tenant_id, fetch):
+    """Return the usage snapshot of a service, shared across requests.
+
+    A snapshot is a dict of quota name -> (limit, usage) covering all the
+    quotas of the service, so it serves every ``targets`` combination.
+    It is kept in the catalog cache for ``QUOTA_USAGES_CACHE_TIMEOUT``
+    seconds, so that pages loaded in a row do not fetch it again.
+    """
+    timeout = getattr(settings, 'QUOTA_USAGES_CACHE_TIMEOUT', 10)
+    if timeout <= 0:
+        return fetch(request, tenant_id)
+    scope = (service, request.user.services_region,
+             request.user.project_id, tenant_id)
+    generation = catalog_cache.get_generation(QUOTA_USAGES_NAMESPACE)
+    data = catalog_cache.get(QUOTA_USAGES_NAMESPACE, scope, generation)
+    if data is None:
+        data = fetch(request, tenant_id)
+        catalog_cache.set(QUOTA_USAGES_NAMESPACE, scope, data, timeout,
+                          generation)
+    return data
+
+
+def _fetch_compute_usage_data(request, tenant_id):
+    limits = nova.tenant_absolute_limits(request, reserved=True,
+                                         tenant_id=tenant_id)
+    data = {}
+    for quota_name, limit_keys in NOVA_QUOTA_LIMIT_MAP.items():
+        if limit_keys['usage']:
+            usage = limits[limit_keys['usage']]
+        else:
+            usage = None
+        data[quota_name] = (limits[limit_keys['limit']], usage)
+    return data
+
+
+def _fetch_volume_usage_data(request, tenant_id):
+    limits = cinder.tenant_absolute_limits(request, tenant_id)
+    return dict((quota_name, (limits[limit_keys['limit']],
+                              limits[limit_keys['usage']]))
+                for quota_name, limit_keys in CINDER_QUOTA_LIMIT_MAP.items())
+
+
+def _fetch_network_usage_data(request, tenant_id):
+    details = neutron.tenant_quota_detail_get(request, tenant_id)
+    # The quotas of the extensions which are not enabled (security-group
+    # or router for example) are missing from the details.
+    return dict((quota_name, (details[quota_name]['limit'],
+                              details[quota_name]['used'] +
+                              details[quota_name]['reserved']))
+                for quota_name in NEUTRON_QUOTA_FIELDS
+                if quota_name in details)
+
+
+@memoized
+def _get_compute_usage_data(request, tenant_id):
+    return _get_shared_usage_data(request, 'compute', tenant_id,
+                                  _fetch_compute_usage_data)
+
+
+@memoized
+def _get_volume_usage_data(request, tenant_id):
+    return _get_shared_usage_data(request, 'volume', tenant_id,
+                                  _fetch_volume_usage_data)
+
+
+@memoized
+def _get_network_usage_data(request, tenant_id):
+    return _get_shared_usage_data(request, 'network', tenant_id,
+                                  _fetch_network_usage_data)
+
+
 @profiler.trace
 def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
     enabled_compute_quotas = NOVA_COMPUTE_QUOTA_FIELDS - disabled_quotas
@@ -313,20 +389,14 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = nova.tenant_absolute_limits(request, reserved=True,
-                                             tenant_id=tenant_id)
+        data = _get_compute_usage_data(request, tenant_id)
     except nova.nova_exceptions.ClientException:
         msg = _("Unable to retrieve compute limit information.")
         exceptions.handle(request, msg)
+        return
 
-    for quota_name, limit_keys in NOVA_QUOTA_LIMIT_MAP.items():
-        if limit_keys['usage']:
-            usage = limits[limit_keys['usage']]
-        else:
-            usage = None
-        _add_limit_and_usage(usages, quota_name,
-                             limits[limit_keys['limit']],
-                             usage,
+    for quota_name, (limit, usage) in data.items():
+        _add_limit_and_usage(usages, quota_name, limit, usage,
                              disabled_quotas)
 
 
@@ -337,13 +407,10 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     if neutron.is_extension_supported(request, 'quota_details'):
-        details = neutron.tenant_quota_detail_get(request, tenant_id)
-        for quota_name in NEUTRON_QUOTA_FIELDS:
-            if quota_name in disabled_quotas:
-                continue
-            detail = details[quota_name]
-            usages.add_quota(base.Quota(quota_name, detail['limit']))
-            usages.tally(quota_name, detail['used'] + detail['reserved'])
+        data = _get_network_usage_data(request, tenant_id)
+        for quota_name, (limit, usage) in data.items():
+            _add_limit_and_usage(usages, quota_name, limit, usage,
+                                 disabled_quotas)
     else:
         _get_tenant_network_usages_legacy(
             request, usages, disabled_quotas, tenant_id)
@@ -396,15 +463,14 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = cinder.tenant_absolute_limits(request, tenant_id)
+        data = _get_volume_usage_data(request, tenant_id)
     except cinder.cinder_exception.ClientException:
         msg = _("Unable to retrieve volume limit information.")
         exceptions.handle(request, msg)
+        return
 
-    for quota_name, limit_keys in CINDER_QUOTA_LIMIT_MAP.items():
-        _add_limit_and_usage(usages, quota_name,
-                             limits[limit_keys['limit']],
-                             limits[limit_keys['usage']],
+    for quota_name, (limit, usage) in data.items():
+        _add_limit_and_usage(usages, quota_name, limit, usage,
                              disabled_quotas)
 
 
@@ -413,6 +479,9 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
 def tenant_quota_usages(request, tenant_id=None, targets=None):
     """Get our quotas and construct our usage object.
 
+    The quotas and usages of each service are retrieved at most once per
+    request whatever the targets, and services are queried in parallel.
+
     :param tenant_id: Target tenant ID. If no tenant_id is provided,
         a the request.user.project_id is assumed to be used.
     :param targets: A tuple of quota names to be retrieved.
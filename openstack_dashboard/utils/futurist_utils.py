@@ -10,14 +10,118 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+from concurrent import futures
 import functools
+import logging
+import threading
+import time
 
+from django.conf import settings
 import futurist
 
+LOG = logging.getLogger(__name__)
 
-def call_functions_parallel(*worker_defs):
+_executor = None
+_executor_lock = threading.Lock()
+_counters = collections.Counter()
+_counters_lock = threading.Lock()
+_local = threading.local()
+
+
+def _count(name, delta=1):
+    with _counters_lock:
+        _counters[name] += delta
+
+
+def _check_and_reject(executor, backlog):
+    max_backlog = getattr(settings, 'PARALLEL_EXECUTOR_MAX_BACKLOG', 100)
+    if backlog >= max_backlog:
+        _count('rejected')
+        raise futurist.RejectedSubmission(
+            "Parallel executor backlog of %s reached" % max_backlog)
+
+
+def get_executor():
+    """Return the process-wide executor used by call_functions_parallel.
+
+    The executor is created on first use with
+    ``PARALLEL_EXECUTOR_MAX_WORKERS`` threads. Submissions are rejected
+    once ``PARALLEL_EXECUTOR_MAX_BACKLOG`` calls are waiting for a thread.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None or not _executor.alive:
+            max_workers = getattr(settings, 'PARALLEL_EXECUTOR_MAX_WORKERS',
+                                  10)
+            _executor = futurist.ThreadPoolExecutor(
+                max_workers=max_workers,
+                check_and_reject=_check_and_reject)
+        return _executor
+
+
+def shutdown_executor(wait=True):
+    """Shut down the shared executor; a new one is created on next use."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def get_executor_stats():
+    """Return a dict of statistics about the shared executor.
+
+    ``queued`` is the number of calls waiting for a worker thread and
+    ``running`` the number of calls being executed. ``rejected`` counts
+    the calls which were run in the calling thread because the backlog
+    was full.
+    """
+    with _counters_lock:
+        stats = {
+            'queued': _counters['queued'],
+            'running': _counters['running'],
+            'rejected': _counters['rejected'],
+        }
+    executor = _executor
+    if executor is not None:
+        executor_stats = executor.statistics
+        stats.update({
+            'max_workers': executor._max_workers,
+            'executed': executor_stats.executed,
+            'failures': executor_stats.failures,
+            'cancelled': executor_stats.cancelled,
+            'average_runtime': executor_stats.average_runtime,
+        })
+    return stats
+
+
+def _run_in_worker(func):
+    _count('queued', -1)
+    _count('running')
+    _local.in_worker = True
+    try:
+        return func()
+    finally:
+        _local.in_worker = False
+        _count('running', -1)
+
+
+def _to_partial(func_def):
+    if callable(func_def):
+        func_def = [func_def]
+    args = func_def[1] if len(func_def) > 1 else []
+    kwargs = func_def[2] if len(func_def) > 2 else {}
+    return functools.partial(func_def[0], *args, **kwargs)
+
+
+def call_functions_parallel(*worker_defs, **options):
     """Call specified functions in parallel.
 
+    Functions are run on the process-wide executor returned by
+    get_executor(), so the number of threads does not grow with the
+    number of concurrent requests.
+
     :param *worker_defs: Each positional argument can be either of
         a function to be called or a tuple which consists of a function,
         a list of positional arguments) and keyword arguments (optional).
@@ -27,24 +131,69 @@ def call_functions_parallel(*worker_defs):
            call_functions_parallel(func1, (func2, [1, 2]))
            call_functions_parallel((func1, [], {'a': 1}),
                                    (func2, [], {'a': 2, 'b': 10}))
+    :param max_workers: (keyword only) The maximum number of functions of
+        this call running at the same time. Defaults to
+        ``PARALLEL_CALL_MAX_WORKERS``.
+    :param timeout: (keyword only) The number of seconds to wait for all
+        functions to complete. ``concurrent.futures.TimeoutError`` is
+        raised when it is exceeded.
     :returns: a tuple of values returned from individual functions.
         None is returned if a corresponding function does not return.
         It is better to return values other than None from individual
         functions.
+    :raises: the exception raised by the first failing function. Functions
+        which have not been started yet are cancelled.
     """
-    # TODO(amotoki): Needs to figure out what max_workers can be specified.
-    # According to e0ne, the apache default configuration in devstack  allows
-    # only 10 threads. What happens if max_worker=11 is specified?
-    max_workers = len(worker_defs)
-    # Prepare a list with enough length.
-    futures = [None] * len(worker_defs)
-    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
-        for index, func_def in enumerate(worker_defs):
-            if callable(func_def):
-                func_def = [func_def]
-            args = func_def[1] if len(func_def) > 1 else []
-            kwargs = func_def[2] if len(func_def) > 2 else {}
-            func = functools.partial(func_def[0], *args, **kwargs)
-            futures[index] = e.submit(fn=func)
-
-    return tuple(f.result() for f in futures)
+    max_workers = options.pop('max_workers', None)
+    timeout = options.pop('timeout', None)
+    if options:
+        raise TypeError("Unexpected keyword arguments: %s"
+                        % ', '.join(options))
+    if max_workers is None:
+        max_workers = getattr(settings, 'PARALLEL_CALL_MAX_WORKERS', 5)
+
+    funcs = [_to_partial(func_def) for func_def in worker_defs]
+
+    # Functions called from a worker of the shared executor run inline,
+    # as waiting for other workers from there could exhaust the pool.
+    if getattr(_local, 'in_worker', False) or max_workers <= 1:
+        return tuple(func() for func in funcs)
+
+    deadline = None if timeout is None else time.time() + timeout
+    executor = get_executor()
+    results = [None] * len(funcs)
+    waiting = collections.deque(enumerate(funcs))
+    running = {}
+    try:
+        while waiting or running:
+            while waiting and len(running) < max_workers:
+                index, func = waiting.popleft()
+                _count('queued')
+                try:
+                    future = executor.submit(_run_in_worker, func)
+                except futurist.RejectedSubmission:
+                    _count('queued', -1)
+                    LOG.debug('Parallel executor is saturated, calling %s '
+                              'in the current thread.', func.func)
+                    results[index] = func()
+                    continue
+                running[future] = index
+            if not running:
+                continue
+            wait_timeout = None
+            if deadline is not None:
+                wait_timeout = max(0, deadline - time.time())
+            done, _ = futures.wait(running, timeout=wait_timeout,
+                                   return_when=futures.FIRST_COMPLETED)
+            if not done:
+                raise futures.TimeoutError(
+                    "Parallel calls did not complete in %s seconds"
+                    % timeout)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    except Exception:
+        for future in running:
+            if future.cancel():
+                _count('queued', -1)
+        raise
+    return tuple(results)
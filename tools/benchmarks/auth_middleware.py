@@ -0,0 +1,127 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the authentication middleware.
+
+Measures the overhead of the session and authentication middleware for an
+authenticated request to a view doing nothing but checking the user, like
+the AJAX polls of tables, and the part of it spent creating the user from
+the token of the session. Run it from the top directory of the
+repository::
+
+    python tools/benchmarks/auth_middleware.py --requests 2000
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib import auth  # noqa: E402
+from django.contrib.auth import middleware as auth_middleware  # noqa: E402
+from django.contrib.sessions import middleware as session_middleware  # noqa
+from django import http  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from openstack_auth import middleware  # noqa: E402,F401
+from openstack_auth.tests import data_v3  # noqa: E402
+from openstack_auth import user as auth_user  # noqa: E402
+
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+
+def noop_view(request):
+    if not request.user.is_authenticated:
+        return http.HttpResponseForbidden()
+    return http.HttpResponse()
+
+
+def make_handler():
+    handler = auth_middleware.AuthenticationMiddleware(noop_view)
+    return session_middleware.SessionMiddleware(handler)
+
+
+def make_session_cookie():
+    """Return the cookie of a session logged in like the login view does."""
+    data = data_v3.generate_test_data()
+    token = auth_user.Token(data.scoped_access_info,
+                            unscoped_token=data.unscoped_access_info.auth_token)
+    request = RequestFactory().get('/')
+    session_middleware.SessionMiddleware(noop_view).process_request(request)
+    user = auth_user.create_user_from_token(request, token,
+                                            settings.OPENSTACK_KEYSTONE_URL)
+    auth_user.set_session_from_user(request, user)
+    request.session['unscoped_token'] = token.unscoped_token
+    request.session[auth.SESSION_KEY] = user.id
+    request.session[auth.BACKEND_SESSION_KEY] = (
+        'openstack_auth.backend.KeystoneBackend')
+    request.session.save()
+    return request.session.session_key
+
+
+def handle(handler, cookie):
+    request = RequestFactory().get('/')
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = cookie
+    response = handler(request)
+    assert response.status_code == 200, response.status_code
+
+
+def create_user(request, token):
+    auth_user.create_user_from_token(request, token,
+                                     settings.OPENSTACK_KEYSTONE_URL)
+
+
+def run(requests, repeat):
+    with override_settings(SESSION_ENGINE=SESSION_ENGINE):
+        handler = make_handler()
+        cookie = make_session_cookie()
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = cookie
+        session_middleware.SessionMiddleware(noop_view).process_request(
+            request)
+        token = request.session['token']
+        print('%d authenticated requests, best of %d runs'
+              % (requests, repeat))
+        for label, func in (('middleware', lambda: handle(handler, cookie)),
+                            ('user creation',
+                             lambda: create_user(request, token))):
+            func()
+            best = min(timeit.repeat(func, number=requests, repeat=repeat))
+            print('%-20s %8.1f us per request'
+                  % (label, best * 1e6 / requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Number of requests per run (default: 2000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of timed runs (default: 5)')
+    args = parser.parse_args()
+    run(args.requests, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the rendering of large DataTables.
+
+Renders a table shaped like the admin instance table: a multi-select
+column, linked names, status columns with display choices, filtered
+values and a dropdown of row actions. Run it from the top directory of the
+repository::
+
+    python tools/benchmarks/data_tables.py --rows 1000
+
+Use ``--profile`` to print the functions the rendering spends most of its
+time in.
+"""
+
+from __future__ import print_function
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.template import defaultfilters  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.utils.translation import pgettext_lazy  # noqa: E402
+from django.utils.translation import ugettext_lazy as _  # noqa: E402
+from django.utils.translation import ungettext_lazy  # noqa: E402
+
+from horizon import tables  # noqa: E402
+from horizon.utils import filters  # noqa: E402
+
+
+STATUS_DISPLAY_CHOICES = (
+    ("active", pgettext_lazy("Current status of an Instance", u"Active")),
+    ("shutoff", pgettext_lazy("Current status of an Instance", u"Shutoff")),
+    ("error", pgettext_lazy("Current status of an Instance", u"Error")),
+    ("build", pgettext_lazy("Current status of an Instance", u"Build")),
+)
+STATUS_CHOICES = (
+    ("active", True),
+    ("shutoff", True),
+    ("error", False),
+)
+
+
+class Instance(object):
+    def __init__(self, index):
+        self.id = str(uuid.uuid4())
+        self.name = 'instance-%d' % index
+        self.status = ('ACTIVE', 'SHUTOFF', 'ERROR', 'BUILD')[index % 4]
+        self.host = 'compute-%d' % (index % 16)
+        self.tenant_name = 'project-%d' % (index % 8)
+        self.ips = ['10.0.%d.%d' % (index // 250 % 250, index % 250)]
+        self.size = 'm1.small'
+        self.created = '2019-01-01T00:00:00Z'
+        self.ram = 2048 * 1024 * 1024
+
+
+class EditInstance(tables.LinkAction):
+    name = "edit"
+    verbose_name = _("Edit Instance")
+    url = "horizon:admin:instances:update"
+    classes = ("ajax-modal",)
+
+
+class ConsoleLink(tables.LinkAction):
+    name = "console"
+    verbose_name = _("Console")
+    url = "horizon:admin:instances:detail"
+
+    def allowed(self, request, instance=None):
+        return instance.status == 'ACTIVE'
+
+
+class DeleteInstance(tables.DeleteAction):
+    @staticmethod
+    def action_present(count):
+        return ungettext_lazy(u"Delete Instance", u"Delete Instances", count)
+
+    @staticmethod
+    def action_past(count):
+        return ungettext_lazy(u"Deleted Instance", u"Deleted Instances",
+                              count)
+
+    def delete(self, request, obj_id):
+        pass
+
+
+def get_ips(instance):
+    return ', '.join(instance.ips)
+
+
+class InstancesTable(tables.DataTable):
+    tenant = tables.Column("tenant_name", verbose_name=_("Project"))
+    host = tables.Column("host", verbose_name=_("Host"))
+    name = tables.WrappingColumn("name",
+                                 link="horizon:admin:instances:detail",
+                                 verbose_name=_("Name"))
+    ip = tables.Column(get_ips, verbose_name=_("IP Address"))
+    size = tables.Column("size", verbose_name=_("Flavor"))
+    ram = tables.Column("ram", verbose_name=_("RAM"),
+                        filters=(defaultfilters.filesizeformat,))
+    status = tables.Column("status",
+                           filters=(defaultfilters.title,
+                                    filters.replace_underscores),
+                           verbose_name=_("Status"),
+                           status=True,
+                           status_choices=STATUS_CHOICES,
+                           display_choices=STATUS_DISPLAY_CHOICES)
+    created = tables.Column("created", verbose_name=_("Time since created"),
+                            filters=(filters.parse_isotime,
+                                     filters.timesince_sortable))
+
+    class Meta(object):
+        name = "instances"
+        verbose_name = _("Instances")
+        status_columns = ["status"]
+        table_actions = (DeleteInstance,)
+        row_actions = (EditInstance, ConsoleLink, DeleteInstance)
+
+
+def make_request():
+    request = RequestFactory().get('/admin/instances/')
+    request.user = AnonymousUser()
+    request.session = {}
+    return request
+
+
+def render(request, data):
+    return InstancesTable(request, data).render()
+
+
+def run(rows, repeat, profile, sort='cumulative'):
+    request = make_request()
+    data = [Instance(i) for i in range(rows)]
+    # Warm up the template and URL caches.
+    render(request, data[:10])
+
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(render, request, data)
+        pstats.Stats(profiler).sort_stats(sort).print_stats(30)
+
+    best = min(timeit.repeat(lambda: render(request, data),
+                             number=1, repeat=repeat))
+    print('%d rows, best of %d runs: %.1f ms (%.2f ms per row)'
+          % (rows, repeat, best * 1000, best * 1000 / rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='Number of rows of the table (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of timed runs (default: 5)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print a profile of one rendering')
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.profile)
+
+
+if __name__ == '__main__':
+    main()
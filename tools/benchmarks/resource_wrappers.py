@@ -0,0 +1,242 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the API resource wrappers.
+
+Measures the time to wrap API resources, the time to read the attributes a
+table row typically reads, and the memory held by the wrappers for servers
+and ports. Run it from the top directory of the repository::
+
+    python tools/benchmarks/resource_wrappers.py --count 10000
+
+Memory is only measured with Python 3, which provides tracemalloc.
+"""
+
+from __future__ import print_function
+
+import argparse
+import functools
+import gc
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from novaclient.v2 import servers as nova_servers  # noqa: E402
+
+from openstack_dashboard.api import base  # noqa: E402
+from openstack_dashboard.api import neutron  # noqa: E402
+from openstack_dashboard.api import nova  # noqa: E402
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+SERVER_ATTRS = ('id', 'name', 'status', 'flavor', 'image', 'addresses',
+                'created', 'tenant_id', 'OS-EXT-STS:task_state',
+                'availability_zone')
+PORT_ATTRS = ('id', 'name', 'network_id', 'fixed_ips', 'mac_address',
+              'status', 'admin_state', 'device_owner', 'binding__vnic_type')
+
+
+class LegacyServer(nova.Server):
+    """api.nova.Server with the attribute lookup of previous releases."""
+
+    def __getattribute__(self, attr):
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            if attr not in object.__getattribute__(self, '_attrs'):
+                raise
+            return getattr(object.__getattribute__(self, '_apiresource'),
+                           attr)
+
+
+class LegacyPort(neutron.Port):
+    """api.neutron.Port with the attribute lookup of previous releases."""
+
+    def __getattribute__(self, attr):
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            apidict = object.__getattribute__(self, '_apidict')
+            if attr not in apidict:
+                raise
+            return apidict[attr]
+
+
+def server_info(index):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'server-%d' % index,
+        'status': 'ACTIVE',
+        'flavor': {'id': '1', 'links': []},
+        'image': {'id': str(uuid.uuid4()), 'links': []},
+        'addresses': {'private': [{'version': 4, 'addr': '10.0.0.%d'
+                                   % (index % 250),
+                                   'OS-EXT-IPS:type': 'fixed'}]},
+        'created': '2019-01-01T00:00:00Z',
+        'updated': '2019-01-01T00:00:00Z',
+        'tenant_id': 'tenant',
+        'user_id': 'user',
+        'key_name': None,
+        'metadata': {},
+        'links': [],
+        'OS-EXT-STS:task_state': None,
+        'OS-EXT-STS:power_state': 1,
+        'OS-EXT-AZ:availability_zone': 'nova',
+        'OS-DCF:diskConfig': 'MANUAL',
+        'accessIPv4': '',
+        'accessIPv6': '',
+        'hostId': 'host',
+        'progress': 0,
+        'config_drive': '',
+        'security_groups': [{'name': 'default'}],
+    }
+
+
+def port_info(index):
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'port-%d' % index,
+        'network_id': 'network',
+        'tenant_id': 'tenant',
+        'admin_state_up': True,
+        'status': 'ACTIVE',
+        'mac_address': 'fa:16:3e:00:%02x:%02x' % (index // 256 % 256,
+                                                  index % 256),
+        'fixed_ips': [{'ip_address': '10.0.0.%d' % (index % 250),
+                       'subnet_id': 'subnet'}],
+        'device_id': str(uuid.uuid4()),
+        'device_owner': 'compute:nova',
+        'binding:vnic_type': 'normal',
+        'security_groups': ['default'],
+    }
+
+
+def make_servers(count):
+    manager = nova_servers.ServerManager(None)
+    return [nova_servers.Server(manager, server_info(i), loaded=True)
+            for i in range(count)]
+
+
+def make_ports(count):
+    return [port_info(i) for i in range(count)]
+
+
+def read_attrs(wrappers, attrs):
+    for wrapper in wrappers:
+        for attr in attrs:
+            getattr(wrapper, attr, None)
+
+
+def wrap_servers(wrapper_class, resources, request):
+    return [wrapper_class(resource, request) for resource in resources]
+
+
+def wrap_ports(wrapper_class, infos):
+    return [wrapper_class(dict(info)) for info in infos]
+
+
+def best_time(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def measure_memory(build):
+    """Return the bytes held by the result of build()."""
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def benchmark(label, wrap, attrs, repeat, build):
+    wrappers = wrap()
+    return (label,
+            best_time(wrap, repeat),
+            best_time(functools.partial(read_attrs, wrappers, attrs), repeat),
+            measure_memory(build))
+
+
+def run(count, repeat):
+    request = object()
+    compact_server = base.compact_wrapper(nova.Server, slots=('request',))
+    compact_server_fallback = base.compact_wrapper(
+        nova.Server, fallback=True, slots=('request',))
+    server_variants = (
+        ('Server (legacy lookup)', LegacyServer),
+        ('Server', nova.Server),
+        ('compact Server (fallback)', compact_server_fallback),
+        ('compact Server', compact_server),
+    )
+    port_variants = (
+        ('Port (legacy lookup)', LegacyPort),
+        ('Port', neutron.Port),
+    )
+
+    results = []
+    resources = make_servers(count)
+    for label, wrapper_class in server_variants:
+        results.append(benchmark(
+            label, functools.partial(wrap_servers, wrapper_class, resources,
+                                     request),
+            SERVER_ATTRS, repeat,
+            # The resources are built along with the wrappers, so that
+            # the memory of the resources kept by the wrappers is counted.
+            lambda: wrap_servers(wrapper_class, make_servers(count),
+                                 request)))
+    del resources
+
+    infos = make_ports(count)
+    for label, wrapper_class in port_variants:
+        results.append(benchmark(
+            label, functools.partial(wrap_ports, wrapper_class, infos),
+            PORT_ATTRS, repeat,
+            lambda: wrap_ports(wrapper_class, make_ports(count))))
+
+    print('%d resources, best of %d runs' % (count, repeat))
+    print('%-28s %12s %16s %12s' % ('wrapper', 'wrap (ms)',
+                                    'row read (us)', 'memory (MB)'))
+    for label, wrap_time, read_time, memory in results:
+        print('%-28s %12.1f %16.2f %12s' % (
+            label, wrap_time * 1000, read_time * 1e6 / count,
+            '%.1f' % (memory / 1048576.0) if memory is not None else 'n/a'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000,
+                        help='Number of servers and ports (default: 10000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of timed runs (default: 5)')
+    args = parser.parse_args()
+    run(args.count, args.repeat)
+
+
+if __name__ == '__main__':
+    main()